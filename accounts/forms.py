@@ -1,8 +1,11 @@
 # accounts/forms.py
+from zoneinfo import available_timezones
+
 from django import forms
 from django.contrib.auth.models import User
 from django.contrib.auth.forms import UserCreationForm
 from .models import Profile
+from jobs.matching import index_profile, rescore_jobs
 
 
 class RegistrationForm(UserCreationForm):
@@ -43,6 +46,11 @@ class ProfileForm(forms.ModelForm):
         initial='21:00',
         help_text="Daily study & apply reminder (e.g., 9:00 PM)"
     )
+    timezone = forms.ChoiceField(
+        choices=[(name, name) for name in sorted(available_timezones())],
+        initial='Asia/Kolkata',
+        help_text="Reminders are sent at this time in your timezone"
+    )
 
     class Meta:
         model = Profile
@@ -53,7 +61,8 @@ class ProfileForm(forms.ModelForm):
             'preferred_roles',
             'key_skills',
             'email_notifications',
-            'reminder_time'
+            'reminder_time',
+            'timezone'
         ]
         widgets = {
             'current_role': forms.TextInput(attrs={
@@ -67,6 +76,16 @@ class ProfileForm(forms.ModelForm):
             'email_notifications': forms.CheckboxInput(attrs={'class': 'w-5 h-5 text-primary'}),
         }
 
+    def save(self, commit=True):
+        # Reminder time / timezone / notifications may have changed → move the profile to its new bucket
+        self.instance.schedule_reminder()
+        profile = super().save(commit=commit)
+        if commit:
+            # Keep the job-matching index and stored relevance scores in step with the new roles / skills / countries
+            index_profile(profile)
+            rescore_jobs(profile)
+        return profile
+
     # Convert comma-separated strings → Python lists
     def clean_target_countries(self):
         data = self.cleaned_data['target_countries']
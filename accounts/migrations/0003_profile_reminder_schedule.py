@@ -0,0 +1,44 @@
+# Generated by Django 5.2.18 on 2026-10-17 22:57
+
+from datetime import datetime, timedelta, timezone as dt_timezone
+from zoneinfo import ZoneInfo
+
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def schedule_existing_reminders(apps, schema_editor):
+    """Put every profile with notifications on into its first reminder bucket"""
+    Profile = apps.get_model('accounts', 'Profile')
+    now = timezone.now()
+    tz = ZoneInfo('Asia/Kolkata')
+
+    profiles = list(Profile.objects.filter(email_notifications=True))
+    for profile in profiles:
+        day = now.astimezone(tz).date()
+        fire_at = datetime.combine(day, profile.reminder_time, tzinfo=tz).astimezone(dt_timezone.utc)
+        if fire_at <= now:
+            fire_at = datetime.combine(day + timedelta(days=1), profile.reminder_time, tzinfo=tz).astimezone(dt_timezone.utc)
+        profile.next_reminder_at = fire_at
+    Profile.objects.bulk_update(profiles, ['next_reminder_at'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0002_profile_email_notifications_profile_reminder_time'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='profile',
+            name='next_reminder_at',
+            field=models.DateTimeField(blank=True, db_index=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='profile',
+            name='timezone',
+            field=models.CharField(default='Asia/Kolkata', max_length=64),
+        ),
+        migrations.RunPython(schedule_existing_reminders, migrations.RunPython.noop),
+    ]
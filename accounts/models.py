@@ -1,7 +1,35 @@
 # Create your models here.
+from datetime import datetime, timedelta, timezone as dt_timezone
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from django.conf import settings
 from django.db import models
 from django.contrib.auth.models import User
 from django.db.models import JSONField
+from django.utils import timezone
+
+
+def get_zone(tz_name):
+    """ZoneInfo for a profile's timezone, falling back to the site timezone"""
+    try:
+        return ZoneInfo(tz_name)
+    except (ZoneInfoNotFoundError, ValueError):
+        return ZoneInfo(settings.TIME_ZONE)
+
+
+def next_reminder_at(reminder_time, tz_name, after):
+    """First UTC instant after `after` at which reminder_time falls in the tz_name timezone"""
+    tz = get_zone(tz_name)
+    if isinstance(reminder_time, str):
+        reminder_time = datetime.strptime(reminder_time, '%H:%M:%S').time()
+
+    day = after.astimezone(tz).date()
+    while True:
+        fire_at = datetime.combine(day, reminder_time, tzinfo=tz).astimezone(dt_timezone.utc)
+        if fire_at > after:
+            return fire_at
+        day += timedelta(days=1)
+
 
 class Profile(models.Model):
     user = models.OneToOneField(User, on_delete=models.CASCADE)
@@ -12,6 +40,22 @@ class Profile(models.Model):
     key_skills = JSONField(default=list)  # e.g., ['Python', 'Django', 'SQL']
     email_notifications = models.BooleanField(default=True)
     reminder_time = models.TimeField(default='21:00:00')  # 9 PM
+    timezone = models.CharField(max_length=64, default='Asia/Kolkata')  # IANA name, reminder_time is local to it
+    # Next daily reminder in UTC — the scheduler only reads rows that are due (NULL = no reminders)
+    next_reminder_at = models.DateTimeField(null=True, blank=True, db_index=True)
 
     def __str__(self):
-        return self.name
\ No newline at end of file
+        return self.name
+
+    def schedule_reminder(self, after=None):
+        """Set next_reminder_at from reminder_time / timezone (None when notifications are off)"""
+        if self.email_notifications and self.reminder_time:
+            self.next_reminder_at = next_reminder_at(self.reminder_time, self.timezone, after or timezone.now())
+        else:
+            self.next_reminder_at = None
+        return self.next_reminder_at
+
+    def save(self, *args, **kwargs):
+        if self.next_reminder_at is None and self.email_notifications and not kwargs.get('update_fields'):
+            self.schedule_reminder()
+        super().save(*args, **kwargs)
@@ -1,3 +1,100 @@
+from datetime import datetime, time, timedelta, timezone as dt_timezone
+from unittest import mock
+
+from django.contrib.auth.models import User
 from django.test import TestCase
+from django.utils import timezone
+
+from jobs.models import OutboxEmail
+from jobs.tasks import send_daily_reminders
+from tracker.models import Goal, Task
+from .models import Profile, next_reminder_at
+
+
+def utc(*args):
+    return datetime(*args, tzinfo=dt_timezone.utc)
+
+
+class NextReminderTests(TestCase):
+
+    def test_later_today(self):
+        # 21:00 in Berlin (UTC+2 in summer time) is 19:00 UTC
+        self.assertEqual(next_reminder_at(time(21), 'Europe/Berlin', utc(2026, 10, 17, 12)), utc(2026, 10, 17, 19))
+
+    def test_already_passed_today(self):
+        self.assertEqual(next_reminder_at(time(21), 'Europe/Berlin', utc(2026, 10, 17, 19)), utc(2026, 10, 18, 19))
+
+    def test_follows_daylight_saving_change(self):
+        # Berlin leaves summer time on 25 October 2026: the same local time is an hour later in UTC
+        self.assertEqual(next_reminder_at(time(21), 'Europe/Berlin', utc(2026, 10, 24, 20)), utc(2026, 10, 25, 20))
+
+    def test_accepts_time_strings(self):
+        self.assertEqual(next_reminder_at('21:00:00', 'Asia/Kolkata', utc(2026, 10, 17)), utc(2026, 10, 17, 15, 30))
+
+    def test_unknown_timezone_falls_back_to_site_timezone(self):
+        self.assertEqual(next_reminder_at(time(21), 'Mars/Olympus', utc(2026, 10, 17)), utc(2026, 10, 17, 15, 30))
+
+
+class ProfileScheduleTests(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user('ada', 'ada@example.com', 'x')
+
+    def test_new_profile_is_scheduled(self):
+        profile = Profile.objects.create(user=self.user, name='Ada')
+        self.assertIsNotNone(profile.next_reminder_at)
+        self.assertGreater(profile.next_reminder_at, timezone.now())
+
+    def test_notifications_off_clears_the_schedule(self):
+        profile = Profile.objects.create(user=self.user, name='Ada')
+        profile.email_notifications = False
+        self.assertIsNone(profile.schedule_reminder())
+        profile.save()
+        self.assertIsNone(Profile.objects.get(pk=profile.pk).next_reminder_at)
+
+
+@mock.patch('jobs.tasks.send_outbox')
+class SendDailyRemindersTests(TestCase):
+
+    def setUp(self):
+        self.now = timezone.now()
+        self.due = self.profile('due', next_reminder_at=self.now - timedelta(minutes=1))
+        self.later = self.profile('later', next_reminder_at=self.now + timedelta(hours=1))
+        goal = Goal.objects.create(user=self.due.user, title='Goal', target_completion_date=self.now.date())
+        Task.objects.create(goal=goal, description='Overdue task', due_date=self.now.date() - timedelta(days=3))
+
+    def profile(self, username, email=None, **fields):
+        user = User.objects.create_user(username, email if email is not None else f'{username}@example.com', 'x')
+        return Profile.objects.create(user=user, name=username, timezone='UTC', **fields)
+
+    def test_queues_only_due_profiles_once(self, send_outbox):
+        self.assertEqual(send_daily_reminders(), 1)
+        email = OutboxEmail.objects.get()
+        self.assertEqual(email.to_email, 'due@example.com')
+        self.assertIn('1 task due', email.subject)
+        send_outbox.delay.assert_called_once()
+
+        # Rescheduled to the next day, so the next tick sends nothing
+        self.due.refresh_from_db()
+        self.assertGreater(self.due.next_reminder_at, self.now)
+        self.assertEqual(send_daily_reminders(), 0)
+        self.assertEqual(OutboxEmail.objects.count(), 1)
+
+    def test_profiles_without_email_are_rescheduled_but_not_mailed(self, send_outbox):
+        silent = self.profile('silent', email='', next_reminder_at=self.now - timedelta(minutes=1))
+        self.assertEqual(send_daily_reminders(), 1)
+        silent.refresh_from_db()
+        self.assertGreater(silent.next_reminder_at, self.now)
+
+    def test_overlapping_ticks_claim_each_profile_once(self, send_outbox):
+        schedule_reminder = Profile.schedule_reminder
+
+        def claimed_elsewhere(profile, *args, **kwargs):
+            # Another tick claims the profile between this one reading and rescheduling it
+            Profile.objects.filter(pk=profile.pk).update(next_reminder_at=self.now + timedelta(days=1))
+            return schedule_reminder(profile, *args, **kwargs)
 
-# Create your tests here.
+        with mock.patch.object(Profile, 'schedule_reminder', claimed_elsewhere):
+            self.assertEqual(send_daily_reminders(), 0)
+        self.assertFalse(OutboxEmail.objects.exists())
+        send_outbox.delay.assert_not_called()
@@ -1,4 +1,6 @@
 # accounts/views.py
+import logging
+
 from django.shortcuts import render, redirect
 from django.contrib.auth import login, logout
 from django.contrib.auth.forms import UserCreationForm, AuthenticationForm
@@ -8,6 +10,9 @@ from django_ratelimit.decorators import ratelimit
 from django_ratelimit import UNSAFE
 from .models import Profile
 from .forms import ProfileForm
+from jobs.matching import index_profile
+
+logger = logging.getLogger(__name__)
 
 # ==========================
 # REGISTRATION
@@ -19,7 +24,7 @@ def register(request):
             user = form.save()
             
             # Auto-create profile with defaults
-            Profile.objects.create(
+            profile = Profile.objects.create(
                 user=user,
                 name=user.username,
                 current_role="Software Engineer",
@@ -28,6 +33,7 @@ def register(request):
                 key_skills=['Python', 'Django', 'Robot Framework', 'SQL', 'Automation Testing'],
                 email_notifications=True
             )
+            index_profile(profile)
             
             login(request, user)
             messages.success(request, "Welcome! Let's set up your job preferences →")
@@ -88,14 +94,15 @@ def settings_view(request):
         form = ProfileForm(request.POST, instance=profile)
         if form.is_valid():
             form.save()
-            messages.success(request, "Profile saved! Fetching your dream jobs now...")
-            
-            # Trigger job fetch with updated skills
+            # Match this user against fresh downloads in the background — never inside the request.
+            # force=True because the profile changed, so unchanged boards (304s) still need matching.
             try:
                 from jobs.tasks import fetch_jobs
-                fetch_jobs.delay()  # Background (safe)
-            except:
-                fetch_jobs()  # Fallback sync
+                fetch_jobs.apply_async(kwargs={'force': True, 'user_ids': [request.user.pk]}, retry=False)
+                messages.success(request, "Profile saved! Fetching your dream jobs now...")
+            except Exception:
+                logger.exception("Could not queue job fetch for user %s", request.user.pk)
+                messages.success(request, "Profile saved! New jobs will arrive with the next scheduled fetch.")
             
             return redirect('jobs')
     else:
@@ -24,6 +24,7 @@ if not SECRET_KEY:
     raise ValueError("SECRET_KEY is missing! Create .env file with SECRET_KEY=")
 
 OPENAI_API_KEY = os.getenv('OPENAI_API_KEY')
+OPENAI_MODEL = os.getenv('OPENAI_MODEL', 'gpt-4o-mini')  # generated CVs / cover letters are stored per model
 
 # Debug Mode
 DEBUG = os.getenv('DEBUG', 'True') == 'True'
@@ -204,9 +205,18 @@ CELERY_RESULT_SERIALIZER = 'json'
 CELERY_TIMEZONE = 'Asia/Kolkata'
 
 CELERY_BEAT_SCHEDULE = {
-    'fetch-jobs-every-6-hours': {
+    # A short tick: each run only fetches the sources whose JobSource.poll_interval has elapsed (due_sources)
+    'fetch-due-sources': {
         'task': 'jobs.tasks.fetch_jobs',
-        'schedule': crontab(minute=0, hour='*/6'),
+        'schedule': crontab(minute='*/15'),
+    },
+    'send-outbox': {
+        'task': 'jobs.tasks.send_outbox',
+        'schedule': crontab(minute='*'),
+    },
+    'prune-jobs-nightly': {
+        'task': 'jobs.tasks.prune_jobs',
+        'schedule': crontab(minute=30, hour=3),
     },
     'daily-reminders': {
         'task': 'jobs.tasks.send_daily_reminders',
@@ -214,6 +224,63 @@ CELERY_BEAT_SCHEDULE = {
     },
 }
 
+# =============================================================================
+# JOB FETCHING
+# =============================================================================
+
+JOB_FETCH_WORKERS = int(os.getenv('JOB_FETCH_WORKERS', 8))                # parallel source downloads
+JOB_FETCH_SOURCE_TIMEOUT = int(os.getenv('JOB_FETCH_SOURCE_TIMEOUT', 15))  # seconds per source
+JOB_FETCH_RUN_DEADLINE = int(os.getenv('JOB_FETCH_RUN_DEADLINE', 60))      # seconds for the whole run
+JOB_FETCH_MAX_PAGES = int(os.getenv('JOB_FETCH_MAX_PAGES', 10))            # pagination cap per source
+JOB_FETCH_RETRIES = int(os.getenv('JOB_FETCH_RETRIES', 2))                # retries on connection errors / 429 / 5xx
+JOB_FETCH_BREAKER_THRESHOLD = int(os.getenv('JOB_FETCH_BREAKER_THRESHOLD', 3))  # failed runs before a board is skipped
+JOB_FETCH_BREAKER_COOLDOWN = int(os.getenv('JOB_FETCH_BREAKER_COOLDOWN', 60))   # minutes a failing board is skipped
+JOB_INGEST_BATCH_SIZE = int(os.getenv('JOB_INGEST_BATCH_SIZE', 500))      # profiles / rows per bulk insert
+JOB_DEDUP_MAX_DISTANCE = int(os.getenv('JOB_DEDUP_MAX_DISTANCE', 3))      # SimHash bits for "same posting", 0-3
+JOB_DEDUP_WINDOW_DAYS = int(os.getenv('JOB_DEDUP_WINDOW_DAYS', 30))        # days fingerprints are remembered
+
+# =============================================================================
+# JOB RETENTION (jobs/retention.py, nightly prune_jobs task)
+# =============================================================================
+
+JOB_RETENTION_MODE = os.getenv('JOB_RETENTION_MODE', 'archive')                   # 'archive' or 'delete'
+JOB_RETENTION_IGNORED_DAYS = int(os.getenv('JOB_RETENTION_IGNORED_DAYS', 7))      # ignored jobs kept this long
+JOB_RETENTION_NEW_DAYS = int(os.getenv('JOB_RETENTION_NEW_DAYS', 30))             # untouched 'new' jobs kept this long
+JOB_RETENTION_BATCH_SIZE = int(os.getenv('JOB_RETENTION_BATCH_SIZE', 1000))       # rows per delete transaction
+
+# =============================================================================
+# EMAIL OUTBOX
+# =============================================================================
+
+SITE_URL = os.getenv('SITE_URL', 'http://127.0.0.1:8000')                 # used for links in emails
+EMAIL_OUTBOX_BATCH_SIZE = int(os.getenv('EMAIL_OUTBOX_BATCH_SIZE', 100))   # emails per SMTP connection
+EMAIL_OUTBOX_RATE = float(os.getenv('EMAIL_OUTBOX_RATE', 5))               # max emails per second
+EMAIL_OUTBOX_MAX_ATTEMPTS = int(os.getenv('EMAIL_OUTBOX_MAX_ATTEMPTS', 5))  # give up after this many failures
+REMINDER_BATCH_SIZE = int(os.getenv('REMINDER_BATCH_SIZE', 500))           # due profiles per reminder batch
+
+# =============================================================================
+# JOBS PAGE & EXPORT
+# =============================================================================
+
+JOBS_PAGE_SIZE = int(os.getenv('JOBS_PAGE_SIZE', 30))                      # job cards per page / scroll step
+EXPORT_CHUNK_SIZE = int(os.getenv('EXPORT_CHUNK_SIZE', 2000))              # rows fetched per round trip by /export/
+
+# =============================================================================
+# CACHE (per-user job counters, see jobs/counters.py)
+# =============================================================================
+
+# Share the cache between web and Celery processes (e.g. redis://localhost:6379/1);
+# without it each process keeps its own local-memory cache, so job counters aren't cached
+CACHE_REDIS_URL = os.getenv('CACHE_REDIS_URL', '')
+if CACHE_REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': CACHE_REDIS_URL,
+        }
+    }
+JOB_COUNTS_CACHE_TTL = int(os.getenv('JOB_COUNTS_CACHE_TTL', 300))         # seconds; invalidated on every change anyway
+
 # =============================================================================
 # DEFAULTS
 # =============================================================================
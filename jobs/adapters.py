@@ -0,0 +1,148 @@
+# jobs/adapters.py
+"""
+Source adapters: turn one downloaded page of a job board into normalized postings.
+
+Every adapter has the signature ``adapter(source, url, body) -> (entries, next_url)``
+where ``source`` is a JobSource, ``body`` the raw bytes of ``url`` and ``entries``
+a newest-first list of ``(entry_id, posting)``. Adapters never touch the network
+or the database, so they can be benchmarked and run in parallel on their own.
+
+A posting is a plain dict shared by all profiles:
+  title, company, source, url, description
+  location     → fixed country, or None to resolve from each profile's countries
+  tags         → tags supplied by the board, or None to extract from each profile's skills
+  match_skills → False when the board should only be matched on role titles
+  alternates   → [{"source", "url"}] of the same role on other boards, added by jobs/dedup.py
+"""
+import json
+from urllib.parse import parse_qs, urlencode, urlsplit, urlunsplit
+
+import feedparser
+
+ADAPTERS = {}
+
+
+def register(*names):
+    """Register an adapter function under one or more JobSource.adapter names"""
+    def decorator(func):
+        for name in names:
+            ADAPTERS[name] = func
+        return func
+    return decorator
+
+
+def get_adapter(name):
+    """Look up the adapter for a JobSource.adapter value"""
+    try:
+        return ADAPTERS[name]
+    except KeyError:
+        raise ValueError(f"Unknown source adapter '{name}'")
+
+
+def _posting(source, **fields):
+    posting = {
+        "title": "No title",
+        "company": "Unknown",
+        "location": source.country or None,
+        "source": source.label,
+        "url": "#",
+        "description": "",
+        "tags": None,
+        "match_skills": source.config.get("match_skills", True),
+    }
+    posting.update({key: value for key, value in fields.items() if value not in (None, "")})
+    return posting
+
+
+# ==========================
+# RSS / Atom feeds
+# ==========================
+@register('rss', 'atom')
+def parse_feed(source, url, body):
+    feed = feedparser.parse(body)
+    entries = []
+    for entry in feed.entries:
+        link = getattr(entry, "link", "#")
+        entries.append((getattr(entry, "id", "") or link, _posting(
+            source,
+            title=getattr(entry, "title", None),
+            company=getattr(entry, "author", None),
+            url=link,
+            description=getattr(entry, "description", "") or getattr(entry, "summary", ""),
+        )))
+    return entries, None
+
+
+# ==========================
+# JSON APIs (configured per source, no code needed for a new board)
+# ==========================
+# JobSource.config maps posting fields to dotted paths inside each item, e.g.
+#   {"items": "data", "id": "slug", "title": "title", "company": "company_name",
+#    "url": "url", "description": "tags", "tags": "tags", "next": "links.next"}
+# A list of paths means "first non-empty value", except for description where
+# all values are joined. List values (e.g. tags) are joined with spaces for text fields.
+def _lookup(data, path):
+    for key in path.split("."):
+        if not isinstance(data, dict):
+            return None
+        data = data.get(key)
+    return data
+
+
+def _text(value):
+    if isinstance(value, list):
+        return " ".join(str(v) for v in value if v)
+    return "" if value is None else str(value)
+
+
+def _field(item, paths, join=False):
+    if not paths:
+        return None
+    if isinstance(paths, str):
+        paths = [paths]
+    values = [_text(_lookup(item, path)).strip() for path in paths]
+    if join:
+        return " ".join(v for v in values if v)
+    return next((v for v in values if v), None)
+
+
+def next_page_by_offset(url, count):
+    """Advance a ?limit=&page= API to its next page, or None when this page wasn't full"""
+    parts = urlsplit(url)
+    query = parse_qs(parts.query)
+    limit = int(query.get("limit", ["0"])[0] or 0)
+    if not limit or count < limit:
+        return None
+    query["page"] = [str(int(query.get("page", ["0"])[0] or 0) + 1)]
+    return urlunsplit(parts._replace(query=urlencode(query, doseq=True)))
+
+
+@register('json')
+def parse_json_api(source, url, body):
+    config = source.config
+    data = json.loads(body)
+    items = _lookup(data, config.get("items", "data")) or []
+
+    entries = []
+    for item in items:
+        tags = _lookup(item, config["tags"]) if config.get("tags") else None
+        posting = _posting(
+            source,
+            title=_field(item, config.get("title", "title")),
+            company=_field(item, config.get("company", "company")),
+            url=_field(item, config.get("url", "url")),
+            description=_field(item, config.get("description", "description"), join=True),
+            tags=list(tags) if isinstance(tags, list) else None,
+        )
+        entries.append((_field(item, config.get("id")) or posting["url"], posting))
+
+    next_url = _field(data, config.get("next"))
+    return entries, next_url
+
+
+@register('paginated_json')
+def parse_paginated_json_api(source, url, body):
+    """JSON API that pages with ?limit=&page= when it doesn't return a next link"""
+    entries, next_url = parse_json_api(source, url, body)
+    return entries, next_url or next_page_by_offset(url, len(entries))
+
@@ -1,3 +1,61 @@
 from django.contrib import admin
+from django.db.models import F
+from .models import ArchivedJob, FetchRun, FetchSourceStat, GeneratedDocument, JobSource, OutboxEmail
 
-# Register your models here.
+
+@admin.register(JobSource)
+class JobSourceAdmin(admin.ModelAdmin):
+    list_display = ('label', 'adapter', 'country', 'poll_interval', 'enabled')
+    list_filter = ('adapter', 'enabled')
+    list_editable = ('enabled',)
+    search_fields = ('label', 'job_search_url')
+
+
+@admin.register(OutboxEmail)
+class OutboxEmailAdmin(admin.ModelAdmin):
+    list_display = ('subject', 'to_email', 'status', 'attempts', 'next_attempt_at', 'sent_at')
+    list_filter = ('status',)
+    search_fields = ('to_email', 'subject')
+    readonly_fields = ('created_at', 'sent_at', 'last_error')
+
+
+class FetchSourceStatInline(admin.TabularInline):
+    model = FetchSourceStat
+    extra = 0
+    can_delete = False
+    readonly_fields = ('source', 'latency_ms', 'bytes', 'pages', 'entries', 'matched',
+                       'inserted', 'duplicates', 'not_modified', 'error')
+    fields = readonly_fields
+
+
+@admin.register(FetchRun)
+class FetchRunAdmin(admin.ModelAdmin):
+    list_display = ('started_at', 'duration', 'forced', 'scoped', 'sources', 'postings',
+                    'matched', 'inserted', 'duplicates', 'errors')
+    list_filter = ('forced', 'scoped')
+    date_hierarchy = 'started_at'
+    inlines = [FetchSourceStatInline]
+
+
+@admin.register(FetchSourceStat)
+class FetchSourceStatAdmin(admin.ModelAdmin):
+    list_display = ('source', 'run', 'latency_ms', 'bytes', 'entries', 'matched', 'inserted',
+                    'duplicates', 'not_modified', 'error')
+    list_filter = ('source', 'not_modified')
+    date_hierarchy = 'run__started_at'
+    ordering = (F('latency_ms').desc(nulls_last=True),)  # slowest first, timed-out sources last
+
+
+@admin.register(ArchivedJob)
+class ArchivedJobAdmin(admin.ModelAdmin):
+    list_display = ('title', 'company', 'user', 'status', 'reason', 'date_posted', 'archived_at')
+    list_filter = ('reason', 'status')
+    search_fields = ('title', 'company', 'url')
+
+
+@admin.register(GeneratedDocument)
+class GeneratedDocumentAdmin(admin.ModelAdmin):
+    list_display = ('job', 'kind', 'model', 'template_version', 'tokens', 'created_at')
+    list_filter = ('kind', 'model')
+    raw_id_fields = ('job',)
+    readonly_fields = ('profile_hash', 'created_at')
@@ -0,0 +1,53 @@
+# jobs/counters.py
+"""
+Per-user job counters (total + one per status) for the jobs page and dashboard.
+
+They are computed with ONE conditional aggregate and cached per user. Every
+path that changes a user's jobs (status edits, deletes, ingestion, retention)
+calls invalidate(), so page views never recount. That only holds when every
+web worker and Celery process shares the cache (set CACHE_REDIS_URL): with a
+process-local default cache the counters are recounted on every call instead,
+since another process's invalidate() would never reach it.
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Q
+
+from .models import Job
+
+JOB_COUNTS_CACHE_TTL = getattr(settings, 'JOB_COUNTS_CACHE_TTL', 300)  # seconds
+
+STATUSES = [status for status, _ in Job.STATUS_CHOICES]
+
+LOCAL_CACHE_BACKENDS = {
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+}
+
+
+def _cached():
+    return bool(JOB_COUNTS_CACHE_TTL) and settings.CACHES['default']['BACKEND'] not in LOCAL_CACHE_BACKENDS
+
+
+def _key(user_id):
+    return f'jobs:counts:{user_id}'
+
+
+def job_counts(user_id):
+    """{'total': n, 'new': n, 'saved': n, 'applied': n, 'ignored': n} for one user"""
+    cached = _cached()
+    counts = cache.get(_key(user_id)) if cached else None
+    if counts is None:
+        counts = Job.objects.filter(user_id=user_id).aggregate(
+            total=Count('pk'),
+            **{status: Count('pk', filter=Q(status=status)) for status in STATUSES},
+        )
+        if cached:
+            cache.set(_key(user_id), counts, JOB_COUNTS_CACHE_TTL)
+    return counts
+
+
+def invalidate(*user_ids):
+    """Drop the cached counters of these users — call after changing their jobs"""
+    if user_ids and _cached():
+        cache.delete_many([_key(user_id) for user_id in user_ids])
@@ -0,0 +1,199 @@
+# jobs/dedup.py
+"""
+Cross-source duplicate detection.
+
+The same role is often listed on several boards under different URLs. Each
+posting gets a 64-bit SimHash of its normalized company + title shingles;
+postings within JOB_DEDUP_MAX_DISTANCE bits of an earlier one from another
+board, and not in a different location, are collapsed into it and listed
+under its "alternates" instead of becoming their own jobs. Postings must have
+their location resolved first (see describe_postings in jobs/tasks.py) — a
+board listing the same title twice is hiring in two places, not duplicating. Recent fingerprints are kept in
+PostingFingerprint, split into four 16-bit bands so candidates are found with
+indexed equality lookups (any two fingerprints within 3 bits share a band).
+"""
+import hashlib
+import re
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+
+JOB_DEDUP_MAX_DISTANCE = getattr(settings, 'JOB_DEDUP_MAX_DISTANCE', 3)   # differing bits, 0–3 for full recall
+JOB_DEDUP_WINDOW_DAYS = getattr(settings, 'JOB_DEDUP_WINDOW_DAYS', 30)    # how long fingerprints are remembered
+
+BANDS = 4
+BAND_BITS = 64 // BANDS
+BAND_MASK = (1 << BAND_BITS) - 1
+
+# Boilerplate that differs between boards for the same role
+NOISE = re.compile(
+    r'\b(gmbh|ag|inc|ltd|llc|bv|b\.v|oy|ab|plc|pte|corp|co|m/w/d|w/m/d|m/f/d|f/m/d|m/w/x|all genders?)\b'
+)
+NON_WORD = re.compile(r'[^\w+#.]+')
+UNKNOWN_COMPANIES = {'', 'unknown'}
+
+
+def normalize(text):
+    text = NOISE.sub(' ', (text or '').lower())
+    return ' '.join(NON_WORD.sub(' ', text).split())
+
+
+def _features(posting):
+    """Character 3-gram shingles of company + title"""
+    text = f"{normalize(posting['company'])} | {normalize(posting['title'])}"
+    return {text[i:i + 3] for i in range(max(1, len(text) - 2))}
+
+
+def same_place(a, b):
+    """
+    Locations are too short to shingle and often missing ("Germany" vs
+    "Berlin, Germany" vs none), so they're compared as word sets instead:
+    only two known locations with no word in common tell postings apart.
+    """
+    a, b = set(normalize(a).split()), set(normalize(b).split())
+    return not a or not b or bool(a & b)
+
+
+def simhash(features):
+    """64-bit SimHash: a bit is set when most features' own hashes have it set"""
+    rows = [
+        format(int.from_bytes(hashlib.blake2b(feature.encode(), digest_size=8).digest(), 'big'), '064b')
+        for feature in features
+    ]
+    majority = len(rows) / 2
+    return int(''.join('1' if column.count('1') > majority else '0' for column in zip(*rows)) or '0', 2)
+
+
+def fingerprint(posting):
+    """SimHash of a posting, or None when there's too little to go on (no company)"""
+    if normalize(posting['company']) in UNKNOWN_COMPANIES:
+        return None
+    return simhash(_features(posting))
+
+
+def bands(value):
+    return [(value >> (band * BAND_BITS)) & BAND_MASK for band in range(BANDS)]
+
+
+def distance(a, b):
+    return bin(a ^ b).count('1')
+
+
+# BigIntegerField is signed
+def to_db(value):
+    return value - (1 << 64) if value >= 1 << 63 else value
+
+
+def from_db(value):
+    return value + (1 << 64) if value < 0 else value
+
+
+class FingerprintIndex:
+    """Band → fingerprints lookup for one fetch run, seeded with the stored recent fingerprints"""
+
+    def __init__(self):
+        self.buckets = [{} for _ in range(BANDS)]
+        self.canonical = {}  # url → (fingerprint, location, source, posting dict or None when stored)
+
+    def add(self, value, url, location, source, posting=None):
+        self.canonical[url] = (value, location, source, posting)
+        for band, key in enumerate(bands(value)):
+            self.buckets[band].setdefault(key, set()).add(url)
+
+    def nearest(self, value, location, source):
+        """(url, posting) of the closest earlier posting from another source within JOB_DEDUP_MAX_DISTANCE, or None"""
+        candidates = set()
+        for band, key in enumerate(bands(value)):
+            candidates |= self.buckets[band].get(key, set())
+
+        best = None
+        for url in candidates:
+            other, other_location, other_source, posting = self.canonical[url]
+            if other_source == source:
+                continue
+            bits = distance(value, other)
+            if bits <= JOB_DEDUP_MAX_DISTANCE and same_place(location, other_location):
+                if best is None or bits < best[0]:
+                    best = (bits, url, posting)
+        return best and best[1:]
+
+
+def _load_recent(index, values):
+    """Add the stored fingerprints that share a band with any of this run's fingerprints"""
+    from .models import PostingFingerprint
+
+    query = Q()
+    for band in range(BANDS):
+        keys = {bands(value)[band] for value in values}
+        query |= Q(**{f'band{band}__in': keys})
+    cutoff = timezone.now() - timedelta(days=JOB_DEDUP_WINDOW_DAYS)
+    stored = PostingFingerprint.objects.filter(query, seen_at__gte=cutoff).values_list(
+        'fingerprint', 'url', 'location', 'source',
+    )
+    for value, url, location, source in stored.iterator(chunk_size=2000):
+        index.add(from_db(value), url, location, source)
+
+
+def collapse_duplicates(postings):
+    """
+    Drop near-duplicate postings (same role and place, other board) from a fetch.
+    Duplicates of a posting in this run are added to its "alternates"; duplicates
+    of one ingested earlier are added to the alternate_sources of its Posting.
+    New fingerprints are stored for later runs. Returns the canonical postings.
+    """
+    from .models import Posting, PostingFingerprint
+
+    values = [fingerprint(posting) for posting in postings]
+    index = FingerprintIndex()
+    if any(value is not None for value in values):
+        _load_recent(index, [value for value in values if value is not None])
+
+    kept = []
+    new_fingerprints = {}
+    stored_alternates = {}  # canonical url → [alternate, ...]
+    for posting, value in zip(postings, values):
+        posting.setdefault("alternates", [])
+        if value is None:
+            kept.append(posting)
+            continue
+
+        match = index.nearest(value, posting["location"], posting["source"])
+        if match and match[0] != posting["url"]:
+            url, canonical = match
+            alternate = {"source": posting["source"], "url": posting["url"]}
+            if canonical is not None:
+                canonical["alternates"].append(alternate)
+            else:
+                stored_alternates.setdefault(url, []).append(alternate)
+            continue
+
+        kept.append(posting)
+        if not match and posting["url"] not in index.canonical:
+            index.add(value, posting["url"], posting["location"], posting["source"], posting)
+            new_fingerprints[posting["url"]] = (value, posting["location"] or "", posting["source"])
+
+    now = timezone.now()
+    PostingFingerprint.objects.bulk_create([
+        PostingFingerprint(
+            fingerprint=to_db(value), url=url[:500], location=location[:200], source=source[:100], seen_at=now,
+            **{f'band{band}': key for band, key in enumerate(bands(value))},
+        )
+        for url, (value, location, source) in new_fingerprints.items()
+    ], ignore_conflicts=True)
+    PostingFingerprint.objects.filter(seen_at__lt=now - timedelta(days=JOB_DEDUP_WINDOW_DAYS)).delete()
+
+    if stored_alternates:
+        canonicals = list(Posting.objects.filter(url__in=stored_alternates.keys()))
+        for canonical in canonicals:
+            known = {alternate["url"] for alternate in canonical.alternate_sources}
+            canonical.alternate_sources = canonical.alternate_sources + [
+                alternate for alternate in stored_alternates[canonical.url] if alternate["url"] not in known
+            ]
+        Posting.objects.bulk_update(canonicals, ['alternate_sources'], batch_size=500)
+
+    dropped = len(postings) - len(kept)
+    if dropped:
+        print(f"Collapsed {dropped} duplicate postings from other sources")
+    return kept
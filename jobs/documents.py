@@ -0,0 +1,142 @@
+# jobs/documents.py
+"""
+AI-generated CVs and cover letters, stored per job.
+
+Each GeneratedDocument is keyed by (job, kind, hash of the profile fields the
+prompt uses, prompt template version, model), so opening the same job again
+with an unchanged profile returns the stored text instead of another OpenAI
+call. Bump a kind's version in TEMPLATES whenever its prompt changes. Documents
+are deleted with their Job, and storing a fresh one replaces the job's older
+documents of that kind.
+"""
+import hashlib
+import json
+
+from django.conf import settings
+from django.db import transaction
+from openai import OpenAI
+
+from .models import GeneratedDocument
+
+OPENAI_MODEL = getattr(settings, 'OPENAI_MODEL', 'gpt-4o-mini')
+
+client = OpenAI(api_key=settings.OPENAI_API_KEY)
+
+
+def profile_fields(user):
+    """Everything about the candidate that goes into the prompts"""
+    profile = user.profile
+    return {
+        'name': profile.name,
+        'full_name': user.get_full_name(),
+        'username': user.username,
+        'current_role': profile.current_role,
+        'key_skills': list(profile.key_skills),
+        'preferred_roles': list(profile.preferred_roles),
+    }
+
+
+def profile_hash(fields):
+    return hashlib.sha256(json.dumps(fields, sort_keys=True).encode()).hexdigest()
+
+
+# ==========================
+# Prompt templates
+# ==========================
+def cv_messages(fields, posting):
+    prompt = f"""
+    Generate a professional, ATS-friendly CV in clean Markdown format.
+
+    Candidate Profile:
+    - Name: {fields['name'] or fields['full_name'] or fields['username']}
+    - Current Role: {fields['current_role']}
+    - Key Skills: {', '.join(fields['key_skills'])}
+    - Target Roles: {', '.join(fields['preferred_roles'])}
+
+    Target Job:
+    - Title: {posting.title}
+    - Company: {posting.company}
+    - Location: {posting.location}
+    - Skills Required: {', '.join(posting.tags)}
+    - Job Description: {posting.description[:3000]}
+
+    Requirements:
+    - Tailor perfectly to this job
+    - Strong opening summary
+    - Highlight matching skills first
+    - Use clean Markdown (##, -, **bold**, etc.)
+    - Output ONLY the CV — no extra text
+    """
+    return [{"role": "user", "content": prompt}]
+
+
+def cover_letter_messages(fields, posting):
+    prompt = f"""
+    Write a compelling, professional cover letter in plain text (no Markdown) for:
+
+    Name: {fields['name'] or fields['username']}
+    Current Role: {fields['current_role']}
+    Key Skills: {', '.join(fields['key_skills'])}
+
+    Applying for:
+    Job Title: {posting.title}
+    Company: {posting.company}
+    Location: {posting.location}
+
+    Job Description (summary): {posting.description[:2500]}
+
+    Instructions:
+    - Sound confident and enthusiastic
+    - Highlight 2–3 strongest matching skills
+    - Mention why they're excited about this company/role
+    - End with a strong call to action
+    - Keep under 400 words
+    - Natural, human tone
+    """
+    return [
+        {"role": "system", "content": "You are an expert career coach writing winning cover letters."},
+        {"role": "user", "content": prompt}
+    ]
+
+
+TEMPLATES = {
+    'cv': {'version': 1, 'messages': cv_messages, 'max_tokens': 1400, 'temperature': 0.7},
+    'cover_letter': {'version': 1, 'messages': cover_letter_messages, 'max_tokens': 700, 'temperature': 0.8},
+}
+
+
+def generate_document(user, job, kind, regenerate=False):
+    """
+    The user's CV / cover letter for job: the stored one when its key still
+    matches (unless regenerate), otherwise a fresh OpenAI completion, which is
+    stored. Returns (content, cached)
+    """
+    template = TEMPLATES[kind]
+    fields = profile_fields(user)
+    key = {
+        'job': job,
+        'kind': kind,
+        'profile_hash': profile_hash(fields),
+        'template_version': template['version'],
+        'model': OPENAI_MODEL,
+    }
+
+    if not regenerate:
+        content = GeneratedDocument.objects.filter(**key).values_list('content', flat=True).first()
+        if content is not None:
+            return content, True
+
+    response = client.chat.completions.create(
+        model=OPENAI_MODEL,
+        messages=template['messages'](fields, job.posting),
+        max_tokens=template['max_tokens'],
+        temperature=template['temperature']
+    )
+    content = response.choices[0].message.content.strip()
+    tokens = getattr(response.usage, 'total_tokens', 0) or 0
+
+    with transaction.atomic():
+        document, _ = GeneratedDocument.objects.update_or_create(**key, defaults={'content': content, 'tokens': tokens})
+        # Older documents of this kind (previous profile / template / model) are never served again
+        GeneratedDocument.objects.filter(job=job, kind=kind).exclude(pk=document.pk).delete()
+    return content, False
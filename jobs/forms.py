@@ -4,7 +4,7 @@ from .models import JobSource, Job
 class JobSourceForm(forms.ModelForm):
     class Meta:
         model = JobSource
-        fields = ['country', 'label', 'job_search_url']
+        fields = ['label', 'job_search_url', 'adapter', 'country', 'config', 'poll_interval', 'enabled']
 
 class JobStatusForm(forms.ModelForm):
     class Meta:
@@ -0,0 +1,118 @@
+# jobs/http.py
+"""
+Shared HTTP client for job boards: one pooled keep-alive session, bounded
+retries with jittered exponential backoff, and a circuit breaker per source.
+"""
+import random
+import threading
+import time
+from datetime import timedelta
+
+import requests
+from django.conf import settings
+from django.db.models import F
+from django.utils import timezone
+from requests.adapters import HTTPAdapter
+
+from .models import FetchState
+
+JOB_FETCH_RETRIES = getattr(settings, 'JOB_FETCH_RETRIES', 2)
+JOB_FETCH_BACKOFF = getattr(settings, 'JOB_FETCH_BACKOFF', 0.5)                     # seconds, doubled per retry
+JOB_FETCH_BREAKER_THRESHOLD = getattr(settings, 'JOB_FETCH_BREAKER_THRESHOLD', 3)   # failed runs in a row
+JOB_FETCH_BREAKER_COOLDOWN = getattr(settings, 'JOB_FETCH_BREAKER_COOLDOWN', 60)    # minutes to skip the board
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+USER_AGENT = "CareerTracker/1.0 (job alerts)"
+
+
+class SourceTimeout(Exception):
+    """A source did not finish downloading before its deadline"""
+
+
+# ==========================
+# Pooled session
+# ==========================
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session():
+    """One keep-alive session per process, with a connection pool sized for the fetch workers"""
+    global _session
+    with _session_lock:
+        if _session is None:
+            pool_size = getattr(settings, 'JOB_FETCH_WORKERS', 8)
+            adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+            session = requests.Session()
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            session.headers['User-Agent'] = USER_AGENT
+            _session = session
+        return _session
+
+
+def _get_once(url, deadline, headers=None):
+    """One GET, streaming the body so the whole download respects a wall-clock deadline"""
+    remaining = deadline - time.monotonic()
+    if remaining <= 0:
+        raise SourceTimeout("deadline reached before the request started")
+
+    try:
+        with get_session().get(url, headers=headers, timeout=remaining, stream=True) as resp:
+            chunks = []
+            for chunk in resp.iter_content(chunk_size=64 * 1024):
+                if time.monotonic() > deadline:
+                    raise SourceTimeout("deadline reached while downloading")
+                chunks.append(chunk)
+            return resp.status_code, b"".join(chunks), resp.headers
+    except requests.Timeout as e:
+        raise SourceTimeout(str(e)) from e
+
+
+def _retry_after(resp_headers):
+    try:
+        return float(resp_headers.get("Retry-After", 0))
+    except (TypeError, ValueError):
+        return 0
+
+
+def fetch(url, deadline, headers=None):
+    """
+    GET url within deadline, retrying connection errors and 429/5xx answers
+    up to JOB_FETCH_RETRIES times with jittered exponential backoff.
+    Returns (status_code, body, response_headers) of the last attempt.
+    """
+    for attempt in range(JOB_FETCH_RETRIES + 1):
+        last_attempt = attempt == JOB_FETCH_RETRIES
+        delay = JOB_FETCH_BACKOFF * (2 ** attempt) * random.uniform(0.5, 1.5)
+        try:
+            status_code, body, resp_headers = _get_once(url, deadline, headers)
+        except requests.ConnectionError:
+            if last_attempt or time.monotonic() + delay >= deadline:
+                raise
+        else:
+            if status_code not in RETRY_STATUSES or last_attempt:
+                return status_code, body, resp_headers
+            delay = max(delay, _retry_after(resp_headers))
+            if time.monotonic() + delay >= deadline:
+                return status_code, body, resp_headers
+        time.sleep(delay)
+
+
+# ==========================
+# Circuit breaker (state lives on FetchState so every worker sees it)
+# ==========================
+def circuit_open(open_until, now=None):
+    return bool(open_until) and open_until > (now or timezone.now())
+
+
+def record_failure(label):
+    """Count a failed run; open the circuit once JOB_FETCH_BREAKER_THRESHOLD is reached"""
+    state, _ = FetchState.objects.get_or_create(source=label)
+    FetchState.objects.filter(pk=state.pk).update(consecutive_failures=F('consecutive_failures') + 1)
+    state.refresh_from_db(fields=['consecutive_failures'])
+    if state.consecutive_failures >= JOB_FETCH_BREAKER_THRESHOLD:
+        FetchState.objects.filter(pk=state.pk).update(
+            circuit_open_until=timezone.now() + timedelta(minutes=JOB_FETCH_BREAKER_COOLDOWN),
+        )
+        print(f"Circuit open for {label} after {state.consecutive_failures} failures")
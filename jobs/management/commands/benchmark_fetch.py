@@ -0,0 +1,351 @@
+# jobs/management/commands/benchmark_fetch.py
+"""
+Offline benchmark of the whole fetch → match → insert → notify pipeline.
+
+Runs against a throwaway test database and a local HTTP server that stands in
+for every JobSource (synthetic payloads in each source's shape, or recorded
+ones from --payloads), with N synthetic profiles per run. Reports wall time,
+query count and peak Python memory, and fails when a run regresses against
+the stored baseline (benchmarks/fetch_baseline.json; a missing one is an error).
+
+    python manage.py benchmark_fetch --profiles 1,100,1000,10000
+    python manage.py benchmark_fetch --save-baseline
+"""
+import io
+import json
+import random
+import threading
+import time
+import tracemalloc
+from contextlib import redirect_stdout
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from unittest import mock
+from urllib.parse import parse_qs, urlencode, urlsplit
+from xml.sax.saxutils import escape
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core import mail
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import setup_test_environment, teardown_test_environment
+
+from accounts.models import Profile
+from jobs import outbox
+from jobs.matching import index_profile
+from jobs.models import FetchRun, FetchState, Job, JobSource, OutboxEmail, Posting, PostingFingerprint
+from jobs.tasks import run_fetch_jobs
+
+DEFAULT_BASELINE = Path(settings.BASE_DIR) / 'benchmarks' / 'fetch_baseline.json'
+# Tiny runs finish in a fraction of a second — don't fail them on scheduler noise
+MIN_WALL_REGRESSION = 0.25  # seconds
+
+# Real-looking terms padded with synthetic ones, so a posting matches a realistic
+# share of profiles (~10%) instead of nearly all of them
+ROLES = [
+    'Software Engineer', 'Backend Developer', 'SDET', 'QA Automation', 'Data Engineer',
+    'DevOps Engineer', 'Frontend Developer', 'Full Stack Developer', 'Mobile Developer', 'Data Scientist',
+] + [f"Role{i:02d} Engineer" for i in range(20)]
+SKILLS = [
+    'Python', 'Django', 'SQL', 'Robot Framework', 'Automation Testing', 'Java', 'JavaScript', 'React',
+    'AWS', 'Docker', 'Kubernetes', 'Go', 'C++', '.NET', 'Selenium', 'Postgres',
+] + [f"Tech{i:02d}" for i in range(64)]
+COUNTRIES = ['Singapore', 'Germany', 'Finland', 'Switzerland', 'Netherlands', 'New Zealand', 'Canada', 'Ireland']
+SENIORITY = ['Junior', 'Mid-level', 'Senior', 'Lead', 'Principal']
+FILLER = ['distributed systems', 'customer facing', 'fast paced team', 'remote friendly', 'greenfield project']
+
+
+# ==========================
+# Synthetic payloads in each source's shape
+# ==========================
+def _synthetic_postings(rng, source, count):
+    postings = []
+    for i in range(count):
+        skills = rng.sample(SKILLS, 2)
+        postings.append({
+            'id': f"{source.pk}-{i}",
+            'title': f"{rng.choice(SENIORITY)} {rng.choice(ROLES)}",
+            'company': f"Company {rng.randrange(500)}",
+            'url': f"https://jobs.example.com/{source.pk}/{i}",
+            'description': f"{', '.join(skills)} — {rng.choice(FILLER)} in {rng.choice(COUNTRIES)}.",
+            'tags': skills,
+        })
+    return postings
+
+
+def _put(item, path, value):
+    keys = path.split('.')
+    for key in keys[:-1]:
+        item = item.setdefault(key, {})
+    item[keys[-1]] = value
+
+
+def _first(paths, default):
+    if not paths:
+        return default
+    return paths[0] if isinstance(paths, list) else paths
+
+
+def _rss(postings):
+    items = ''.join(
+        f"<item><title>{escape(p['title'])}</title><link>{p['url']}</link>"
+        f"<guid>{p['id']}</guid><author>{escape(p['company'])}</author>"
+        f"<description>{escape(p['description'])}</description></item>"
+        for p in postings
+    )
+    return f'<?xml version="1.0"?><rss version="2.0"><channel><title>bench</title>{items}</channel></rss>'.encode()
+
+
+def _json_page(source, postings, next_url):
+    config = source.config
+    items = []
+    for p in postings:
+        item = {}
+        _put(item, _first(config.get('id'), 'id'), p['id'])
+        _put(item, _first(config.get('title'), 'title'), p['title'])
+        _put(item, _first(config.get('company'), 'company'), p['company'])
+        _put(item, _first(config.get('url'), 'url'), p['url'])
+        _put(item, _first(config.get('description'), 'description'), p['description'])
+        if config.get('tags'):
+            _put(item, config['tags'], p['tags'])
+        items.append(item)
+    page = {}
+    _put(page, config.get('items', 'data'), items)
+    if config.get('next') and next_url:
+        _put(page, config['next'], next_url)
+    return json.dumps(page).encode()
+
+
+class BoardServer:
+    """Local HTTP server answering for every benchmarked JobSource at /<source pk>"""
+
+    def __init__(self, sources, postings, recorded):
+        self.sources = {str(source.pk): source for source in sources}
+        self.postings = postings    # source pk → synthetic postings
+        self.recorded = recorded    # source pk → recorded payload bytes
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                body = server.page(self.path)
+                if body is None:
+                    self.send_response(404)
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_port}"
+
+    def page(self, path):
+        parts = urlsplit(path)
+        key = parts.path.strip('/')
+        source = self.sources.get(key)
+        if source is None:
+            return None
+        if key in self.recorded:
+            return self.recorded[key]
+
+        postings = self.postings[key]
+        if source.adapter in ('rss', 'atom'):
+            return _rss(postings)
+
+        # JSON boards page with ?limit=&page= (offset pager) or follow a next link
+        query = parse_qs(parts.query)
+        limit = int(query.get('limit', [0])[0] or 0) or 50
+        page = int(query.get('page', [0])[0] or 0)
+        chunk = postings[page * limit:(page + 1) * limit]
+        next_url = None
+        if source.adapter == 'json' and (page + 1) * limit < len(postings):
+            next_url = f"{self.url}/{key}?{urlencode({**{k: v[0] for k, v in query.items()}, 'limit': limit, 'page': page + 1})}"
+        return _json_page(source, chunk, next_url)
+
+    def __enter__(self):
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+class Command(BaseCommand):
+    help = 'Benchmark fetch → match → insert → notify offline against a local stand-in job board'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--profiles', default='1,100,1000',
+                            help='Comma-separated profile counts to benchmark (e.g. 1,100,1000,10000)')
+        parser.add_argument('--postings', type=int, default=50, help='Synthetic postings per source')
+        parser.add_argument('--payloads', type=Path,
+                            help='Directory of recorded payloads named <source label>.xml / .json (one page each)')
+        parser.add_argument('--baseline', type=Path, default=DEFAULT_BASELINE, help='Baseline JSON file')
+        parser.add_argument('--save-baseline', action='store_true', help='Store this run as the new baseline')
+        parser.add_argument('--tolerance', type=float, default=0.25,
+                            help='Allowed slowdown / growth over the baseline before failing (0.25 = 25%%)')
+        parser.add_argument('--seed', type=int, default=42)
+
+    def handle(self, *args, **kwargs):
+        sizes = [int(size) for size in kwargs['profiles'].split(',') if size.strip()]
+        rng = random.Random(kwargs['seed'])
+
+        setup_test_environment()  # locmem email backend
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            results = self.run_benchmarks(sizes, rng, kwargs)
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        self.report(results)
+        if kwargs['save_baseline']:
+            kwargs['baseline'].parent.mkdir(parents=True, exist_ok=True)
+            kwargs['baseline'].write_text(json.dumps(results, indent=2, sort_keys=True) + '\n')
+            self.stdout.write(self.style.SUCCESS(f"Baseline saved to {kwargs['baseline']}"))
+        else:
+            self.compare(results, kwargs['baseline'], kwargs['tolerance'])
+
+    # ==========================
+    # Setup
+    # ==========================
+    def prepare_sources(self, rng, postings_per_source, payload_dir):
+        """Point every JobSource (the built-in boards seeded by migrations) at the local server"""
+        sources = list(JobSource.objects.order_by('pk'))
+        postings = {str(s.pk): _synthetic_postings(rng, s, postings_per_source) for s in sources}
+        recorded = {}
+        if payload_dir:
+            for source in sources:
+                for suffix in ('.xml', '.json'):
+                    path = payload_dir / f"{source.label}{suffix}"
+                    if path.exists():
+                        recorded[str(source.pk)] = path.read_bytes()
+        return sources, postings, recorded
+
+    def seed_profiles(self, rng, count):
+        Profile.objects.all().delete()
+        User.objects.all().delete()
+        users = User.objects.bulk_create([
+            User(username=f"bench{i}", email=f"bench{i}@example.com") for i in range(count)
+        ])
+        profiles = Profile.objects.bulk_create([
+            Profile(
+                user=user,
+                name=user.username,
+                target_countries=rng.sample(COUNTRIES, 2),
+                preferred_roles=rng.sample(ROLES, 2),
+                key_skills=rng.sample(SKILLS, 3),
+                email_notifications=True,
+            )
+            for user in users
+        ])
+        with transaction.atomic():
+            for profile in profiles:
+                index_profile(profile)
+
+    def reset_run_state(self):
+        Job.objects.all().delete()
+        Posting.objects.all().delete()
+        PostingFingerprint.objects.all().delete()
+        OutboxEmail.objects.all().delete()
+        FetchState.objects.all().delete()
+        FetchRun.objects.all().delete()
+        mail.outbox = []
+
+    # ==========================
+    # Measure
+    # ==========================
+    def run_pipeline(self):
+        with redirect_stdout(io.StringIO()), mock.patch.object(outbox, 'EMAIL_OUTBOX_RATE', 0):
+            return run_fetch_jobs(force=True)
+
+    def run_benchmarks(self, sizes, rng, kwargs):
+        sources, postings, recorded = self.prepare_sources(rng, kwargs['postings'], kwargs['payloads'])
+        results = {}
+        with BoardServer(sources, postings, recorded) as server:
+            for source in sources:
+                query = urlsplit(source.job_search_url).query
+                source.job_search_url = f"{server.url}/{source.pk}" + (f"?{query}" if query else '')
+                source.enabled = True
+                source.config = {**source.config, 'timeout': 120}
+            JobSource.objects.bulk_update(sources, ['job_search_url', 'enabled', 'config'])
+
+            for size in sizes:
+                self.stdout.write(f"Benchmarking {size} profiles...")
+                self.seed_profiles(rng, size)
+
+                # Pass 1: wall time and queries (counted as they run — the debug query log
+                # only keeps the last 9000, which seeding large sizes already fills)
+                self.reset_run_state()
+                queries = []
+
+                def count_query(execute, sql, params, many, context):
+                    queries.append(sql)
+                    return execute(sql, params, many, context)
+
+                with connection.execute_wrapper(count_query):
+                    started = time.perf_counter()
+                    new_jobs = self.run_pipeline()
+                    wall = time.perf_counter() - started
+                run = FetchRun.objects.first()
+                emails = len(mail.outbox)
+
+                # Pass 2: peak memory (tracemalloc slows everything down, so it gets its own run)
+                self.reset_run_state()
+                tracemalloc.start()
+                self.run_pipeline()
+                _, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+
+                results[str(size)] = {
+                    'profiles': size,
+                    'postings': run.postings if run else 0,
+                    'new_jobs': new_jobs,
+                    'emails': emails,
+                    'wall_seconds': round(wall, 3),
+                    'queries': len(queries),
+                    'peak_memory_mb': round(peak / (1024 * 1024), 2),
+                }
+        return results
+
+    # ==========================
+    # Report
+    # ==========================
+    def report(self, results):
+        self.stdout.write('')
+        self.stdout.write(
+            f"{'profiles':>8} {'postings':>8} {'new jobs':>9} {'emails':>7} {'wall s':>8} {'queries':>8} {'peak MB':>8}"
+        )
+        for row in results.values():
+            self.stdout.write(
+                f"{row['profiles']:>8} {row['postings']:>8} {row['new_jobs']:>9} {row['emails']:>7} "
+                f"{row['wall_seconds']:>8.3f} {row['queries']:>8} {row['peak_memory_mb']:>8.2f}"
+            )
+
+    def compare(self, results, baseline_path, tolerance):
+        if not baseline_path.exists():
+            raise CommandError(f"No baseline at {baseline_path} — run with --save-baseline to store one")
+
+        baseline = json.loads(baseline_path.read_text())
+        regressions = []
+        for size, row in results.items():
+            base = baseline.get(size)
+            if not base:
+                continue
+            for metric in ('wall_seconds', 'queries', 'peak_memory_mb'):
+                limit = base[metric] * (1 + tolerance)
+                if metric == 'wall_seconds':
+                    limit = max(limit, base[metric] + MIN_WALL_REGRESSION)
+                if row[metric] > limit:
+                    regressions.append(
+                        f"{size} profiles: {metric} {row[metric]} > {base[metric]} (+{tolerance:.0%} allowed)"
+                    )
+
+        if regressions:
+            raise CommandError("Benchmark regressions:\n  " + "\n  ".join(regressions))
+        self.stdout.write(self.style.SUCCESS('No regressions against the baseline'))
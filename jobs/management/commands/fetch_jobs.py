@@ -1,10 +1,25 @@
 # jobs/management/commands/fetch_jobs.py
 from django.core.management.base import BaseCommand
-from jobs.tasks import fetch_jobs  # ← This now works!
+from jobs.tasks import fetch_jobs, run_fetch_jobs
 
 class Command(BaseCommand):
     help = 'Fetch real jobs from top international boards'
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--force', action='store_true',
+            help='Ignore stored ETag / Last-Modified and re-download every source',
+        )
+        parser.add_argument(
+            '--queue', action='store_true',
+            help='Queue the Celery task graph instead of running in this process',
+        )
+
     def handle(self, *args, **kwargs):
-        fetch_jobs()  # Runs immediately
+        if kwargs['queue']:
+            fetch_jobs.delay(force=kwargs['force'])
+            self.stdout.write(self.style.SUCCESS('Job fetch queued — watch the Celery worker log'))
+            return
+
+        run_fetch_jobs(force=kwargs['force'])  # Runs immediately
         self.stdout.write(self.style.SUCCESS('Jobs fetched successfully! Check /jobs/ or Admin'))
\ No newline at end of file
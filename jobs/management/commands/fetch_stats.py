@@ -0,0 +1,58 @@
+# jobs/management/commands/fetch_stats.py
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db.models import Avg, Count, F, Max, Q, Sum
+from django.utils import timezone
+from jobs.models import FetchRun, FetchSourceStat
+
+
+class Command(BaseCommand):
+    help = 'Show recent fetch runs and the slowest job sources'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--runs', type=int, default=10, help='Number of recent runs to list')
+        parser.add_argument('--days', type=int, default=7, help='Window for the per-source report')
+        parser.add_argument('--limit', type=int, default=10, help='Number of sources to list')
+
+    def handle(self, *args, **kwargs):
+        self.stdout.write(self.style.MIGRATE_HEADING('Recent runs'))
+        self.stdout.write(
+            f"{'started':<17} {'secs':>7} {'sources':>7} {'postings':>8} {'matched':>7} "
+            f"{'inserted':>8} {'dupes':>6} {'errors':>6}"
+        )
+        for run in FetchRun.objects.all()[:kwargs['runs']]:
+            duration = f"{run.duration:.1f}" if run.duration is not None else 'running'
+            self.stdout.write(
+                f"{timezone.localtime(run.started_at):%Y-%m-%d %H:%M} {duration:>7} {run.sources:>7} "
+                f"{run.postings:>8} {run.matched:>7} {run.inserted:>8} {run.duplicates:>6} {run.errors:>6}"
+            )
+
+        since = timezone.now() - timedelta(days=kwargs['days'])
+        sources = (
+            FetchSourceStat.objects.filter(run__started_at__gte=since)
+            .values('source')
+            .annotate(
+                runs=Count('pk'),
+                avg_ms=Avg('latency_ms'),
+                max_ms=Max('latency_ms'),
+                kb=Sum('bytes') / 1024,
+                entries=Sum('entries'),
+                inserted=Sum('inserted'),
+                errors=Count('pk', filter=~Q(error='')),
+            )
+            # Sources that never answered have no timings — list them after the slow ones, not first (Postgres)
+            .order_by(F('avg_ms').desc(nulls_last=True))[:kwargs['limit']]
+        )
+
+        self.stdout.write('')
+        self.stdout.write(self.style.MIGRATE_HEADING(f"Slowest sources (last {kwargs['days']} days)"))
+        self.stdout.write(
+            f"{'source':<25} {'runs':>5} {'avg ms':>8} {'max ms':>8} {'KB':>8} "
+            f"{'entries':>8} {'inserted':>8} {'errors':>6}"
+        )
+        for row in sources:
+            self.stdout.write(
+                f"{row['source'][:25]:<25} {row['runs']:>5} {row['avg_ms'] or 0:>8.0f} {row['max_ms'] or 0:>8} "
+                f"{row['kb'] or 0:>8} {row['entries'] or 0:>8} {row['inserted'] or 0:>8} {row['errors']:>6}"
+            )
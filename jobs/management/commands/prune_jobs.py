@@ -0,0 +1,36 @@
+# jobs/management/commands/prune_jobs.py
+from django.core.management.base import BaseCommand, CommandError
+from jobs import retention
+
+
+class Command(BaseCommand):
+    help = 'Archive or delete ignored and stale jobs (retention policy)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--mode', choices=retention.MODES, default=retention.JOB_RETENTION_MODE,
+                            help='Move expired jobs to the archive table, or delete them (leaving a URL tombstone)')
+        parser.add_argument('--ignored-days', type=int, default=retention.JOB_RETENTION_IGNORED_DAYS,
+                            help='Remove ignored jobs not touched for this many days')
+        parser.add_argument('--new-days', type=int, default=retention.JOB_RETENTION_NEW_DAYS,
+                            help="Remove jobs still 'new' after this many days")
+        parser.add_argument('--batch-size', type=int, default=retention.JOB_RETENTION_BATCH_SIZE,
+                            help='Rows per transaction')
+        parser.add_argument('--dry-run', action='store_true', help='Only count what would be removed')
+
+    def handle(self, *args, **kwargs):
+        if kwargs['batch_size'] < 1:
+            raise CommandError('--batch-size must be at least 1')
+
+        counts = retention.apply_retention(
+            mode=kwargs['mode'],
+            ignored_days=kwargs['ignored_days'],
+            new_days=kwargs['new_days'],
+            batch_size=kwargs['batch_size'],
+            dry_run=kwargs['dry_run'],
+        )
+        verb = 'Would reclaim' if kwargs['dry_run'] else 'Reclaimed'
+        action = 'deleted' if kwargs['mode'] == 'delete' else 'archived'
+        self.stdout.write(self.style.SUCCESS(
+            f"{verb} {counts['ignored']} ignored + {counts['stale']} stale jobs ({action}) "
+            f"and {counts['postings']} unused postings"
+        ))
@@ -0,0 +1,241 @@
+# jobs/matching.py
+import re
+from collections import defaultdict
+
+from django.db import transaction
+from django.utils import timezone
+
+
+_WORD_CHAR = re.compile(r'\w')
+
+
+class KeywordMatcher:
+    """
+    Finds every configured term (role, skill, country…) in a text in ONE pass.
+
+    All terms are compiled into a single case-insensitive alternation with word
+    boundaries, so "Java" does not match "JavaScript" and "C++" / ".NET" still work.
+    Longer terms win at a given position; shorter terms they contain
+    ("Testing" inside "Automation Testing") are added from a precomputed table.
+    """
+
+    def __init__(self, terms):
+        # Dedupe case-insensitively
+        self._keys = {(term or '').strip().lower() for term in terms} - {''}
+
+        keys = sorted(self._keys, key=len, reverse=True)
+        self._regex = None
+        if keys:
+            alternation = '|'.join(re.escape(key) for key in keys)
+            # Zero-width lookahead → a match can start at every position, not just after the previous one
+            self._regex = re.compile(rf'(?=(?<!\w)({alternation})(?!\w))', re.IGNORECASE)
+
+        self._contained = {key: self._terms_inside(key) for key in keys}
+
+    def _terms_inside(self, key):
+        """
+        The other terms found in key under the same word-boundary rule as the
+        regex, by looking up each bounded span of key in the term set — linear
+        in the number of terms instead of one regex per pair of them
+        """
+        starts = [i for i in range(len(key)) if i == 0 or not _WORD_CHAR.match(key[i - 1])]
+        ends = [j for j in range(1, len(key) + 1) if j == len(key) or not _WORD_CHAR.match(key[j])]
+        return {
+            key[i:j] for i in starts for j in ends
+            if i < j and j - i < len(key) and key[i:j] in self._keys
+        }
+
+    def find(self, text):
+        """Return the set of lower-cased terms that occur in text"""
+        found = set()
+        if not text or self._regex is None:
+            return found
+        for match in self._regex.finditer(text):
+            key = match.group(1).lower()
+            if key in self._keys:
+                found.add(key)
+                found.update(self._contained[key])
+        return found
+
+    def first(self, text):
+        """Return the lower-cased term that occurs earliest in text (longest at that position), or None"""
+        if not text or self._regex is None:
+            return None
+        for match in self._regex.finditer(text):
+            key = match.group(1).lower()
+            if key in self._keys:
+                return key
+        return None
+
+
+# ==========================
+# Inverted index: term → profiles
+# ==========================
+# Profile field → ProfileTerm.kind
+INDEXED_FIELDS = {
+    'preferred_roles': 'role',
+    'key_skills': 'skill',
+    'target_countries': 'country',
+}
+
+
+def index_profile(profile):
+    """(Re)build the ProfileTerm rows of one profile — call whenever its terms change"""
+    from .models import ProfileTerm
+
+    rows = []
+    for field, kind in INDEXED_FIELDS.items():
+        seen = set()
+        for term in getattr(profile, field) or []:
+            term = (term or '').strip()[:200]
+            if not term or term.lower() in seen:
+                continue
+            seen.add(term.lower())
+            rows.append(ProfileTerm(
+                profile=profile, kind=kind, term=term, normalized=term.lower(), position=len(seen),
+            ))
+
+    with transaction.atomic():
+        ProfileTerm.objects.filter(profile=profile).delete()
+        ProfileTerm.objects.bulk_create(rows)
+
+
+class ProfileIndex:
+    """
+    In-memory view of the ProfileTerm table for one fetch run.
+
+    Every posting is scanned against the union of all profiles' roles and skills,
+    and the hits are looked up here to get the candidate users directly, so
+    matching cost follows the number of distinct terms, not the user count.
+    Build it once per run: its matchers also describe new postings (see
+    describe_posting), and match_postings can be limited to a chunk of users.
+    """
+
+    KINDS = ('role', 'skill')  # countries only decide a posting's location, not who it matches
+
+    def __init__(self, rows):
+        # rows: (user_id, kind, normalized term)
+        self.users = {kind: defaultdict(set) for kind in INDEXED_FIELDS.values()}
+        for user_id, kind, term in rows:
+            self.users[kind][term].add(user_id)
+        self.matchers = {kind: KeywordMatcher(sorted(users)) for kind, users in self.users.items()}
+
+    @classmethod
+    def load(cls, user_ids=None):
+        from .models import ProfileTerm
+
+        rows = ProfileTerm.objects.all()
+        if user_ids is not None:
+            rows = rows.filter(profile__user_id__in=user_ids)
+        return cls(rows.values_list('profile__user_id', 'kind', 'normalized').iterator(chunk_size=2000))
+
+    def _users_for(self, kind, hits):
+        users = set()
+        for key in hits:
+            users |= self.users[kind].get(key, set())
+        return users
+
+    def match(self, posting):
+        """Return the ids of every user this posting is relevant to"""
+        candidates = self._users_for('role', self.matchers['role'].find(posting["title"]))
+        if posting["match_skills"]:
+            text = posting["title"] + " " + posting["description"]
+            candidates |= self._users_for('skill', self.matchers['skill'].find(text))
+        return candidates
+
+    def match_postings(self, postings, user_ids=None):
+        """Return {user_id: [posting, ...]} for a whole fetch, only for user_ids when given"""
+        allowed = None if user_ids is None else set(user_ids)
+        matches = defaultdict(list)
+        for posting in postings:
+            for user_id in self.match(posting):
+                if allowed is None or user_id in allowed:
+                    matches[user_id].append(posting)
+        return matches
+
+
+# ==========================
+# Shared posting details
+# ==========================
+def term_matchers():
+    """One matcher per kind over the distinct normalized terms of all profiles (read from the (kind, normalized) index)"""
+    from .models import ProfileTerm
+
+    terms = defaultdict(set)
+    for kind, term in ProfileTerm.objects.values_list('kind', 'normalized').distinct().iterator(chunk_size=2000):
+        terms[kind].add(term)
+    return {kind: KeywordMatcher(sorted(terms[kind])) for kind in INDEXED_FIELDS.values()}
+
+
+def describe_posting(posting, matchers):
+    """
+    (location, tags) stored on the shared Posting, the same whichever users it
+    matches. Boards that don't supply them get the country the text names first
+    ("International" otherwise) and every known skill the text mentions. Tags
+    are lower-cased, so they don't follow any one user's spelling.
+    """
+    text = posting["title"] + " " + posting["description"]
+    location = posting["location"]
+    if location is None:
+        location = (matchers['country'].first(text) or "International").title()
+    tags = posting["tags"]
+    if tags is None:
+        tags = sorted(matchers['skill'].find(text))
+    else:
+        tags = list(dict.fromkeys(str(tag).strip().lower() for tag in tags if tag))
+    return location, tags
+
+
+# ==========================
+# Relevance — stored on Job.relevance_score, so lists sort / filter on it in SQL
+# ==========================
+RELEVANCE_LABELS = [(3, 'Highly Relevant'), (1, 'Relevant'), (0, 'Low Relevance')]
+
+
+def relevance_label(score):
+    return next(label for minimum, label in RELEVANCE_LABELS if score >= minimum)
+
+
+def _normalized(terms):
+    return {str(term).strip().lower() for term in terms or []} - {''}
+
+
+class RelevanceScorer:
+    """
+    Scores postings for one profile: one point for a target country, one per
+    preferred role in the title and one per key skill in the posting's tags.
+    Everything is compared case-insensitively, roles with the same word-boundary
+    rule as matching (KeywordMatcher), so a score doesn't depend on spelling.
+    """
+
+    def __init__(self, profile):
+        self.countries = _normalized(profile.target_countries)
+        self.roles = KeywordMatcher(profile.preferred_roles or [])
+        self.skills = _normalized(profile.key_skills)
+
+    def score(self, location, title, tags):
+        score = 1 if (location or '').strip().lower() in self.countries else 0
+        score += len(self.roles.find(title))
+        return score + len(self.skills & _normalized(tags))
+
+
+def rescore_jobs(profile, batch_size=1000):
+    """
+    Recompute relevance_score of all of a profile's jobs — call whenever its terms change.
+    Changed rows get a new updated_at too (bulk_update skips auto_now), so
+    incremental exports (?updated_since=) pick them up.
+    """
+    from .models import Job
+
+    scorer = RelevanceScorer(profile)
+    now = timezone.now()
+    rows = Job.objects.filter(user_id=profile.user_id).values_list(
+        'pk', 'relevance_score', 'posting__location', 'posting__title', 'posting__tags',
+    )
+    changed = []
+    for pk, current, location, title, tags in rows.iterator(chunk_size=2000):
+        score = scorer.score(location, title, tags)
+        if score != current:
+            changed.append(Job(pk=pk, relevance_score=score, updated_at=now))
+    Job.objects.bulk_update(changed, ['relevance_score', 'updated_at'], batch_size=batch_size)
+    return len(changed)
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-17 22:47
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Min
+
+
+def remove_duplicate_jobs(apps, schema_editor):
+    """Keep the oldest row for every (user, url) pair so the constraint can be added"""
+    Job = apps.get_model('jobs', 'Job')
+    duplicates = (
+        Job.objects.values('user_id', 'url')
+        .annotate(keep_id=Min('id'), rows=models.Count('id'))
+        .filter(rows__gt=1)
+    )
+    for dup in duplicates.iterator():
+        Job.objects.filter(user_id=dup['user_id'], url=dup['url']).exclude(id=dup['keep_id']).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0003_fetchstate'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicate_jobs, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='job',
+            constraint=models.UniqueConstraint(fields=('user', 'url'), name='unique_job_url_per_user'),
+        ),
+    ]
@@ -0,0 +1,56 @@
+# Generated by Django 5.2.18 on 2026-10-17 22:49
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+INDEXED_FIELDS = {
+    'preferred_roles': 'role',
+    'key_skills': 'skill',
+    'target_countries': 'country',
+}
+
+
+def index_existing_profiles(apps, schema_editor):
+    """Backfill the inverted index for profiles saved before it existed"""
+    Profile = apps.get_model('accounts', 'Profile')
+    ProfileTerm = apps.get_model('jobs', 'ProfileTerm')
+
+    rows = []
+    for profile in Profile.objects.iterator():
+        for field, kind in INDEXED_FIELDS.items():
+            seen = set()
+            for term in getattr(profile, field) or []:
+                term = (term or '').strip()[:200]
+                if not term or term.lower() in seen:
+                    continue
+                seen.add(term.lower())
+                rows.append(ProfileTerm(
+                    profile=profile, kind=kind, term=term, normalized=term.lower(), position=len(seen),
+                ))
+    ProfileTerm.objects.bulk_create(rows, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0002_profile_email_notifications_profile_reminder_time'),
+        ('jobs', '0004_job_unique_url_per_user'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProfileTerm',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('role', 'Role'), ('skill', 'Skill'), ('country', 'Country')], max_length=10)),
+                ('term', models.CharField(max_length=200)),
+                ('normalized', models.CharField(max_length=200)),
+                ('position', models.PositiveSmallIntegerField(default=0)),
+                ('profile', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='terms', to='accounts.profile')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['kind', 'normalized'], name='jobs_profil_kind_9c5923_idx')],
+            },
+        ),
+        migrations.RunPython(index_existing_profiles, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 22:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0005_profileterm'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='fetchstate',
+            name='high_water_mark',
+            field=models.CharField(blank=True, max_length=500),
+        ),
+    ]
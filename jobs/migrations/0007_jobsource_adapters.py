@@ -0,0 +1,100 @@
+# Generated by Django 5.2.18 on 2026-10-17 22:51
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+# The boards that used to be hard-coded as JOB_SOURCES in jobs/tasks.py
+BUILT_IN_SOURCES = [
+    {"label": "Relocate.me", "job_search_url": "https://relocate.me/jobs/rss", "adapter": "rss"},
+    {"label": "StepStone.de", "job_search_url": "https://www.stepstone.de/rss/jobs.rss?wt=1&what=python+django+robot+framework&where=deutschland", "adapter": "rss"},
+    {
+        "label": "Arbeitnow",
+        "job_search_url": "https://www.arbeitnow.com/api/job-board-api",
+        "adapter": "json",
+        "country": "Germany",
+        "config": {
+            "items": "data", "id": "slug", "title": "title", "company": "company_name",
+            "url": "url", "description": "tags", "tags": "tags", "next": "links.next",
+            "match_skills": False,
+        },
+    },
+    {
+        "label": "MyCareersFuture",
+        "job_search_url": "https://api.mycareersfuture.gov.sg/v2/jobs?limit=30&sortBy=new_posting_date&search=python+django+automation+testing",
+        "adapter": "paginated_json",
+        "country": "Singapore",
+        "config": {
+            "items": "results", "id": "uuid", "title": "title", "company": "company.name",
+            "url": ["applyUrl", "jobUrl"], "description": ["description", "requirements"],
+            "next": "_links.next.href",
+        },
+    },
+    {"label": "JobsInFinland", "job_search_url": "https://jobsinfinland.fi/feed/", "adapter": "rss"},
+    {"label": "IamExpat NL", "job_search_url": "https://www.iamexpat.nl/rss/career/jobs-netherlands.xml", "adapter": "rss"},
+    {"label": "WorkHere NZ", "job_search_url": "https://workhere.co.nz/jobs/rss", "adapter": "rss"},
+]
+
+
+def make_labels_unique(apps, schema_editor):
+    JobSource = apps.get_model('jobs', 'JobSource')
+    seen = set()
+    for source in JobSource.objects.order_by('pk'):
+        if source.label in seen:
+            source.label = f"{source.label[:90]} #{source.pk}"
+            source.save(update_fields=['label'])
+        seen.add(source.label)
+
+
+def add_built_in_sources(apps, schema_editor):
+    JobSource = apps.get_model('jobs', 'JobSource')
+    for source in BUILT_IN_SOURCES:
+        JobSource.objects.get_or_create(label=source["label"], defaults=source)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0006_fetchstate_high_water_mark'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='jobsource',
+            name='adapter',
+            field=models.CharField(choices=[('rss', 'RSS feed'), ('atom', 'Atom feed'), ('json', 'JSON API'), ('paginated_json', 'Paginated JSON API')], default='rss', max_length=20),
+        ),
+        migrations.AddField(
+            model_name='jobsource',
+            name='config',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+        migrations.AddField(
+            model_name='jobsource',
+            name='enabled',
+            field=models.BooleanField(default=True),
+        ),
+        migrations.AddField(
+            model_name='jobsource',
+            name='poll_interval',
+            field=models.PositiveIntegerField(default=360, help_text='Minutes between fetches'),
+        ),
+        migrations.AlterField(
+            model_name='jobsource',
+            name='country',
+            field=models.CharField(blank=True, max_length=100),
+        ),
+        migrations.RunPython(make_labels_unique, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='jobsource',
+            name='label',
+            field=models.CharField(max_length=100, unique=True),
+        ),
+        migrations.AlterField(
+            model_name='jobsource',
+            name='user',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.RunPython(add_built_in_sources, migrations.RunPython.noop),
+    ]
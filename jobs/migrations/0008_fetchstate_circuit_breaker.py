@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-17 22:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0007_jobsource_adapters'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='fetchstate',
+            name='circuit_open_until',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='fetchstate',
+            name='consecutive_failures',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.18 on 2026-10-17 23:20
+
+from datetime import datetime, time
+
+from django.db import migrations
+from django.utils import timezone
+
+
+def copy_jobs_to_postings(apps, schema_editor):
+    """One Posting per distinct URL (taken from its oldest Job row), then point every Job at it"""
+    Job = apps.get_model('jobs', 'Job')
+    Posting = apps.get_model('jobs', 'Posting')
+
+    urls = Job.objects.filter(posting__isnull=True).values_list('url', flat=True).distinct()
+    for url in urls.iterator(chunk_size=1000):
+        job = Job.objects.filter(url=url).order_by('date_posted', 'pk').first()
+        first_seen = timezone.make_aware(datetime.combine(job.date_posted, time.min))
+        posting, _ = Posting.objects.get_or_create(url=url, defaults={
+            'title': job.title,
+            'company': job.company,
+            'location': job.location,
+            'source': job.source,
+            'description': job.description,
+            'tags': job.tags,
+            'alternate_sources': job.alternate_sources,
+            'first_seen': first_seen,
+        })
+        Job.objects.filter(url=url).update(posting=posting)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0012_posting'),
+    ]
+
+    operations = [
+        migrations.RunPython(copy_jobs_to_postings, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.18 on 2026-10-17 23:20
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0013_copy_jobs_to_postings'),
+    ]
+
+    operations = [
+        migrations.RemoveConstraint(
+            model_name='job',
+            name='unique_job_url_per_user',
+        ),
+        migrations.RemoveField(model_name='job', name='title'),
+        migrations.RemoveField(model_name='job', name='company'),
+        migrations.RemoveField(model_name='job', name='location'),
+        migrations.RemoveField(model_name='job', name='source'),
+        migrations.RemoveField(model_name='job', name='url'),
+        migrations.RemoveField(model_name='job', name='description'),
+        migrations.RemoveField(model_name='job', name='tags'),
+        migrations.RemoveField(model_name='job', name='alternate_sources'),
+        migrations.AlterField(
+            model_name='job',
+            name='posting',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='jobs', to='jobs.posting'),
+        ),
+        migrations.AddConstraint(
+            model_name='job',
+            constraint=models.UniqueConstraint(fields=('user', 'posting'), name='unique_job_posting_per_user'),
+        ),
+    ]
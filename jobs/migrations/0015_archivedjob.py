@@ -0,0 +1,35 @@
+# Generated by Django 5.2.18 on 2026-10-17 23:18
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0014_slim_job'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('title', models.CharField(max_length=200)),
+                ('company', models.CharField(max_length=200)),
+                ('source', models.CharField(max_length=100)),
+                ('url', models.URLField(max_length=500)),
+                ('status', models.CharField(choices=[('new', 'New'), ('saved', 'Saved'), ('applied', 'Applied'), ('ignored', 'Ignored')], max_length=20)),
+                ('date_posted', models.DateField()),
+                ('reason', models.CharField(choices=[('ignored', 'Ignored'), ('stale', 'Still new after the retention window')], max_length=10)),
+                ('archived_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_jobs', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['user', 'url'], name='jobs_archiv_user_id_2fcaa0_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,64 @@
+# Generated by Django 5.2.18 on 2026-10-17 23:21
+
+import re
+
+from django.conf import settings
+from django.db import migrations, models
+from django.utils import timezone
+
+
+# Frozen copy of the jobs.matching.RelevanceScorer rules, so later changes to it
+# don't change what this migration does: one point for a target country, one per
+# preferred role in the title (whole words) and one per key skill in the
+# posting's tags, all compared case-insensitively
+def _normalized(terms):
+    return {str(term).strip().lower() for term in terms or []} - {''}
+
+
+def relevance_score(profile, location, title, tags):
+    score = 1 if (location or '').strip().lower() in _normalized(profile.target_countries) else 0
+    score += sum(
+        1 for role in _normalized(profile.preferred_roles)
+        if re.search(rf'(?<!\w){re.escape(role)}(?!\w)', title or '', re.IGNORECASE)
+    )
+    return score + len(_normalized(profile.key_skills) & _normalized(tags))
+
+
+def score_existing_jobs(apps, schema_editor):
+    """Backfill relevance_score (and updated_at where it changes, for incremental exports) of every job"""
+    Job = apps.get_model('jobs', 'Job')
+    Profile = apps.get_model('accounts', 'Profile')
+
+    now = timezone.now()
+    for profile in Profile.objects.iterator(chunk_size=500):
+        jobs = []
+        rows = Job.objects.filter(user_id=profile.user_id).values_list(
+            'pk', 'relevance_score', 'posting__location', 'posting__title', 'posting__tags',
+        )
+        for pk, current, location, title, tags in rows.iterator(chunk_size=2000):
+            score = relevance_score(profile, location, title, tags)
+            if score != current:
+                jobs.append(Job(pk=pk, relevance_score=score, updated_at=now))
+        Job.objects.bulk_update(jobs, ['relevance_score', 'updated_at'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0003_profile_reminder_schedule'),
+        ('jobs', '0015_archivedjob'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='relevance_score',
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['user', 'relevance_score'], name='jobs_job_user_id_7bdb20_idx'),
+        ),
+        migrations.RunPython(score_existing_jobs, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,98 @@
+# Full-text search index over jobs_posting (see jobs/search.py)
+
+from django.db import migrations
+from django.db.utils import OperationalError
+
+# NOTE: SQLite drops a table's triggers when a migration has to rebuild it
+# (e.g. AlterField on Posting) — re-create them in that migration.
+SQLITE_FORWARD = [
+    """
+    CREATE VIRTUAL TABLE jobs_posting_fts USING fts5(
+        title, company, description, tags,
+        content='jobs_posting', content_rowid='id', tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER jobs_posting_fts_insert AFTER INSERT ON jobs_posting BEGIN
+        INSERT INTO jobs_posting_fts(rowid, title, company, description, tags)
+        VALUES (new.id, new.title, new.company, new.description, new.tags);
+    END
+    """,
+    """
+    CREATE TRIGGER jobs_posting_fts_delete AFTER DELETE ON jobs_posting BEGIN
+        INSERT INTO jobs_posting_fts(jobs_posting_fts, rowid, title, company, description, tags)
+        VALUES ('delete', old.id, old.title, old.company, old.description, old.tags);
+    END
+    """,
+    """
+    CREATE TRIGGER jobs_posting_fts_update AFTER UPDATE OF title, company, description, tags ON jobs_posting BEGIN
+        INSERT INTO jobs_posting_fts(jobs_posting_fts, rowid, title, company, description, tags)
+        VALUES ('delete', old.id, old.title, old.company, old.description, old.tags);
+        INSERT INTO jobs_posting_fts(rowid, title, company, description, tags)
+        VALUES (new.id, new.title, new.company, new.description, new.tags);
+    END
+    """,
+    "INSERT INTO jobs_posting_fts(jobs_posting_fts) VALUES ('rebuild')",
+]
+
+SQLITE_BACKWARD = [
+    "DROP TRIGGER IF EXISTS jobs_posting_fts_insert",
+    "DROP TRIGGER IF EXISTS jobs_posting_fts_delete",
+    "DROP TRIGGER IF EXISTS jobs_posting_fts_update",
+    "DROP TABLE IF EXISTS jobs_posting_fts",
+]
+
+POSTGRES_FORWARD = [
+    """
+    ALTER TABLE jobs_posting ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('english'::regconfig, coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('english'::regconfig, coalesce(company, '')), 'B') ||
+        setweight(jsonb_to_tsvector('english'::regconfig, coalesce(tags, '[]'::jsonb), '["string"]'), 'B') ||
+        setweight(to_tsvector('english'::regconfig, coalesce(description, '')), 'C')
+    ) STORED
+    """,
+    "CREATE INDEX jobs_posting_search_idx ON jobs_posting USING GIN (search_vector)",
+]
+
+POSTGRES_BACKWARD = [
+    "DROP INDEX IF EXISTS jobs_posting_search_idx",
+    "ALTER TABLE jobs_posting DROP COLUMN IF EXISTS search_vector",
+]
+
+
+def _run(schema_editor, statements):
+    for statement in statements:
+        schema_editor.execute(statement)
+
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        try:
+            _run(schema_editor, SQLITE_FORWARD[:1])
+        except OperationalError as e:
+            # SQLite built without FTS5 — search falls back to icontains
+            print(f"\n  Skipping full-text index: {e}")
+            return
+        _run(schema_editor, SQLITE_FORWARD[1:])
+    elif vendor == 'postgresql':
+        _run(schema_editor, POSTGRES_FORWARD)
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        _run(schema_editor, SQLITE_BACKWARD)
+    elif vendor == 'postgresql':
+        _run(schema_editor, POSTGRES_BACKWARD)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0016_job_relevance_score'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-17 23:40
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0017_posting_search'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='job',
+            name='jobs_job_user_id_7bdb20_idx',
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['user', 'date_posted', 'id'], name='jobs_job_user_id_9405ca_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['user', 'status', 'date_posted', 'id'], name='jobs_job_user_id_09cbd3_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['user', 'relevance_score', 'date_posted', 'id'], name='jobs_job_user_id_b5ddcc_idx'),
+        ),
+    ]
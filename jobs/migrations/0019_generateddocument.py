@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-17 23:46
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0018_query_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GeneratedDocument',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('cv', 'CV'), ('cover_letter', 'Cover letter')], max_length=20)),
+                ('profile_hash', models.CharField(max_length=64)),
+                ('template_version', models.PositiveSmallIntegerField()),
+                ('model', models.CharField(max_length=50)),
+                ('content', models.TextField()),
+                ('tokens', models.PositiveIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='documents', to='jobs.job')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('job', 'kind', 'profile_hash', 'template_version', 'model'), name='unique_generated_document')],
+            },
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.18 on 2026-10-17 23:58
+
+from django.db import migrations, models
+
+
+def fill_sources(apps, schema_editor):
+    """Copy each fingerprint's board from its Posting; drop fingerprints whose Posting was pruned"""
+    Posting = apps.get_model('jobs', 'Posting')
+    PostingFingerprint = apps.get_model('jobs', 'PostingFingerprint')
+
+    PostingFingerprint.objects.exclude(url__in=Posting.objects.values('url')).delete()
+    fingerprints = list(PostingFingerprint.objects.only('pk', 'url'))
+    for start in range(0, len(fingerprints), 1000):
+        batch = fingerprints[start:start + 1000]
+        sources = dict(
+            Posting.objects.filter(url__in=[fingerprint.url for fingerprint in batch]).values_list('url', 'source')
+        )
+        for fingerprint in batch:
+            fingerprint.source = sources.get(fingerprint.url, '')[:100]
+        PostingFingerprint.objects.bulk_update(batch, ['source'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0019_generateddocument'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='postingfingerprint',
+            name='source',
+            field=models.CharField(blank=True, max_length=100),
+        ),
+        migrations.RunPython(fill_sources, migrations.RunPython.noop),
+    ]
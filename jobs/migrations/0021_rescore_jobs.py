@@ -0,0 +1,20 @@
+# Generated by Django 5.2.18 on 2026-10-18 00:20
+
+from importlib import import_module
+
+from django.db import migrations
+
+# Scores stored before RelevanceScorer compared roles, skills and countries case-insensitively,
+# redone with 0016's frozen copy of those rules
+score_existing_jobs = import_module('jobs.migrations.0016_job_relevance_score').score_existing_jobs
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0020_postingfingerprint_source'),
+    ]
+
+    operations = [
+        migrations.RunPython(score_existing_jobs, migrations.RunPython.noop),
+    ]
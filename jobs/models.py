@@ -1,17 +1,51 @@
 from django.db import models
 from django.contrib.auth.models import User
 from django.db.models import JSONField
+from django.utils import timezone
+
+from .matching import relevance_label
 
 class JobSource(models.Model):
-    user = models.ForeignKey(User, on_delete=models.CASCADE)
-    country = models.CharField(max_length=100)
-    label = models.CharField(max_length=100)
+    """A job board to poll — parsed by the adapter registered under `adapter` (jobs/adapters.py)"""
+    ADAPTER_CHOICES = [
+        ('rss', 'RSS feed'),
+        ('atom', 'Atom feed'),
+        ('json', 'JSON API'),
+        ('paginated_json', 'Paginated JSON API'),
+    ]
+    user = models.ForeignKey(User, on_delete=models.CASCADE, null=True, blank=True)  # who added it (blank = built-in)
+    country = models.CharField(max_length=100, blank=True)  # fixed job location; blank = detect per profile
+    label = models.CharField(max_length=100, unique=True)
     job_search_url = models.URLField()
+    adapter = models.CharField(max_length=20, choices=ADAPTER_CHOICES, default='rss')
+    config = JSONField(default=dict, blank=True)  # adapter options, e.g. JSON field paths / timeout
+    poll_interval = models.PositiveIntegerField(default=360, help_text="Minutes between fetches")
+    enabled = models.BooleanField(default=True)
 
     def __str__(self):
         return f"{self.label} ({self.country})"
 
+class Posting(models.Model):
+    """
+    A job posting as fetched from a board — stored once per URL, however many
+    users it matches. Each user's copy is a slim Job row pointing here.
+    """
+    url = models.URLField(max_length=500, unique=True)
+    title = models.CharField(max_length=200)
+    company = models.CharField(max_length=200)
+    location = models.CharField(max_length=200)
+    source = models.CharField(max_length=100)
+    description = models.TextField()
+    tags = JSONField(default=list)  # e.g., ['Python', 'Django']
+    alternate_sources = JSONField(default=list, blank=True)  # same role on other boards: [{"source", "url"}]
+    first_seen = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return self.title
+
+
 class Job(models.Model):
+    """One posting in one user's list: the user's status for it, nothing of the posting itself"""
     STATUS_CHOICES = [
         ('new', 'New'),
         ('saved', 'Saved'),
@@ -19,33 +53,232 @@ class Job(models.Model):
         ('ignored', 'Ignored'),
     ]
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='jobs')  # User-specific jobs
-    title = models.CharField(max_length=200)
-    company = models.CharField(max_length=200)
-    location = models.CharField(max_length=200)
-    source = models.CharField(max_length=100)
-    url = models.URLField()
-    description = models.TextField()
+    posting = models.ForeignKey(Posting, on_delete=models.CASCADE, related_name='jobs')
     date_posted = models.DateField(auto_now_add=True)
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='new')
-    tags = JSONField(default=list)  # e.g., ['Python', 'Django']
+    updated_at = models.DateTimeField(auto_now=True)
+    # Set at ingestion, recomputed when the profile changes (see jobs/matching.py)
+    relevance_score = models.PositiveSmallIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            # One row per posting per user — lets ingestion use bulk_create(ignore_conflicts=True)
+            models.UniqueConstraint(fields=['user', 'posting'], name='unique_job_posting_per_user'),
+        ]
+        # One per jobs-page ordering (jobs/views.py SORT_KEYS), so pages are read in index order
+        indexes = [
+            models.Index(fields=['user', 'date_posted', 'id']),
+            models.Index(fields=['user', 'status', 'date_posted', 'id']),
+            models.Index(fields=['user', 'relevance_score', 'date_posted', 'id']),
+            models.Index(fields=['user', 'updated_at', 'id']),  # export?updated_since= (tracker/export.py)
+        ]
 
     def __str__(self):
-        return self.title
+        return self.posting.title
 
     @property
     def relevance(self):
-        # Simple matching logic
-        profile = self.user.profile
-        score = 0
-        if self.location in profile.target_countries:
-            score += 1
-        for role in profile.preferred_roles:
-            if role.lower() in self.title.lower():
-                score += 1
-        matching_skills = set(profile.key_skills) & set(self.tags)
-        score += len(matching_skills)
-        if score >= 3:
-            return 'Highly Relevant'
-        elif score >= 1:
-            return 'Relevant'
-        return 'Low Relevance'
\ No newline at end of file
+        return relevance_label(self.relevance_score)
+
+
+class ArchivedJob(models.Model):
+    """
+    A Job removed from the hot table by the retention policy (jobs/retention.py),
+    kept as a self-contained snapshot so the shared Posting can go too.
+    """
+    REASON_CHOICES = [
+        ('ignored', 'Ignored'),
+        ('stale', 'Still new after the retention window'),
+    ]
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='archived_jobs')
+    title = models.CharField(max_length=200)
+    company = models.CharField(max_length=200)
+    source = models.CharField(max_length=100)
+    url = models.URLField(max_length=500)
+    status = models.CharField(max_length=20, choices=Job.STATUS_CHOICES)
+    date_posted = models.DateField()
+    reason = models.CharField(max_length=10, choices=REASON_CHOICES)
+    archived_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            # Ingestion skips postings a user already had archived
+            models.Index(fields=['user', 'url']),
+        ]
+
+    def __str__(self):
+        return f"{self.title} ({self.reason})"
+
+
+class GeneratedDocument(models.Model):
+    """
+    An AI-generated CV or cover letter for one Job (see jobs/documents.py).
+    Stored under everything that shaped it, so a hit is only served while the
+    profile, the prompt template and the model are unchanged.
+    """
+    KIND_CHOICES = [
+        ('cv', 'CV'),
+        ('cover_letter', 'Cover letter'),
+    ]
+    job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name='documents')
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    profile_hash = models.CharField(max_length=64)  # sha256 of the profile fields in the prompt
+    template_version = models.PositiveSmallIntegerField()
+    model = models.CharField(max_length=50)
+    content = models.TextField()
+    tokens = models.PositiveIntegerField(default=0)  # API usage of the call that produced it
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['job', 'kind', 'profile_hash', 'template_version', 'model'], name='unique_generated_document'
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.get_kind_display()} for job {self.job_id}"
+
+
+class FetchState(models.Model):
+    """
+    Incremental fetch state per job board: HTTP cache validators sent back as
+    If-None-Match / If-Modified-Since so unchanged feeds answer 304, and the
+    high-water mark where parsing stops on the next run
+    """
+    source = models.CharField(max_length=100, unique=True)
+    etag = models.CharField(max_length=255, blank=True)
+    last_modified = models.CharField(max_length=100, blank=True)
+    high_water_mark = models.CharField(max_length=500, blank=True)  # id of the newest entry already ingested
+    checked_at = models.DateTimeField(null=True, blank=True)
+    # Circuit breaker — the board is skipped until circuit_open_until after repeated failures
+    consecutive_failures = models.PositiveIntegerField(default=0)
+    circuit_open_until = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return self.source
+
+
+class FetchRun(models.Model):
+    """One run of the fetch pipeline — totals are filled in when it finishes"""
+    started_at = models.DateTimeField(default=timezone.now, db_index=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    forced = models.BooleanField(default=False)
+    scoped = models.BooleanField(default=False)  # only matched some users (e.g. after a settings change)
+    sources = models.PositiveIntegerField(default=0)
+    postings = models.PositiveIntegerField(default=0)
+    matched = models.PositiveIntegerField(default=0)  # (user, posting) pairs
+    inserted = models.PositiveIntegerField(default=0)
+    duplicates = models.PositiveIntegerField(default=0)
+    errors = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        ordering = ['-started_at']
+
+    def __str__(self):
+        return f"Fetch run {self.started_at:%Y-%m-%d %H:%M}"
+
+    @property
+    def duration(self):
+        """Wall time in seconds, None while the run is still going"""
+        if not self.finished_at:
+            return None
+        return (self.finished_at - self.started_at).total_seconds()
+
+
+class FetchSourceStat(models.Model):
+    """What one source cost and produced in one FetchRun"""
+    run = models.ForeignKey(FetchRun, on_delete=models.CASCADE, related_name='source_stats')
+    source = models.CharField(max_length=100)
+    latency_ms = models.PositiveIntegerField(null=True, blank=True)  # time spent in HTTP, all pages
+    bytes = models.PositiveIntegerField(default=0)
+    pages = models.PositiveIntegerField(default=0)
+    entries = models.PositiveIntegerField(default=0)  # postings parsed (newer than the high-water mark)
+    matched = models.PositiveIntegerField(default=0)
+    inserted = models.PositiveIntegerField(default=0)
+    duplicates = models.PositiveIntegerField(default=0)
+    not_modified = models.BooleanField(default=False)
+    error = models.TextField(blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['source', 'run']),
+        ]
+
+    def __str__(self):
+        return f"{self.source} @ {self.run}"
+
+
+class PostingFingerprint(models.Model):
+    """
+    SimHash of a recently ingested posting (see jobs/dedup.py). The four 16-bit
+    bands are indexed so near-duplicates are found without scanning the table.
+    """
+    url = models.CharField(max_length=500, unique=True)  # the canonical posting
+    fingerprint = models.BigIntegerField()
+    band0 = models.PositiveIntegerField(db_index=True)
+    band1 = models.PositiveIntegerField(db_index=True)
+    band2 = models.PositiveIntegerField(db_index=True)
+    band3 = models.PositiveIntegerField(db_index=True)
+    location = models.CharField(max_length=200, blank=True)
+    source = models.CharField(max_length=100, blank=True)  # only postings from other boards collapse into it
+    seen_at = models.DateTimeField(default=timezone.now, db_index=True)
+
+    def __str__(self):
+        return self.url
+
+
+class ProfileTerm(models.Model):
+    """
+    Inverted index row: one role / skill / country of one profile.
+    A fetch looks candidate profiles up by term instead of scanning every profile.
+    """
+    KIND_CHOICES = [
+        ('role', 'Role'),
+        ('skill', 'Skill'),
+        ('country', 'Country'),
+    ]
+    profile = models.ForeignKey('accounts.Profile', on_delete=models.CASCADE, related_name='terms')
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    term = models.CharField(max_length=200)                 # as the user typed it
+    normalized = models.CharField(max_length=200)           # lower-cased lookup key
+    position = models.PositiveSmallIntegerField(default=0)  # keeps the profile's own order
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['kind', 'normalized']),
+        ]
+
+    def __str__(self):
+        return f"{self.kind}: {self.term}"
+
+
+class OutboxEmail(models.Model):
+    """
+    A queued notification email. Producers (fetch, reminders) only insert rows;
+    jobs.tasks.send_outbox drains them in batches over one SMTP connection.
+    """
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('sending', 'Sending'),
+        ('sent', 'Sent'),
+        ('failed', 'Failed'),
+    ]
+    user = models.ForeignKey(User, on_delete=models.CASCADE, null=True, blank=True, related_name='outbox_emails')
+    to_email = models.EmailField()
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending')
+    attempts = models.PositiveSmallIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.subject} → {self.to_email} ({self.status})"
@@ -0,0 +1,145 @@
+# jobs/outbox.py
+"""
+Email outbox: producers queue OutboxEmail rows, drain_outbox() sends them.
+
+Draining reuses one SMTP connection per batch (get_connection / send_messages),
+throttles to EMAIL_OUTBOX_RATE messages per second and retries failures with
+exponential backoff until EMAIL_OUTBOX_MAX_ATTEMPTS.
+"""
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.template.loader import render_to_string
+from django.utils import timezone
+
+from .models import OutboxEmail
+
+EMAIL_OUTBOX_BATCH_SIZE = getattr(settings, 'EMAIL_OUTBOX_BATCH_SIZE', 100)
+EMAIL_OUTBOX_RATE = getattr(settings, 'EMAIL_OUTBOX_RATE', 5)             # messages per second
+EMAIL_OUTBOX_MAX_ATTEMPTS = getattr(settings, 'EMAIL_OUTBOX_MAX_ATTEMPTS', 5)
+SITE_URL = getattr(settings, 'SITE_URL', 'http://127.0.0.1:8000')
+
+# A claimed batch is retried by the next drain if its worker died mid-send
+SENDING_LEASE = timedelta(minutes=10)
+
+
+def new_jobs_digest(user, jobs):
+    """Build (unsaved) the "New Jobs Alert" email for one user"""
+    body = render_to_string('emails/new_jobs_digest.txt', {
+        'name': user.get_full_name() or user.username,
+        'jobs': jobs,
+        'site_url': SITE_URL,
+    })
+    return OutboxEmail(
+        user=user,
+        to_email=user.email,
+        subject=f"New Jobs Alert! ({len(jobs)} found)",
+        body=body,
+    )
+
+
+def daily_reminder(profile, due_today=0, overdue=0, tasks=(), new_jobs=0):
+    """Build (unsaved) the daily study & apply reminder for one profile"""
+    user = profile.user
+    body = render_to_string('emails/daily_reminder.txt', {
+        'name': profile.name or user.get_full_name() or user.username,
+        'due_today': due_today,
+        'overdue': overdue,
+        'tasks': tasks,
+        'more_tasks': max(0, due_today + overdue - len(tasks)),
+        'new_jobs': new_jobs,
+        'site_url': SITE_URL,
+    })
+    subject = "Your daily Career Tracker reminder"
+    if due_today or overdue:
+        subject += f" — {due_today + overdue} task{'s' if due_today + overdue != 1 else ''} due"
+    return OutboxEmail(user=user, to_email=user.email, subject=subject, body=body)
+
+
+def enqueue(emails):
+    """Queue many emails with one INSERT"""
+    return OutboxEmail.objects.bulk_create(emails, batch_size=EMAIL_OUTBOX_BATCH_SIZE)
+
+
+def _due(now, batch_size):
+    return list(
+        OutboxEmail.objects.filter(status__in=['pending', 'sending'], next_attempt_at__lte=now)
+        .order_by('next_attempt_at', 'pk')[:batch_size]
+    )
+
+
+def _claim(batch_size):
+    """
+    Lease the next due batch ('sending' until SENDING_LEASE from now). Each email
+    is taken with a conditional UPDATE that only matches while it is still due,
+    so of two concurrent drains only the one that changed the row sends it, also
+    on backends without SELECT ... FOR UPDATE SKIP LOCKED (SQLite)
+    """
+    now = timezone.now()
+    lease = now + SENDING_LEASE
+    batch = []
+    for email in _due(now, batch_size):
+        claimed = OutboxEmail.objects.filter(
+            pk=email.pk, status__in=['pending', 'sending'], next_attempt_at__lte=now,
+        ).update(status='sending', next_attempt_at=lease)
+        if claimed:
+            email.status = 'sending'
+            email.next_attempt_at = lease
+            batch.append(email)
+    return batch
+
+
+def _failed(email, error):
+    email.attempts += 1
+    email.last_error = str(error)[:1000]
+    if email.attempts >= EMAIL_OUTBOX_MAX_ATTEMPTS:
+        email.status = 'failed'
+    else:
+        email.status = 'pending'
+        email.next_attempt_at = timezone.now() + timedelta(minutes=2 ** email.attempts)
+
+
+def drain_outbox(batch_size=EMAIL_OUTBOX_BATCH_SIZE):
+    """Send one batch of due emails over a single SMTP connection. Returns (sent, failed)"""
+    batch = _claim(batch_size)
+    if not batch:
+        return 0, 0
+
+    sent = failed = 0
+    interval = 1.0 / EMAIL_OUTBOX_RATE if EMAIL_OUTBOX_RATE else 0
+    connection = get_connection(fail_silently=False)
+    try:
+        connection.open()
+        for email in batch:
+            started = time.monotonic()
+            message = EmailMessage(
+                email.subject, email.body, settings.DEFAULT_FROM_EMAIL, [email.to_email],
+                connection=connection,
+            )
+            try:
+                connection.send_messages([message])
+            except Exception as e:
+                _failed(email, e)
+                failed += 1
+            else:
+                email.status = 'sent'
+                email.sent_at = timezone.now()
+                email.attempts += 1
+                sent += 1
+            # Throttle to the provider's rate limit
+            time.sleep(max(0, interval - (time.monotonic() - started)))
+    except Exception as e:
+        # Couldn't even talk to the SMTP server — everything not yet sent goes back to the queue
+        for email in batch:
+            if email.status == 'sending':
+                _failed(email, e)
+                failed += 1
+    finally:
+        connection.close()
+
+    OutboxEmail.objects.bulk_update(
+        batch, ['status', 'attempts', 'last_error', 'next_attempt_at', 'sent_at'],
+    )
+    return sent, failed
@@ -0,0 +1,64 @@
+# jobs/pagination.py
+"""
+Keyset (cursor) pagination for the jobs list.
+
+A page is "the next N rows after the last one shown", filtered on the sort
+columns instead of OFFSET, so every page costs the same index range scan no
+matter how deep the user scrolls. The cursor is the sort values of the last
+row, URL-safe base64 encoded.
+"""
+import base64
+import binascii
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+
+
+def encode_cursor(values):
+    return base64.urlsafe_b64encode('|'.join(str(value) for value in values).encode()).decode()
+
+
+def decode_values(cursor, types):
+    """
+    Values of a cursor, each converted by the matching callable in types, or
+    None when it's missing or malformed (→ first page)
+    """
+    if not cursor:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode()).decode().split('|')
+        if len(raw) != len(types):
+            return None
+        return [convert(value) for convert, value in zip(types, raw)]
+    except (binascii.Error, UnicodeError, ValueError, ValidationError):
+        return None
+
+
+def decode_cursor(queryset, fields, cursor):
+    """Sort values of a cursor for queryset ordered by fields"""
+    return decode_values(cursor, [queryset.model._meta.get_field(field).to_python for field in fields])
+
+
+def _after(fields, values):
+    """Rows sorting after `values` in descending (fields…) order"""
+    query = Q()
+    for i, field in enumerate(fields):
+        query |= Q(**dict(zip(fields[:i], values[:i])), **{f'{field}__lt': values[i]})
+    return query
+
+
+def keyset_page(queryset, fields, cursor=None, size=30):
+    """
+    One page of queryset ordered by fields, all descending. The last field must
+    be unique (the primary key). Returns (rows, cursor of the next page or None).
+    """
+    queryset = queryset.order_by(*[f'-{field}' for field in fields])
+    values = decode_cursor(queryset, fields, cursor)
+    if values is not None:
+        queryset = queryset.filter(_after(fields, values))
+
+    rows = list(queryset[:size + 1])
+    if len(rows) <= size:
+        return rows, None
+    rows = rows[:size]
+    return rows, encode_cursor([getattr(rows[-1], field) for field in fields])
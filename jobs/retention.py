@@ -0,0 +1,109 @@
+# jobs/retention.py
+"""
+Retention policy for the hot Job table.
+
+Jobs the user ignored (JOB_RETENTION_IGNORED_DAYS after the last change) and
+jobs still 'new' after JOB_RETENTION_NEW_DAYS are archived to ArchivedJob or
+deleted (JOB_RETENTION_MODE), followed by shared Postings no user links to any
+more, with their dedup fingerprints. Deleted jobs still leave an ArchivedJob
+tombstone (user and URL only), so a forced or user-scoped fetch doesn't bring
+them back as new. Rows go in batches of JOB_RETENTION_BATCH_SIZE, one short
+transaction each, so a run never holds long write locks.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .counters import invalidate
+from .models import ArchivedJob, Job, Posting, PostingFingerprint
+
+JOB_RETENTION_MODE = getattr(settings, 'JOB_RETENTION_MODE', 'archive')          # 'archive' or 'delete'
+JOB_RETENTION_IGNORED_DAYS = getattr(settings, 'JOB_RETENTION_IGNORED_DAYS', 7)
+JOB_RETENTION_NEW_DAYS = getattr(settings, 'JOB_RETENTION_NEW_DAYS', 30)
+JOB_RETENTION_BATCH_SIZE = getattr(settings, 'JOB_RETENTION_BATCH_SIZE', 1000)
+
+MODES = ('archive', 'delete')
+
+
+def expired_jobs(ignored_days=JOB_RETENTION_IGNORED_DAYS, new_days=JOB_RETENTION_NEW_DAYS, now=None):
+    """{reason: queryset} of the jobs the policy removes"""
+    now = now or timezone.now()
+    return {
+        'ignored': Job.objects.filter(status='ignored', updated_at__lt=now - timedelta(days=ignored_days)),
+        'stale': Job.objects.filter(status='new', date_posted__lt=(now - timedelta(days=new_days)).date()),
+    }
+
+
+def orphan_postings(new_days=JOB_RETENTION_NEW_DAYS, now=None):
+    """Shared postings no Job links to, once they're too old to be matched again"""
+    now = now or timezone.now()
+    return Posting.objects.filter(jobs__isnull=True, first_seen__lt=now - timedelta(days=new_days))
+
+
+def _archive(jobs, reason, snapshot=True):
+    """ArchivedJob rows for a batch of jobs: a full snapshot, or just the (user, url) tombstone ingestion checks"""
+    rows = jobs.values_list(
+        'user_id', 'posting__title', 'posting__company', 'posting__source', 'posting__url', 'status', 'date_posted',
+    )
+    ArchivedJob.objects.bulk_create([
+        ArchivedJob(
+            user_id=user_id, url=url, status=status, date_posted=date_posted, reason=reason,
+            **({'title': title, 'company': company, 'source': source} if snapshot else {}),
+        )
+        for user_id, title, company, source, url, status, date_posted in rows
+    ])
+
+
+def _forget_fingerprints(postings):
+    """Near-duplicates of a pruned posting would otherwise collapse into a Posting that no longer exists"""
+    PostingFingerprint.objects.filter(url__in=postings.values('url')).delete()
+
+
+def _drain(queryset, batch_size, handle=None):
+    """
+    Delete queryset batch by batch: primary keys first, then one short
+    transaction that hands the batch to handle and deletes it. The batch keeps
+    the queryset's conditions, so rows that stopped matching since they were
+    listed (an orphan Posting a Job was just linked to) are left alone.
+    Returns the row count
+    """
+    total = 0
+    while True:
+        pks = list(queryset.order_by('pk').values_list('pk', flat=True)[:batch_size])
+        if not pks:
+            return total
+        with transaction.atomic():
+            batch = queryset.filter(pk__in=pks)
+            if handle:
+                handle(batch)
+            _, deleted = batch.delete()
+        total += deleted.get(queryset.model._meta.label, 0)
+
+
+def apply_retention(mode=JOB_RETENTION_MODE, ignored_days=JOB_RETENTION_IGNORED_DAYS,
+                    new_days=JOB_RETENTION_NEW_DAYS, batch_size=JOB_RETENTION_BATCH_SIZE, dry_run=False):
+    """Run the policy once. Returns the reclaimed row counts: {'ignored', 'stale', 'postings'}"""
+    if mode not in MODES:
+        raise ValueError(f"Unknown retention mode '{mode}' (expected one of {', '.join(MODES)})")
+
+    now = timezone.now()
+    jobs = expired_jobs(ignored_days, new_days, now)
+    if dry_run:
+        counts = {reason: queryset.count() for reason, queryset in jobs.items()}
+        counts['postings'] = orphan_postings(new_days, now).count()
+        return counts
+
+    users = set()
+
+    def handle(batch, reason):
+        users.update(batch.values_list('user_id', flat=True))
+        _archive(batch, reason, snapshot=mode == 'archive')
+
+    counts = {}
+    for reason, queryset in jobs.items():
+        counts[reason] = _drain(queryset, batch_size, lambda batch, reason=reason: handle(batch, reason))
+    invalidate(*users)
+    counts['postings'] = _drain(orphan_postings(new_days, now), batch_size, _forget_fingerprints)
+    return counts
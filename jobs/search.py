@@ -0,0 +1,175 @@
+# jobs/search.py
+"""
+Full-text search over the shared postings (title, company, description, tags).
+
+SQLite: the FTS5 table jobs_posting_fts, an external-content index over
+jobs_posting kept in sync by triggers (migration 0017). PostgreSQL: the
+generated tsvector column jobs_posting.search_vector with a GIN index. Other
+databases, or a SQLite build without FTS5, fall back to icontains filters
+and newest-first order.
+
+Ranking joins the index to the user's jobs in one query and pages on
+(rank, id) like jobs/pagination.py; snippets are only built for the rows of
+the page being shown.
+"""
+import re
+
+from django.db import connection
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+from django.utils.html import escape
+from django.utils.safestring import mark_safe
+
+from .pagination import decode_values, encode_cursor, keyset_page
+
+FTS_TABLE = 'jobs_posting_fts'
+
+# Around matched terms in snippets (control characters, so never in the text);
+# replaced by <mark> after escaping
+MARK_START, MARK_END = '\x02', '\x03'
+
+# Column weights (title, company, description, tags): a title hit counts most
+FTS5_RANK = f"-bm25({FTS_TABLE}, 10.0, 5.0, 1.0, 5.0)"
+FTS5_SNIPPET = f"snippet({FTS_TABLE}, -1, %s, %s, '…', 16)"
+
+PG_QUERY = "websearch_to_tsquery('english', %s)"
+PG_HEADLINE_OPTIONS = f"StartSel={MARK_START}, StopSel={MARK_END}, MaxWords=30, MinWords=10, MaxFragments=2"
+
+WORD = re.compile(r'\w+')
+
+_fts5_ready = None
+
+
+def fts5_ready():
+    """True when the FTS5 table exists (the SQLite build may lack the module)"""
+    global _fts5_ready
+    if _fts5_ready is None:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = %s", [FTS_TABLE])
+            _fts5_ready = cursor.fetchone() is not None
+    return _fts5_ready
+
+
+def backend():
+    """'fts5', 'postgres' or None (no full-text index)"""
+    if connection.vendor == 'sqlite' and fts5_ready():
+        return 'fts5'
+    if connection.vendor == 'postgresql':
+        return 'postgres'
+    return None
+
+
+def fts5_query(text):
+    """
+    User input → FTS5 MATCH expression: every word must occur, the last one
+    as a prefix (search as you type). Words are quoted, so operators and
+    punctuation in the input can't break the query.
+    """
+    words = WORD.findall(text.lower())
+    if not words:
+        return ''
+    terms = [f'"{word}"' for word in words]
+    terms[-1] += '*'
+    return ' '.join(terms)
+
+
+def search_jobs(jobs, text):
+    """jobs narrowed to those whose posting matches text"""
+    engine = backend()
+    if engine == 'fts5':
+        match = fts5_query(text)
+        if not match:
+            return jobs.none()
+        return jobs.filter(posting_id__in=RawSQL(f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s", (match,)))
+    if engine == 'postgres':
+        return jobs.filter(posting_id__in=RawSQL(f"SELECT id FROM jobs_posting WHERE search_vector @@ {PG_QUERY}", (text,)))
+
+    # No full-text index: every word somewhere in title, company, description or tags
+    for word in WORD.findall(text):
+        jobs = jobs.filter(
+            Q(posting__title__icontains=word) | Q(posting__company__icontains=word)
+            | Q(posting__description__icontains=word) | Q(posting__tags__icontains=word)
+        )
+    return jobs
+
+
+def rank_page(jobs, text, cursor=None, size=30):
+    """
+    One page of the jobs matching text, by text rank, best first. jobs is the
+    queryset with the other filters applied (not narrowed by search_jobs yet).
+    Returns ([job id, ...], cursor of the next page or None).
+    """
+    engine = backend()
+    if engine is None:
+        rows, cursor = keyset_page(search_jobs(jobs, text), ('date_posted', 'id'), cursor, size)
+        return [job.pk for job in rows], cursor
+
+    if engine == 'fts5':
+        rank = FTS5_RANK
+        source = f"{FTS_TABLE} JOIN jobs_job j ON j.posting_id = {FTS_TABLE}.rowid"
+        where = f"{FTS_TABLE} MATCH %s"
+        params = [fts5_query(text)]
+        if not params[0]:
+            return [], None
+    else:
+        rank = "ts_rank_cd(p.search_vector, query)"
+        source = f"jobs_job j JOIN jobs_posting p ON p.id = j.posting_id CROSS JOIN {PG_QUERY} query"
+        where = "p.search_vector @@ query"
+        params = [text]
+
+    # Only the jobs the other filters left; the index does the matching and ranking.
+    # "+j.id" keeps SQLite from driving the join off this list (one probe per id per hit)
+    filtered, filtered_params = jobs.order_by().values('pk').query.sql_with_params()
+    where += f" AND +j.id IN ({filtered})"
+    params += filtered_params
+
+    after = decode_values(cursor, (float, int))
+    if after:
+        where += f" AND ({rank} < %s OR ({rank} = %s AND j.id < %s))"
+        params += [after[0], after[0], after[1]]
+
+    with connection.cursor() as db:
+        db.execute(
+            f"SELECT j.id, {rank} AS search_rank FROM {source} WHERE {where} "
+            f"ORDER BY search_rank DESC, j.id DESC LIMIT %s",
+            params + [size + 1],
+        )
+        rows = db.fetchall()
+
+    if len(rows) <= size:
+        return [pk for pk, _ in rows], None
+    rows = rows[:size]
+    pk, rank = rows[-1]
+    return [pk for pk, _ in rows], encode_cursor([rank, pk])
+
+
+def snippets(text, posting_ids):
+    """{posting id: highlighted HTML excerpt} for the postings of one page"""
+    engine = backend()
+    if not posting_ids or engine is None:
+        return {}
+
+    posting_ids = list(posting_ids)
+    placeholders = ', '.join(['%s'] * len(posting_ids))
+    with connection.cursor() as db:
+        if engine == 'fts5':
+            db.execute(
+                f"SELECT rowid, {FTS5_SNIPPET} FROM {FTS_TABLE} "
+                f"WHERE {FTS_TABLE} MATCH %s AND rowid IN ({placeholders})",
+                [MARK_START, MARK_END, fts5_query(text)] + posting_ids,
+            )
+        else:
+            db.execute(
+                f"SELECT id, ts_headline('english', title || ' — ' || description, {PG_QUERY}, %s) "
+                f"FROM jobs_posting WHERE id IN ({placeholders})",
+                [text, PG_HEADLINE_OPTIONS] + posting_ids,
+            )
+        return {pk: highlight(snippet) for pk, snippet in db.fetchall()}
+
+
+def highlight(snippet):
+    """Snippet text → HTML with the matched terms in <mark>, everything else escaped"""
+    if not snippet:
+        return ''
+    html = escape(snippet).replace(MARK_START, '<mark>').replace(MARK_END, '</mark>')
+    return mark_safe(html)
@@ -0,0 +1,73 @@
+# jobs/stats.py
+"""
+Fetch instrumentation: every pipeline run writes one FetchRun and one
+FetchSourceStat per source (HTTP latency, bytes, entries parsed / matched /
+inserted, duplicates, errors). Report with `manage.py fetch_stats` or the admin.
+
+Everything passed between stages is a plain dict so Celery can carry it.
+"""
+from collections import Counter, defaultdict
+
+from django.utils import timezone
+
+from .models import FetchRun, FetchSourceStat
+
+COUNT_FIELDS = ('matched', 'inserted', 'duplicates')
+
+
+def start_run(force=False, scoped=False):
+    return FetchRun.objects.create(forced=force, scoped=scoped)
+
+
+def download_stats(result=None, error=None):
+    """Stats of one source download — from fetch_source's result, or the error it raised"""
+    if result is None:
+        return {"latency_ms": None, "bytes": 0, "pages": 0, "entries": 0, "not_modified": False, "error": error or ""}
+    return {
+        "latency_ms": result["latency_ms"],
+        "bytes": result["bytes"],
+        "pages": result["pages"],
+        "entries": len(result["postings"]),
+        "not_modified": result["not_modified"],
+        "error": "",
+    }
+
+
+def new_counts():
+    """Per-source matched / inserted / duplicates tallies, filled by ingest_jobs"""
+    return defaultdict(Counter)
+
+
+def merge_counts(into, counts):
+    for source, tally in counts.items():
+        into[source].update(tally)
+    return into
+
+
+def finish_run(run, downloads, counts):
+    """Store the per-source rows and the run totals. downloads: {source: download_stats}"""
+    rows = []
+    for source in sorted(set(downloads) | set(counts)):
+        download = downloads.get(source) or download_stats()
+        tally = counts.get(source, {})
+        rows.append(FetchSourceStat(
+            run=run,
+            source=source,
+            latency_ms=download["latency_ms"],
+            bytes=download["bytes"],
+            pages=download["pages"],
+            entries=download["entries"],
+            not_modified=download["not_modified"],
+            error=download["error"],
+            **{field: tally.get(field, 0) for field in COUNT_FIELDS},
+        ))
+    FetchSourceStat.objects.bulk_create(rows)
+
+    run.sources = len(downloads)
+    run.postings = sum(row.entries for row in rows)
+    run.errors = sum(1 for row in rows if row.error)
+    for field in COUNT_FIELDS:
+        setattr(run, field, sum(getattr(row, field) for row in rows))
+    run.finished_at = timezone.now()
+    run.save()
+    return run
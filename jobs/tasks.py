@@ -1,130 +1,710 @@
-# jobs/tasks.py  ← Rename this file to jobs/fetcher.py (optional) or keep as is
-import feedparser
+# jobs/tasks.py
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, wait
+from datetime import timedelta
+from functools import lru_cache
+
 import requests
+from celery import chord, group, shared_task
+from django.db.models import Count, Q
 from django.utils import timezone
-from django.core.mail import send_mail
 from django.conf import settings
-from .models import Job
-from accounts.models import Profile
-
-# Your exact job boards
-JOB_SOURCES = [
-    {"name": "Relocate.me", "url": "https://relocate.me/jobs/rss"},
-    {"name": "StepStone.de", "url": "https://www.stepstone.de/rss/jobs.rss?wt=1&what=python+django+robot+framework&where=deutschland"},
-    {"name": "Arbeitnow", "url": "https://www.arbeitnow.com/api/job-board-api"},
-    {"name": "MyCareersFuture", "url": "https://api.mycareersfuture.gov.sg/v2/jobs?limit=30&sortBy=new_posting_date&search=python+django+automation+testing"},
-    {"name": "JobsInFinland", "url": "https://jobsinfinland.fi/feed/"},
-    {"name": "IamExpat NL", "url": "https://www.iamexpat.nl/rss/career/jobs-netherlands.xml"},
-    {"name": "WorkHere NZ", "url": "https://workhere.co.nz/jobs/rss"},
-]
-
-def extract_keywords(text, profile_skills):
-    if not text:
-        return []
-    text_lower = text.lower()
-    return [skill for skill in profile_skills if skill and skill.lower() in text_lower]
-
-# THIS IS NOW A NORMAL FUNCTION — NO CELERY!
-def fetch_jobs():
-    profiles = Profile.objects.select_related('user').all()
+from .models import ArchivedJob, Job, JobSource, FetchRun, FetchState, Posting
+from .adapters import get_adapter
+from .counters import invalidate
+from .dedup import collapse_duplicates
+from .http import SourceTimeout, circuit_open, fetch, record_failure
+from .matching import ProfileIndex, RelevanceScorer, describe_posting, term_matchers
+from .outbox import daily_reminder, drain_outbox, enqueue, new_jobs_digest
+from .retention import apply_retention
+from .stats import download_stats, finish_run, merge_counts, new_counts, start_run
+from accounts.models import Profile, get_zone
+from tracker.models import Task
+
+
+# ==========================
+# 1. Fetch stage — every source is downloaded & normalized ONCE per run
+# ==========================
+# Sources are enabled JobSource rows, parsed by the adapter named on each row
+# (see jobs/adapters.py). They are downloaded concurrently by a bounded thread
+# pool over a shared keep-alive session (see jobs/http.py). Each source gets its
+# own timeout (config["timeout"] or JOB_FETCH_SOURCE_TIMEOUT), counted from when
+# a worker picks it up, and the whole run is capped by JOB_FETCH_RUN_DEADLINE,
+# so wall time tracks the slowest source instead of the sum of all of them.
+JOB_FETCH_WORKERS = getattr(settings, 'JOB_FETCH_WORKERS', 8)
+JOB_FETCH_SOURCE_TIMEOUT = getattr(settings, 'JOB_FETCH_SOURCE_TIMEOUT', 15)
+JOB_FETCH_RUN_DEADLINE = getattr(settings, 'JOB_FETCH_RUN_DEADLINE', 60)
+JOB_FETCH_MAX_PAGES = getattr(settings, 'JOB_FETCH_MAX_PAGES', 10)
+JOB_INGEST_BATCH_SIZE = getattr(settings, 'JOB_INGEST_BATCH_SIZE', 500)
+
+
+class NotStarted(Exception):
+    """The run deadline passed before a worker picked the source up"""
+
+
+def source_timeout(source):
+    return source.config.get("timeout", JOB_FETCH_SOURCE_TIMEOUT)
+
+
+def fetch_source(source, timeout, state=None, run_deadline=None):
+    """
+    Download one source within timeout seconds of starting (and before
+    run_deadline, a time.monotonic() value, when given). Returns a result dict:
+      postings      → normalized postings (see jobs/adapters.py) newer than the stored high-water mark
+      not_modified  → True when the board answered 304 to our conditional GET
+      etag / last_modified / high_water_mark → state to store for the next run
+      latency_ms / bytes / pages → what the download cost (see jobs/stats.py)
+
+    Boards list newest entries first, so we stop at the entry we saw first last
+    time and follow pagination only until then (at most JOB_FETCH_MAX_PAGES).
+    """
+    # Counted from here, not from when the source was queued behind the other workers
+    deadline = time.monotonic() + timeout
+    if run_deadline is not None:
+        if run_deadline <= time.monotonic():
+            raise NotStarted()
+        deadline = min(deadline, run_deadline)
+    adapter = get_adapter(source.adapter)
+    state = state or {}
+    headers = {}
+    if state.get("etag"):
+        headers["If-None-Match"] = state["etag"]
+    if state.get("last_modified"):
+        headers["If-Modified-Since"] = state["last_modified"]
+    mark = state.get("high_water_mark")
+
+    result = {
+        "postings": [], "not_modified": False,
+        "etag": "", "last_modified": "", "high_water_mark": mark or "",
+        "latency_ms": 0, "bytes": 0, "pages": 0,
+    }
+
+    def get(url, headers=None):
+        started = time.monotonic()
+        status_code, body, resp_headers = fetch(url, deadline, headers)
+        result["latency_ms"] += int((time.monotonic() - started) * 1000)
+        result["bytes"] += len(body)
+        result["pages"] += 1
+        return status_code, body, resp_headers
+
+    status_code, body, resp_headers = get(source.job_search_url, headers)
+    if status_code == 304:
+        # Nothing changed since the last run — skip parsing and matching entirely
+        result["not_modified"] = True
+        return result
+    if status_code != 200:
+        raise requests.HTTPError(f"HTTP {status_code}")
+
+    result["etag"] = resp_headers.get("ETag", "")
+    result["last_modified"] = resp_headers.get("Last-Modified", "")
+
+    url = source.job_search_url
+    for page in range(JOB_FETCH_MAX_PAGES):
+        if page:
+            status_code, body, _ = get(url)
+            if status_code != 200:
+                break
+
+        entries, next_url = adapter(source, url, body)
+        if page == 0 and entries:
+            result["high_water_mark"] = entries[0][0]
+
+        reached_mark = False
+        for entry_id, posting in entries:
+            if mark and entry_id == mark:
+                reached_mark = True
+                break
+            result["postings"].append(posting)
+
+        if reached_mark or not next_url or next_url == url:
+            break
+        url = next_url
+
+    return result
+
+
+# Beat doesn't fire at the exact same second every time — don't skip a source by a few seconds
+POLL_SLACK = timedelta(minutes=5)
+
+
+def due_sources(force=False):
+    """
+    Enabled sources whose poll interval has elapsed since they were last checked
+    (force skips that check) and whose circuit breaker is closed.
+    """
+    sources = list(JobSource.objects.filter(enabled=True).order_by('pk'))
+    states = {
+        label: (checked_at, open_until)
+        for label, checked_at, open_until in FetchState.objects.filter(
+            source__in=[s.label for s in sources]
+        ).values_list('source', 'checked_at', 'circuit_open_until')
+    }
+    now = timezone.now()
+
+    due = []
+    for source in sources:
+        checked_at, open_until = states.get(source.label, (None, None))
+        if circuit_open(open_until, now):
+            print(f"Skipping {source.label}: circuit open until {open_until:%Y-%m-%d %H:%M}")
+            continue
+        if force or not checked_at or checked_at + timedelta(minutes=source.poll_interval) - POLL_SLACK <= now:
+            due.append(source)
+    return due
+
+
+def _load_state(sources):
+    states = FetchState.objects.filter(source__in=[s.label for s in sources])
+    return {
+        state.source: {
+            "etag": state.etag,
+            "last_modified": state.last_modified,
+            "high_water_mark": state.high_water_mark,
+        }
+        for state in states
+    }
+
+
+def _save_state(name, result):
+    FetchState.objects.update_or_create(
+        source=name,
+        defaults={
+            "etag": result["etag"][:255],
+            "last_modified": result["last_modified"][:100],
+            "high_water_mark": result["high_water_mark"][:500],
+            "checked_at": timezone.now(),
+            "consecutive_failures": 0,
+            "circuit_open_until": None,
+        },
+    )
+
+
+def fetch_state(result):
+    """What one download learned about its source (validators, mark), to store once its postings are in"""
+    return {key: result[key] for key in ("not_modified", "etag", "last_modified", "high_water_mark")}
+
+
+def _record_result(name, state):
+    if state["not_modified"]:
+        FetchState.objects.filter(source=name).update(
+            checked_at=timezone.now(), consecutive_failures=0, circuit_open_until=None,
+        )
+    else:
+        _save_state(name, state)
+
+
+def save_fetch_states(states):
+    """
+    Persist {source name: fetch_state} — only after the run's postings are stored
+    and ingested, or a failed run would leave them behind a 304 / the high-water mark
+    """
+    for name, state in states.items():
+        _record_result(name, state)
+
+
+def fetch_postings(sources=None, force=False, stats=None, states=None):
+    """
+    Fetch stage: download all due sources in parallel, one download per source.
+    Sources are fetched incrementally (conditional GET + high-water mark)
+    unless force=True. Returns (postings, errors) where errors maps source name
+    → reason ("timeout" for sources that missed their deadline, "not started"
+    for sources still queued at the run deadline). Pass a dict as
+    stats to collect each source's download_stats, and one as states to collect
+    each source's fetch_state for save_fetch_states.
+    """
+    if stats is None:
+        stats = {}
+    if states is None:
+        states = {}
+    if sources is None:
+        sources = due_sources(force)
+    postings = []
+    errors = {}
+    if not sources:
+        return postings, errors
+
+    state = {} if force else _load_state(sources)
+
+    run_deadline = time.monotonic() + JOB_FETCH_RUN_DEADLINE
+    executor = ThreadPoolExecutor(max_workers=min(JOB_FETCH_WORKERS, len(sources)))
+    futures = {}
+    for source in sources:
+        print(f"Fetching from {source.label}...")
+        future = executor.submit(fetch_source, source, source_timeout(source), state.get(source.label), run_deadline)
+        futures[future] = source
+
+    done, _ = wait(futures, timeout=max(0, run_deadline - time.monotonic()))
+    # Don't wait for stragglers — their own deadlines stop them shortly — and drop sources still queued
+    executor.shutdown(wait=False, cancel_futures=True)
+
+    not_modified = []
+    for future, source in futures.items():
+        try:
+            if future.cancelled():
+                raise NotStarted()
+            if future not in done:
+                raise SourceTimeout("run deadline reached")
+            result = future.result()
+        except NotStarted:
+            # Still queued at the run deadline: says nothing about the board, so no circuit breaker failure
+            errors[source.label] = "not started"
+            stats[source.label] = download_stats(error="not started")
+            continue
+        except SourceTimeout:
+            errors[source.label] = "timeout"
+            stats[source.label] = download_stats(error="timeout")
+            record_failure(source.label)
+            continue
+        except Exception as e:
+            errors[source.label] = str(e)
+            stats[source.label] = download_stats(error=str(e))
+            print(f"Error with {source.label}: {e}")
+            record_failure(source.label)
+            continue
+
+        stats[source.label] = download_stats(result)
+        states[source.label] = fetch_state(result)
+        if result["not_modified"]:
+            not_modified.append(source.label)
+            continue
+        postings.extend(result["postings"])
+
+    if not_modified:
+        print(f"Not modified: {', '.join(not_modified)}")
+    timed_out = [name for name, reason in errors.items() if reason == "timeout"]
+    if timed_out:
+        print(f"Timed out: {', '.join(timed_out)}")
+    not_started = [name for name, reason in errors.items() if reason == "not started"]
+    if not_started:
+        print(f"Not started before the run deadline: {', '.join(not_started)}")
+    return postings, errors
+
+
+# ==========================
+# 2. Matching stage — one pass over the postings against the profile index
+# ==========================
+def match_postings(postings, user_ids=None, index=None):
+    """Return {user_id: [posting, ...]} using the ProfileTerm inverted index (the run's, when given)"""
+    if index is None:
+        index = ProfileIndex.load(user_ids)
+    return index.match_postings(postings, user_ids)
+
+
+@lru_cache(maxsize=1)
+def run_index(run_id):
+    """The ProfileIndex of one fetch run, built once per worker process and shared by the run's matching chunks"""
+    return ProfileIndex.load()
+
+
+# ==========================
+# 3. Ingestion — shared postings once, then set-based dedup + bulk inserts of per-user links
+# ==========================
+def describe_postings(postings, matchers=None):
+    """
+    Resolve each posting's "location" and "tags" before dedup and storage. URLs
+    already stored keep their Posting's values and get its primary key as "id";
+    new ones are described from their text (see describe_posting) with matchers,
+    the run's ProfileIndex.matchers (loaded with term_matchers when not given).
+    """
+    urls = {posting["url"] for posting in postings}
+    stored = {
+        url: (pk, location, tags)
+        for url, pk, location, tags in Posting.objects.filter(url__in=urls).values_list('url', 'pk', 'location', 'tags')
+    }
+
+    if matchers is None and len(stored) < len(urls):
+        matchers = term_matchers()
+    for posting in postings:
+        if posting["url"] in stored:
+            posting["id"], posting["location"], posting["tags"] = stored[posting["url"]]
+        else:
+            posting["location"], posting["tags"] = describe_posting(posting, matchers)
+    return postings
+
+
+def store_postings(postings):
+    """
+    Write each new posting (already described, see describe_postings) once to
+    the shared Posting table and add its primary key to the dict as "id".
+    """
+    rows = {}
+    for posting in postings:
+        if "id" in posting or posting["url"] in rows:
+            continue
+        rows[posting["url"]] = Posting(
+            url=posting["url"][:500],
+            title=posting["title"][:200],
+            company=posting["company"][:200],
+            location=posting["location"][:200],
+            source=posting["source"],
+            description=posting["description"][:1000],
+            tags=posting["tags"],
+            alternate_sources=posting.get("alternates", []),
+        )
+
+    # Concurrent runs may store the same URL first — read the ids back instead of trusting bulk_create
+    Posting.objects.bulk_create(rows.values(), batch_size=JOB_INGEST_BATCH_SIZE, ignore_conflicts=True)
+    if rows:
+        stored = dict(Posting.objects.filter(url__in=rows.keys()).values_list('url', 'pk'))
+        for posting in postings:
+            if "id" not in posting:
+                posting["id"] = stored[posting["url"]]
+    return postings
+
+
+def load_postings(refs):
+    """
+    Stored postings back as the dicts ingestion works on, from [(posting id,
+    match_skills), ...] — what the Celery matching chunks are sent instead of
+    the postings themselves, so each message stays small
+    """
+    match_skills = {}
+    for pk, flag in refs:
+        match_skills[pk] = match_skills.get(pk, False) or flag
+    ids = list(match_skills)
+    postings = []
+    for start in range(0, len(ids), JOB_INGEST_BATCH_SIZE):
+        rows = Posting.objects.filter(pk__in=ids[start:start + JOB_INGEST_BATCH_SIZE]).values(
+            'id', 'url', 'title', 'company', 'location', 'source', 'description', 'tags',
+        )
+        postings.extend({**row, "match_skills": match_skills[row["id"]]} for row in rows)
+    return postings
+
+
+def ingest_jobs(matches, counts=None, scorers=None):
+    """
+    Link the new postings to a batch of users ({user_id: [posting, ...]}, postings already stored).
+    Existing (user, posting) pairs for the whole batch are loaded in one query and
+    new rows are written with one bulk_create, so cost scales with batches,
+    not rows. Postings a user already had archived (jobs/retention.py) count
+    as existing too, so ignored jobs don't come back when a board re-lists them.
+    New rows get their relevance_score from scorers ({user_id: RelevanceScorer}).
+    Returns {user_id: [new Job, ...]}. Per-source matched / inserted /
+    duplicates are added to counts when given (see jobs/stats.py).
+    """
+    if counts is None:
+        counts = new_counts()
+    scorers = scorers or {}
+    posting_ids = {posting["id"] for matched in matches.values() for posting in matched}
+    existing = set(
+        Job.objects.filter(user_id__in=matches.keys(), posting_id__in=posting_ids).values_list('user_id', 'posting_id')
+    )
+    urls = {posting["url"] for matched in matches.values() for posting in matched}
+    archived = set(
+        ArchivedJob.objects.filter(user_id__in=matches.keys(), url__in=urls).values_list('user_id', 'url')
+    )
+
+    new_jobs = {}
+    rows = []
+    for user_id, matched in matches.items():
+        for posting in matched:
+            tally = counts[posting["source"]]
+            tally["matched"] += 1
+            key = (user_id, posting["id"])
+            if key in existing or (user_id, posting["url"]) in archived:
+                tally["duplicates"] += 1
+                continue
+            existing.add(key)
+            tally["inserted"] += 1
+            scorer = scorers.get(user_id)
+            score = scorer.score(posting["location"], posting["title"], posting["tags"]) if scorer else 0
+            job = Job(user_id=user_id, posting_id=posting["id"], status='new', relevance_score=score)
+            rows.append(job)
+            new_jobs.setdefault(user_id, []).append(job)
+
+    # The (user, posting) unique constraint makes concurrent runs safe: losers are skipped
+    Job.objects.bulk_create(rows, batch_size=JOB_INGEST_BATCH_SIZE, ignore_conflicts=True)
+    invalidate(*new_jobs)
+    return new_jobs
+
+
+def ingest_for_users(postings, user_ids=None, counts=None, index=None):
+    """
+    Match, insert and queue digests for a set of users (all profiles by default).
+    postings must have gone through store_postings; index is the run's
+    ProfileIndex when one is already built. Emails only go to the outbox here —
+    send_outbox delivers them, so fetching never waits on SMTP.
+    Returns the number of new jobs.
+    """
+    matches = match_postings(postings, user_ids, index)
+    matched_ids = sorted(matches)
+    shared = Posting.objects.in_bulk({posting["id"] for posting in postings}) if matches else {}
     total_new = 0
 
+    for start in range(0, len(matched_ids), JOB_INGEST_BATCH_SIZE):
+        batch = {user_id: matches[user_id] for user_id in matched_ids[start:start + JOB_INGEST_BATCH_SIZE]}
+        profiles = list(Profile.objects.select_related('user').filter(user_id__in=batch.keys()))
+        new_jobs = ingest_jobs(batch, counts, {profile.user_id: RelevanceScorer(profile) for profile in profiles})
+
+        emails = []
+        for profile in profiles:
+            user = profile.user
+            jobs = new_jobs.get(user.pk)
+            if not jobs:
+                continue
+            total_new += len(jobs)
+            if profile.email_notifications and user.email:
+                for job in jobs:
+                    job.posting = shared[job.posting_id]
+                emails.append(new_jobs_digest(user, jobs))
+        enqueue(emails)
+
+    return total_new
+
+
+def run_fetch_jobs(force=False, user_ids=None):
+    """
+    Whole pipeline in this process (management command / local dev).
+    Production runs go through the fetch_jobs Celery task below.
+    """
+    sources = due_sources(force)
+    if not sources:
+        print("Job fetch complete! No sources due.")
+        return 0
+
+    run = start_run(force, scoped=user_ids is not None)
+    stats = {}
+    states = {}
+    counts = new_counts()
+    postings, errors = fetch_postings(sources, force=force, stats=stats, states=states)
+    print(f"Fetched {len(postings)} postings from {len(sources) - len(errors)}/{len(sources)} sources.")
+    # One index for the whole run: it describes the new postings and matches them
+    index = ProfileIndex.load() if postings else None
+    postings = store_postings(collapse_duplicates(describe_postings(postings, index and index.matchers)))
+    total_new = ingest_for_users(postings, user_ids, counts, index) if postings else 0
+
+    # Runs that only match some users don't move the high-water mark past entries other users never saw
+    if user_ids is None:
+        save_fetch_states(states)
+    finish_run(run, stats, counts)
+    if not postings:
+        print("Job fetch complete! Nothing new to match.")
+        return 0
+    print(f"Job fetch complete! Added {total_new} new jobs.")
+    if total_new:
+        send_outbox()
+    return total_new
+
+
+# ==========================
+# 4. Celery task graph
+# ==========================
+#   fetch_jobs ─┬─ download_source(source 1) ─┐
+#               ├─ download_source(source 2) ─┼─ dispatch_matching ─┬─ match_profiles(chunk 1) ─┐
+#               └─ ...                        ┘                     ├─ match_profiles(chunk 2) ─┼─ summarize_fetch
+#                                                                   └─ ...                      ┘
+# Downloads and matching chunks spread across worker processes / nodes.
+@shared_task
+def fetch_jobs(force=False, user_ids=None):
+    """Beat entry point — queue one download per due source, then fan matching out"""
+    sources = due_sources(force)
+    if not sources:
+        return {"new_jobs": 0, "postings": 0, "errors": {}}
+
+    record_state = user_ids is None
+    run = start_run(force, scoped=not record_state)
+    downloads = group(download_source.s(source.pk, force, record_state) for source in sources)
+    chord(downloads)(dispatch_matching.s(user_ids, run.pk))
+    return {"run": run.pk, "sources": [source.label for source in sources]}
+
+
+@shared_task(soft_time_limit=JOB_FETCH_SOURCE_TIMEOUT * 2, time_limit=JOB_FETCH_SOURCE_TIMEOUT * 3)
+def download_source(source_id, force=False, record_state=True):
+    """Fetch one source; errors are returned (not raised) so the chord always completes"""
+    source = JobSource.objects.get(pk=source_id)
+    state = {} if force else _load_state([source]).get(source.label)
+
+    try:
+        result = fetch_source(source, source_timeout(source), state)
+    except SourceTimeout:
+        record_failure(source.label)
+        return {"source": source.label, "postings": [], "error": "timeout", "stats": download_stats(error="timeout")}
+    except Exception as e:
+        record_failure(source.label)
+        return {"source": source.label, "postings": [], "error": str(e), "stats": download_stats(error=str(e))}
+
+    return {
+        "source": source.label, "postings": result["postings"], "error": None, "stats": download_stats(result),
+        # Stored by summarize_fetch once every chunk is ingested
+        "state": fetch_state(result) if record_state else None,
+    }
+
+
+@shared_task
+def dispatch_matching(downloads, user_ids=None, run_id=None):
+    """Merge all downloads and split matching into chunks of profiles"""
+    postings = [posting for download in downloads for posting in download["postings"]]
+    errors = {download["source"]: download["error"] for download in downloads if download["error"]}
+    stats = {download["source"]: download["stats"] for download in downloads}
+    states = {download["source"]: download["state"] for download in downloads if download.get("state")}
+    summary = {"errors": errors, "fetched": len(postings), "run_id": run_id, "downloads": stats, "states": states}
+    postings = store_postings(collapse_duplicates(describe_postings(postings)))
+    if not postings:
+        return summarize_fetch([], **summary)
+
+    if user_ids is None:
+        user_ids = list(Profile.objects.order_by('user_id').values_list('user_id', flat=True))
+    chunks = [
+        user_ids[start:start + JOB_INGEST_BATCH_SIZE]
+        for start in range(0, len(user_ids), JOB_INGEST_BATCH_SIZE)
+    ]
+    if not chunks:
+        return summarize_fetch([], **summary)
+
+    # Postings are stored by now: chunks get their ids, not every posting's text
+    refs = [(posting["id"], posting["match_skills"]) for posting in postings]
+    matching = group(match_profiles.s(refs, chunk, run_id) for chunk in chunks)
+    chord(matching)(summarize_fetch.s(**summary))
+
+
+@shared_task
+def match_profiles(refs, user_ids, run_id=None):
+    """
+    Match + ingest + notify one chunk of profiles against the run's stored
+    postings (refs, see load_postings); returns its new-job total and per-source counts
+    """
+    postings = load_postings(refs)
+    counts = new_counts()
+    # Chunks of one run that land on the same worker reuse its index instead of rebuilding the matchers
+    index = run_index(run_id) if run_id else None
+    new_jobs = ingest_for_users(postings, user_ids, counts, index)
+    return {"new_jobs": new_jobs, "counts": {source: dict(tally) for source, tally in counts.items()}}
+
+
+@shared_task
+def summarize_fetch(results, errors=None, fetched=0, run_id=None, downloads=None, states=None):
+    """
+    Chord callback: aggregate the totals of one run and store its FetchRun stats.
+    Only runs when every chunk was ingested, so this is where the sources' fetch state is saved
+    """
+    save_fetch_states(states or {})
+    counts = new_counts()
+    for result in results:
+        merge_counts(counts, result["counts"])
+    if run_id:
+        run = FetchRun.objects.filter(pk=run_id).first()
+        if run:
+            finish_run(run, downloads or {}, counts)
+
+    summary = {"new_jobs": sum(result["new_jobs"] for result in results), "postings": fetched, "errors": errors or {}}
+    print(f"Job fetch complete! Added {summary['new_jobs']} new jobs from {fetched} postings.")
+    if summary["new_jobs"]:
+        send_outbox.delay()
+    return summary
+
+
+# ==========================
+# 5. Email outbox
+# ==========================
+@shared_task
+def send_outbox():
+    """Drain due outbox emails batch by batch over one SMTP connection each (also on beat every minute)"""
+    total_sent = total_failed = 0
+    while True:
+        sent, failed = drain_outbox()
+        total_sent += sent
+        total_failed += failed
+        if not sent and not failed:
+            break
+    if total_sent or total_failed:
+        print(f"Outbox: sent {total_sent}, failed {total_failed}")
+    return {"sent": total_sent, "failed": total_failed}
+
+
+# ==========================
+# 6. Daily reminders
+# ==========================
+# Profile.next_reminder_at holds each profile's next reminder in UTC (its
+# reminder_time in its own timezone). Every beat tick reads only the due
+# bucket through that index and moves those profiles on to tomorrow.
+REMINDER_BATCH_SIZE = getattr(settings, 'REMINDER_BATCH_SIZE', 500)
+REMINDER_TASKS_SHOWN = 5
+
+
+def _claim_due_reminders(now, batch_size):
+    """
+    Take the next batch of due profiles and reschedule them. Each profile is
+    claimed with a conditional UPDATE that only matches while next_reminder_at
+    is still the value read, so of two overlapping ticks only the one that moved
+    it builds the reminder, also on backends without SELECT ... FOR UPDATE SKIP LOCKED (SQLite)
+    """
+    due = Profile.objects.select_related('user').filter(next_reminder_at__lte=now).order_by('next_reminder_at', 'pk')
+    claimed = []
+    for profile in due[:batch_size]:
+        read = profile.next_reminder_at
+        profile.schedule_reminder(after=now)
+        if Profile.objects.filter(pk=profile.pk, next_reminder_at=read).update(
+            next_reminder_at=profile.next_reminder_at,
+        ):
+            claimed.append(profile)
+    return claimed
+
+
+def build_reminders(profiles, now):
+    """Reminder emails for a batch of profiles — a few grouped queries, not a few per user"""
+    profiles = [p for p in profiles if p.user.email]
+    user_ids = [p.user_id for p in profiles]
+
+    # "Due today" depends on each user's timezone; group users by local date, one query per date
+    by_day = defaultdict(list)
+    for profile in profiles:
+        by_day[now.astimezone(get_zone(profile.timezone)).date()].append(profile.user_id)
+
+    counts = {}
+    tasks = defaultdict(list)
+    for day, ids in by_day.items():
+        open_tasks = Task.objects.filter(goal__user_id__in=ids, due_date__lte=day).exclude(status='completed')
+        for row in open_tasks.order_by().values('goal__user_id').annotate(
+            due_today=Count('pk', filter=Q(due_date=day)),
+            overdue=Count('pk', filter=Q(due_date__lt=day)),
+        ):
+            counts[row['goal__user_id']] = (row['due_today'], row['overdue'])
+        for task in open_tasks.order_by('goal__user_id', 'due_date', 'pk').values(
+            'goal__user_id', 'description', 'due_date',
+        ):
+            if len(tasks[task['goal__user_id']]) < REMINDER_TASKS_SHOWN:
+                tasks[task['goal__user_id']].append(task)
+
+    new_jobs = dict(
+        Job.objects.filter(user_id__in=user_ids, status='new')
+        .order_by().values('user_id').annotate(n=Count('pk')).values_list('user_id', 'n')
+    )
+
+    emails = []
     for profile in profiles:
-        user = profile.user
-        skills = [s.strip() for s in (profile.key_skills or []) if s.strip()]
-        roles = [r.strip().lower() for r in (profile.preferred_roles or []) if r.strip()]
-        countries = [c.strip().lower() for c in (profile.target_countries or []) if c.strip()]
-
-        new_jobs = []
-
-        for source in JOB_SOURCES:
-            try:
-                print(f"Fetching from {source['name']}...")
-                if "mycareersfuture" in source["url"]:
-                    resp = requests.get(source["url"], timeout=15)
-                    if resp.status_code == 200:
-                        data = resp.json().get("results", [])
-                        for item in data:
-                            title = item.get("title", "No title")
-                            company = item.get("company", {}).get("name", "Unknown")
-                            url = item.get("applyUrl") or item.get("jobUrl", "#")
-                            desc = (item.get("description", "") + " " + item.get("requirements", "")).strip()
-
-                            if any(role in title.lower() for role in roles) or any(skill.lower() in desc.lower() for skill in skills):
-                                if not Job.objects.filter(user=user, url=url).exists():
-                                    job = Job.objects.create(
-                                        user=user,
-                                        title=title,
-                                        company=company,
-                                        location="Singapore",
-                                        source="MyCareersFuture",
-                                        url=url,
-                                        description=desc[:1000],
-                                        tags=extract_keywords(desc, skills),
-                                        status='new'
-                                    )
-                                    new_jobs.append(job)
-                                    total_new += 1
-
-                elif "arbeitnow" in source["url"]:
-                    resp = requests.get(source["url"], timeout=15)
-                    if resp.status_code == 200:
-                        for item in resp.json().get("data", []):
-                            title = item.get("title", "")
-                            if not any(role in title.lower() for role in roles):
-                                continue
-                            if not Job.objects.filter(user=user, url=item["url"]).exists():
-                                job = Job.objects.create(
-                                    user=user,
-                                    title=title,
-                                    company=item.get("company_name", "Unknown"),
-                                    location="Germany",
-                                    source="Arbeitnow",
-                                    url=item["url"],
-                                    description=" ".join(item.get("tags", [])),
-                                    tags=item.get("tags", []),
-                                    status='new'
-                                )
-                                new_jobs.append(job)
-                                total_new += 1
-
-                else:
-                    # RSS Feeds
-                    feed = feedparser.parse(source["url"])
-                    for entry in feed.entries[:20]:
-                        title = getattr(entry, "title", "No title")
-                        url = getattr(entry, "link", "#")
-                        desc = getattr(entry, "description", "") or getattr(entry, "summary", "")
-                        company = getattr(entry, "author", "Unknown")
-
-                        if any(role in title.lower() for role in roles) or any(skill.lower() in desc.lower() for skill in skills):
-                            if not Job.objects.filter(user=user, url=url).exists():
-                                location = next((c for c in countries if c in desc.lower() or c in title.lower()), "International")
-                                job = Job.objects.create(
-                                    user=user,
-                                    title=title,
-                                    company=company,
-                                    location=location.title(),
-                                    source=source["name"],
-                                    url=url,
-                                    description=desc[:1000],
-                                    tags=extract_keywords(desc + title, skills),
-                                    status='new'
-                                )
-                                new_jobs.append(job)
-                                total_new += 1
-
-            except Exception as e:
-                print(f"Error with {source['name']}: {e}")
-
-        # Send email
-        if new_jobs and profile.email_notifications and user.email:
-            subject = f"New Jobs Alert! ({len(new_jobs)} found)"
-            message = f"Hi {user.get_full_name() or user.username},\n\nWe found {len(new_jobs)} new jobs for you:\n\n"
-            for j in new_jobs[:10]:
-                message += f"• {j.title}\n  {j.company} — {j.location}\n  → {j.url}\n\n"
-            message += "Login: http://127.0.0.1:8000/jobs/\n\nGood luck!\n— Career Tracker"
-
-            send_mail(subject, message, settings.DEFAULT_FROM_EMAIL, [user.email], fail_silently=True)
-
-    print(f"Job fetch complete! Added {total_new} new jobs.")
\ No newline at end of file
+        due_today, overdue = counts.get(profile.user_id, (0, 0))
+        emails.append(daily_reminder(
+            profile, due_today=due_today, overdue=overdue,
+            tasks=tasks[profile.user_id], new_jobs=new_jobs.get(profile.user_id, 0),
+        ))
+    return emails
+
+
+@shared_task
+def send_daily_reminders():
+    """Beat entry point (every minute) — queue reminders for the profiles whose time has come"""
+    now = timezone.now()
+    queued = 0
+    while True:
+        profiles = _claim_due_reminders(now, REMINDER_BATCH_SIZE)
+        if not profiles:
+            break
+        emails = build_reminders(profiles, now)
+        enqueue(emails)
+        queued += len(emails)
+
+    if queued:
+        print(f"Queued {queued} daily reminders")
+        send_outbox.delay()
+    return queued
+
+
+# ==========================
+# 7. Retention
+# ==========================
+@shared_task
+def prune_jobs():
+    """Beat entry point (nightly) — archive / delete expired jobs, see jobs/retention.py"""
+    counts = apply_retention()
+    print(f"Retention: {counts['ignored']} ignored and {counts['stale']} stale jobs, {counts['postings']} postings reclaimed")
+    return counts
@@ -1,3 +1,1210 @@
+import json
+import random
+import re
+import time
+from datetime import date, timedelta
+from importlib import import_module
+from unittest import mock
+
+import requests
+from django.apps import apps
+from django.contrib.auth.models import User
+from django.core import mail
+from django.core.cache import cache
+from django.db import connection
 from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from accounts.models import Profile
+from .adapters import next_page_by_offset, parse_feed, parse_json_api, parse_paginated_json_api
+from .counters import job_counts
+from .dedup import collapse_duplicates
+from .documents import generate_document
+from .http import (
+    JOB_FETCH_BACKOFF, JOB_FETCH_BREAKER_THRESHOLD, JOB_FETCH_RETRIES, SourceTimeout, circuit_open, fetch,
+    record_failure,
+)
+from .matching import KeywordMatcher, ProfileIndex, RelevanceScorer, index_profile, rescore_jobs, term_matchers
+from .models import (
+    ArchivedJob, FetchRun, FetchState, GeneratedDocument, Job, JobSource, OutboxEmail, Posting, PostingFingerprint,
+)
+from .outbox import EMAIL_OUTBOX_MAX_ATTEMPTS, _claim, drain_outbox
+from .pagination import encode_cursor, keyset_page
+from .retention import _drain, apply_retention, orphan_postings
+from .search import highlight, rank_page, search_jobs, snippets
+from .tasks import (
+    describe_postings, dispatch_matching, download_source, due_sources, fetch_postings, fetch_source, ingest_jobs,
+    match_profiles, run_fetch_jobs, run_index, save_fetch_states, store_postings, summarize_fetch,
+)
+from .views import BULK_MAX_IDS
+
+
+class QueryPlanTestCase(TestCase):
+    """
+    Runs every SELECT a page issues through EXPLAIN and fails when one of them
+    reads a whole table instead of going through an index, or sorts rows an
+    index could have returned in order.
+    """
+
+    # SQLite: "SCAN jobs_job" (but not "SCAN jobs_posting_fts VIRTUAL TABLE …" or the schema table)
+    SQLITE_SCAN = re.compile(r'^SCAN (?!\S+ VIRTUAL TABLE|sqlite_master)(\S+)')
+    SQLITE_SORT = re.compile(r'^USE TEMP B-TREE FOR (?:RIGHT PART OF )?ORDER BY')
+    POSTGRES_SCAN = re.compile(r'Seq Scan on (\S+)')
+    POSTGRES_SORT = re.compile(r'^(?:->\s*)?(?:Incremental )?Sort\b')
+
+    def page_queries(self, url, data=None):
+        queries = []
+
+        def capture(execute, sql, params, many, context):
+            queries.append((sql, params))
+            return execute(sql, params, many, context)
+
+        with connection.execute_wrapper(capture):
+            response = self.client.get(url, data)
+            if response.streaming:
+                # Streamed pages only query while their body is read
+                b''.join(response.streaming_content)
+        self.assertEqual(response.status_code, 200)
+        return [(sql, params) for sql, params in queries if sql.lstrip().upper().startswith('SELECT')]
+
+    def plan(self, sql, params):
+        with connection.cursor() as cursor:
+            if connection.vendor == 'postgresql':
+                # Tiny test tables are cheaper to scan and sort — only count what no index could avoid
+                cursor.execute('SET LOCAL enable_seqscan = off')
+                cursor.execute('SET LOCAL enable_sort = off')
+                cursor.execute('EXPLAIN ' + sql, params)
+            else:
+                cursor.execute('EXPLAIN QUERY PLAN ' + sql, params)
+            return [str(row[-1]) for row in cursor.fetchall()]
+
+    def assertNoTableScans(self, url, data=None, sorts=False):
+        """sorts=True allows ORDER BYs no index can serve (e.g. by search rank)"""
+        if connection.vendor == 'postgresql':
+            patterns = [self.POSTGRES_SCAN] + ([] if sorts else [self.POSTGRES_SORT])
+        else:
+            patterns = [self.SQLITE_SCAN] + ([] if sorts else [self.SQLITE_SORT])
+
+        failures = []
+        for sql, params in self.page_queries(url, data):
+            plan = self.plan(sql, params)
+            if any(pattern.search(line.strip()) for pattern in patterns for line in plan):
+                failures.append(f"{sql}\n    " + "\n    ".join(plan))
+        self.assertFalse(failures, f"{url} {data or ''} scans or sorts whole tables:\n\n" + "\n\n".join(failures))
+
+
+class JobsQueryPlanTests(QueryPlanTestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('planner', 'planner@example.com', 'x')
+        other = User.objects.create_user('other', 'other@example.com', 'x')
+        for user in (cls.user, other):
+            Profile.objects.create(user=user, name=user.username, key_skills=['Python'])
+
+        postings = Posting.objects.bulk_create([
+            Posting(
+                url=f'https://example.com/jobs/{i}', title=f'Python Developer {i}', company=f'Company {i % 20}',
+                location='Germany', source='RemoteOK', description='Django and PostgreSQL', tags=['Python'],
+            )
+            for i in range(300)
+        ])
+        statuses = [status for status, _ in Job.STATUS_CHOICES]
+        Job.objects.bulk_create([
+            Job(user=user, posting=posting, status=statuses[i % 4], relevance_score=i % 5)
+            for user in (cls.user, other)
+            for i, posting in enumerate(postings)
+        ])
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def test_jobs_list(self):
+        self.assertNoTableScans(reverse('jobs'))
+
+    def test_jobs_list_by_status(self):
+        self.assertNoTableScans(reverse('jobs'), {'status': 'new'})
+
+    def test_jobs_list_by_relevance(self):
+        self.assertNoTableScans(reverse('jobs'), {'sort': 'relevance', 'min_relevance': 2})
+
+    def test_jobs_next_page(self):
+        self.assertNoTableScans(reverse('jobs_more'), {'cursor': encode_cursor([date.today() - timedelta(days=1), 10**6])})
+
+    def test_jobs_search(self):
+        self.assertNoTableScans(reverse('jobs'), {'q': 'python'}, sorts=True)
+
+
+def board_page(ids, next_url=None):
+    """A JSON job-board page listing the given entry ids, newest first"""
+    return json.dumps({
+        'data': [
+            {'id': str(i), 'title': f'Python Developer {i}', 'company': f'Company {i}',
+             'url': f'https://board.example/jobs/{i}', 'description': 'Django'}
+            for i in ids
+        ],
+        'next': next_url,
+    }).encode()
+
+
+def board_source(**fields):
+    fields.setdefault('label', 'Board')
+    fields.setdefault('job_search_url', 'https://board.example/api')
+    fields.setdefault('adapter', 'json')
+    config = {'items': 'data', 'id': 'id', 'next': 'next', **fields.pop('config', {})}
+    return JobSource.objects.create(country='Germany', config=config, **fields)
+
+
+
+RSS_FEED = b"""<?xml version="1.0"?>
+<rss version="2.0"><channel><title>Board</title>
+  <item><title>Senior Python Developer</title><link>https://feed.example/jobs/2</link><guid>job-2</guid>
+    <author>Acme GmbH</author><description>Django &amp; Postgres</description></item>
+  <item><title>QA Engineer</title><link>https://feed.example/jobs/1</link></item>
+</channel></rss>"""
+
+ATOM_FEED = b"""<?xml version="1.0" encoding="utf-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom"><title>Board</title><id>urn:board</id><updated>2026-10-18T00:00:00Z</updated>
+  <entry><title>Data Engineer</title><id>urn:job:7</id><link href="https://atom.example/jobs/7"/>
+    <author><name>Initech</name></author><updated>2026-10-18T00:00:00Z</updated><summary>Spark and SQL</summary></entry>
+</feed>"""
+
+
+class AdapterTests(TestCase):
+
+    def test_rss(self):
+        entries, next_url = parse_feed(JobSource(label='Feed', adapter='rss'), 'https://feed.example/rss', RSS_FEED)
+        self.assertIsNone(next_url)
+        self.assertEqual([entry_id for entry_id, _ in entries], ['job-2', 'https://feed.example/jobs/1'])
+        posting = entries[0][1]
+        self.assertEqual(
+            {key: posting[key] for key in ('title', 'company', 'url', 'description', 'source', 'location', 'tags')},
+            {'title': 'Senior Python Developer', 'company': 'Acme GmbH', 'url': 'https://feed.example/jobs/2',
+             'description': 'Django & Postgres', 'source': 'Feed', 'location': None, 'tags': None},
+        )
+        self.assertEqual(entries[1][1]['company'], 'Unknown')
+
+    def test_atom_with_a_fixed_country(self):
+        source = JobSource(label='Atom', adapter='atom', country='Finland', config={'match_skills': False})
+        (entry_id, posting), = parse_feed(source, 'https://atom.example/feed', ATOM_FEED)[0]
+        self.assertEqual(entry_id, 'urn:job:7')
+        self.assertEqual((posting['title'], posting['company'], posting['url']),
+                         ('Data Engineer', 'Initech', 'https://atom.example/jobs/7'))
+        self.assertEqual((posting['description'], posting['location'], posting['match_skills']),
+                         ('Spark and SQL', 'Finland', False))
+
+    def test_json_field_paths(self):
+        source = JobSource(label='Api', adapter='json', config={
+            'items': 'results.jobs', 'id': 'slug', 'title': 'attributes.title',
+            'company': ['attributes.company', 'attributes.employer'], 'url': 'links.self',
+            'description': ['attributes.summary', 'tags'], 'tags': 'tags', 'next': 'links.next',
+        })
+        body = json.dumps({
+            'results': {'jobs': [
+                {'slug': 'a1', 'attributes': {'title': 'Go Developer', 'company': '', 'employer': 'Hooli',
+                                              'summary': 'Backend'},
+                 'links': {'self': 'https://api.example/jobs/a1'}, 'tags': ['go', 'grpc']},
+                {'attributes': {'title': 'Designer'}, 'links': {'self': 'https://api.example/jobs/a0'}},
+            ]},
+            'links': {'next': 'https://api.example/jobs?after=a0'},
+        }).encode()
+        entries, next_url = parse_json_api(source, 'https://api.example/jobs', body)
+        self.assertEqual(next_url, 'https://api.example/jobs?after=a0')
+        # Items without an id fall back to their URL
+        self.assertEqual([entry_id for entry_id, _ in entries], ['a1', 'https://api.example/jobs/a0'])
+        posting = entries[0][1]
+        self.assertEqual((posting['title'], posting['company'], posting['url']),
+                         ('Go Developer', 'Hooli', 'https://api.example/jobs/a1'))
+        self.assertEqual((posting['description'], posting['tags']), ('Backend go grpc', ['go', 'grpc']))
+        self.assertIsNone(entries[1][1]['tags'])
+
+    def test_offset_pagination(self):
+        source = JobSource(label='Paged', adapter='paginated_json', config={'items': 'data', 'id': 'id'})
+        url = 'https://paged.example/api?limit=2&page=1'
+        _, next_url = parse_paginated_json_api(source, url, board_page([4, 3]))
+        self.assertEqual(next_url, 'https://paged.example/api?limit=2&page=2')
+        # A short page is the last one
+        self.assertIsNone(parse_paginated_json_api(source, url, board_page([2]))[1])
+        self.assertIsNone(next_page_by_offset('https://paged.example/api', 50))
+
+
+class PaginatedFetchTests(TestCase):
+    """fetch_source following ?limit=&page= pages of a paginated_json board"""
+
+    def setUp(self):
+        self.source = board_source(adapter='paginated_json', job_search_url='https://paged.example/api?limit=2')
+
+    def pages(self, *pages):
+        return [(200, board_page(ids), {}) for ids in pages]
+
+    @mock.patch('jobs.tasks.JOB_FETCH_MAX_PAGES', 3)
+    def test_stops_at_the_page_cap(self):
+        with mock.patch('jobs.tasks.fetch', side_effect=self.pages([9, 8], [7, 6], [5, 4], [3, 2])) as fetch:
+            result = fetch_source(self.source, 10)
+        self.assertEqual(fetch.call_count, 3)
+        self.assertEqual(fetch.call_args.args[0], 'https://paged.example/api?limit=2&page=2')
+        self.assertEqual(len(result['postings']), 6)
+
+    def test_stops_at_the_high_water_mark(self):
+        with mock.patch('jobs.tasks.fetch', side_effect=self.pages([9, 8], [7, 6], [5, 4])) as fetch:
+            result = fetch_source(self.source, 10, {'high_water_mark': '6'})
+        self.assertEqual(fetch.call_count, 2)
+        self.assertEqual(len(result['postings']), 3)
+        self.assertEqual(result['high_water_mark'], '9')
+
+
+class PollIntervalTests(TestCase):
+    """Beat ticks every few minutes; due_sources decides which boards are fetched"""
+
+    def setUp(self):
+        JobSource.objects.update(enabled=False)
+        self.fast = board_source(label='Fast', poll_interval=30)
+        self.slow = board_source(label='Slow', job_search_url='https://slow.example/api')
+        checked_at = timezone.now() - timedelta(minutes=40)
+        FetchState.objects.bulk_create([FetchState(source='Fast', checked_at=checked_at),
+                                        FetchState(source='Slow', checked_at=checked_at)])
+
+    def test_only_sources_whose_interval_elapsed_are_due(self):
+        self.assertEqual(due_sources(), [self.fast])
+        self.assertEqual(due_sources(force=True), [self.fast, self.slow])
+
+
+class ConditionalGetTests(TestCase):
+
+    def setUp(self):
+        self.source = board_source()
+        self.timeout = 10
+
+    def test_sends_stored_validators_and_skips_unchanged_feed(self):
+        state = {'etag': '"v1"', 'last_modified': 'Sat, 17 Oct 2026 10:00:00 GMT', 'high_water_mark': '3'}
+        with mock.patch('jobs.tasks.fetch', return_value=(304, b'', {})) as fetch:
+            result = fetch_source(self.source, self.timeout, state)
+
+        headers = fetch.call_args.args[2]
+        self.assertEqual(headers, {'If-None-Match': '"v1"', 'If-Modified-Since': 'Sat, 17 Oct 2026 10:00:00 GMT'})
+        self.assertTrue(result['not_modified'])
+        self.assertEqual(result['postings'], [])
+        self.assertEqual(result['high_water_mark'], '3')
+
+    def test_first_fetch_is_unconditional_and_returns_validators(self):
+        response = (200, board_page([2, 1]), {'ETag': '"v2"', 'Last-Modified': 'Sun, 18 Oct 2026 10:00:00 GMT'})
+        with mock.patch('jobs.tasks.fetch', return_value=response) as fetch:
+            result = fetch_source(self.source, self.timeout)
+
+        self.assertEqual(fetch.call_args.args[2], {})
+        self.assertFalse(result['not_modified'])
+        self.assertEqual(result['etag'], '"v2"')
+        self.assertEqual(result['last_modified'], 'Sun, 18 Oct 2026 10:00:00 GMT')
+        self.assertEqual(len(result['postings']), 2)
+
+    def test_error_status_raises(self):
+        with mock.patch('jobs.tasks.fetch', return_value=(500, b'', {})):
+            with self.assertRaises(requests.HTTPError):
+                fetch_source(self.source, self.timeout)
+
+
+class HighWaterMarkTests(TestCase):
+
+    def setUp(self):
+        self.source = board_source()
+        self.timeout = 10
+
+    def test_stops_at_the_mark(self):
+        with mock.patch('jobs.tasks.fetch', return_value=(200, board_page([5, 4, 3, 2]), {})):
+            result = fetch_source(self.source, self.timeout, {'high_water_mark': '3'})
+
+        self.assertEqual([posting['url'] for posting in result['postings']],
+                         ['https://board.example/jobs/5', 'https://board.example/jobs/4'])
+        self.assertEqual(result['high_water_mark'], '5')
+
+    def test_follows_pages_until_the_mark(self):
+        pages = [
+            (200, board_page([6, 5], next_url='https://board.example/api?page=2'), {}),
+            (200, board_page([4, 3], next_url='https://board.example/api?page=3'), {}),
+        ]
+        with mock.patch('jobs.tasks.fetch', side_effect=pages) as fetch:
+            result = fetch_source(self.source, self.timeout, {'high_water_mark': '3'})
+
+        self.assertEqual(fetch.call_count, 2)
+        self.assertEqual(result['pages'], 2)
+        self.assertEqual(len(result['postings']), 3)
+        self.assertEqual(result['high_water_mark'], '6')
+
+    def test_unchanged_mark_yields_nothing(self):
+        with mock.patch('jobs.tasks.fetch', return_value=(200, board_page([3, 2]), {})):
+            result = fetch_source(self.source, self.timeout, {'high_water_mark': '3'})
+        self.assertEqual(result['postings'], [])
+        self.assertEqual(result['high_water_mark'], '3')
+
+
+
+def slow_boards(delays):
+    """A stand-in for http.fetch: each URL answers after delays[url] seconds, or gives up at the deadline"""
+    def fetch(url, deadline, headers=None):
+        delay = delays.get(url, 0)
+        if time.monotonic() + delay > deadline:
+            time.sleep(max(0, deadline - time.monotonic()))
+            raise SourceTimeout("deadline reached while downloading")
+        time.sleep(delay)
+        return 200, board_page([1]), {}
+    return fetch
+
+
+@mock.patch('jobs.tasks.JOB_FETCH_WORKERS', 1)
+class FetchDeadlineTests(TestCase):
+
+    def source(self, label, timeout):
+        return board_source(label=label, job_search_url=f'https://{label.lower()}.example/api',
+                            config={'timeout': timeout})
+
+    def test_queued_sources_get_their_whole_timeout(self):
+        # The second source waits 0.6s for the only worker: a timeout counted from queueing would leave it 0.4s
+        sources = [self.source('First', 1), self.source('Second', 1)]
+        delays = {'https://first.example/api': 0.6, 'https://second.example/api': 0.6}
+        with mock.patch('jobs.tasks.fetch', side_effect=slow_boards(delays)):
+            postings, errors = fetch_postings(sources)
+        self.assertEqual(errors, {})
+        self.assertEqual(len(postings), 2)
+
+    def test_slow_source_times_out_and_counts_a_failure(self):
+        sources = [self.source('Slow', 0.1)]
+        with mock.patch('jobs.tasks.fetch', side_effect=slow_boards({'https://slow.example/api': 5})):
+            postings, errors = fetch_postings(sources)
+        self.assertEqual(errors, {'Slow': 'timeout'})
+        self.assertEqual(FetchState.objects.get(source='Slow').consecutive_failures, 1)
+
+    @mock.patch('jobs.tasks.JOB_FETCH_RUN_DEADLINE', 0.3)
+    def test_run_deadline_cancels_sources_still_queued(self):
+        sources = [self.source('Slow', 10), self.source('Queued', 10)]
+        stats = {}
+        started = time.monotonic()
+        with mock.patch('jobs.tasks.fetch', side_effect=slow_boards({'https://slow.example/api': 5})) as fetch:
+            postings, errors = fetch_postings(sources, stats=stats)
+        self.assertLess(time.monotonic() - started, 2)
+        self.assertEqual(errors, {'Slow': 'timeout', 'Queued': 'not started'})
+        self.assertEqual(stats['Queued']['error'], 'not started')
+        self.assertEqual(fetch.call_count, 1)
+        # Only the source that actually ran out of time counts towards its circuit breaker
+        self.assertEqual(list(FetchState.objects.values_list('source', 'consecutive_failures')), [('Slow', 1)])
+
+
+def http_response(status_code, body=b'', headers=None):
+    """A streamed requests response as the pooled session returns it"""
+    response = mock.MagicMock(status_code=status_code, headers=headers or {})
+    response.iter_content.return_value = [body]
+    response.__enter__.return_value = response
+    return response
+
+
+@mock.patch('jobs.http.time.sleep')
+class RetryTests(TestCase):
+
+    def setUp(self):
+        patcher = mock.patch('jobs.http.get_session')
+        self.session = patcher.start().return_value
+        self.addCleanup(patcher.stop)
+        self.deadline = time.monotonic() + 10
+
+    def test_connection_error_is_retried_with_jittered_backoff(self, sleep):
+        self.session.get.side_effect = [requests.ConnectionError('reset'), http_response(200, b'ok')]
+        self.assertEqual(fetch('https://board.example/api', self.deadline)[:2], (200, b'ok'))
+        self.assertEqual(self.session.get.call_count, 2)
+        (delay,), _ = sleep.call_args
+        self.assertTrue(JOB_FETCH_BACKOFF * 0.5 <= delay <= JOB_FETCH_BACKOFF * 1.5, delay)
+
+    def test_connection_errors_past_the_retries_are_raised(self, sleep):
+        self.session.get.side_effect = requests.ConnectionError('down')
+        with self.assertRaises(requests.ConnectionError):
+            fetch('https://board.example/api', self.deadline)
+        self.assertEqual(self.session.get.call_count, JOB_FETCH_RETRIES + 1)
+
+    def test_retry_after_is_honored(self, sleep):
+        self.session.get.side_effect = [http_response(429, headers={'Retry-After': '3'}), http_response(200)]
+        self.assertEqual(fetch('https://board.example/api', self.deadline)[0], 200)
+        sleep.assert_called_once_with(3.0)
+
+    def test_retry_after_past_the_deadline_returns_the_answer(self, sleep):
+        self.session.get.return_value = http_response(429, headers={'Retry-After': '60'})
+        self.assertEqual(fetch('https://board.example/api', self.deadline)[0], 429)
+        self.assertEqual(self.session.get.call_count, 1)
+        sleep.assert_not_called()
+
+    def test_last_error_status_is_returned_after_the_retries(self, sleep):
+        self.session.get.return_value = http_response(503)
+        self.assertEqual(fetch('https://board.example/api', self.deadline)[0], 503)
+        self.assertEqual(self.session.get.call_count, JOB_FETCH_RETRIES + 1)
+
+    def test_other_statuses_are_not_retried(self, sleep):
+        self.session.get.return_value = http_response(404)
+        self.assertEqual(fetch('https://board.example/api', self.deadline)[0], 404)
+        self.assertEqual(self.session.get.call_count, 1)
+
+
+class CircuitBreakerTests(TestCase):
+
+    def setUp(self):
+        JobSource.objects.update(enabled=False)
+        self.source = board_source()
+
+    def test_failures_in_a_row_open_the_circuit(self):
+        for _ in range(JOB_FETCH_BREAKER_THRESHOLD - 1):
+            record_failure('Board')
+        self.assertEqual(due_sources(), [self.source])
+
+        record_failure('Board')
+        state = FetchState.objects.get(source='Board')
+        self.assertEqual(state.consecutive_failures, JOB_FETCH_BREAKER_THRESHOLD)
+        self.assertTrue(circuit_open(state.circuit_open_until))
+        self.assertEqual(due_sources(force=True), [])
+
+    def test_success_resets_the_failures(self):
+        for _ in range(JOB_FETCH_BREAKER_THRESHOLD):
+            record_failure('Board')
+        save_fetch_states({'Board': {'not_modified': False, 'etag': '', 'last_modified': '', 'high_water_mark': '1'}})
+        state = FetchState.objects.get(source='Board')
+        self.assertEqual((state.consecutive_failures, state.circuit_open_until), (0, None))
+
+    def test_not_modified_resets_the_failures(self):
+        record_failure('Board')
+        save_fetch_states({'Board': {'not_modified': True, 'etag': '', 'last_modified': '', 'high_water_mark': ''}})
+        self.assertEqual(FetchState.objects.get(source='Board').consecutive_failures, 0)
+
+
+class MatchingFanOutTests(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user('ada', 'ada@example.com', 'x')
+        index_profile(Profile.objects.create(user=self.user, name='Ada', key_skills=['Django'],
+                                             email_notifications=False))
+
+    def test_chunks_are_sent_posting_ids(self):
+        posting = posting_dict('Board', 'https://board.example/1', description='Django ' * 100)
+        download = {'source': 'Board', 'postings': [posting], 'error': None, 'stats': {}, 'state': None}
+        with mock.patch('jobs.tasks.chord'), mock.patch('jobs.tasks.group', side_effect=list), \
+                mock.patch.object(match_profiles, 's') as signature:
+            dispatch_matching([download])
+
+        refs, chunk, run_id = signature.call_args.args
+        stored = Posting.objects.get()
+        self.assertEqual((refs, chunk, run_id), ([(stored.pk, True)], [self.user.pk], None))
+
+        # Celery hands the refs over as JSON
+        self.assertEqual(match_profiles(json.loads(json.dumps(refs)), chunk)['new_jobs'], 1)
+        self.assertTrue(Job.objects.filter(user=self.user, posting=stored).exists())
+
+    def test_skill_matching_follows_the_posting_flags(self):
+        posting = Posting.objects.create(url='https://board.example/1', title='Engineer', company='Acme',
+                                         location='Germany', source='Board', description='Django')
+        self.assertEqual(match_profiles([[posting.pk, False]], [self.user.pk])['new_jobs'], 0)
+        self.assertEqual(match_profiles([[posting.pk, False], [posting.pk, True]], [self.user.pk])['new_jobs'], 1)
+
+
+class FetchRunStatsTests(TestCase):
+    """Each run stores its totals and one row per source (see jobs/stats.py)"""
+
+    def setUp(self):
+        JobSource.objects.update(enabled=False)
+        board_source()
+        board_source(label='Broken', job_search_url='https://broken.example/api')
+        board_source(label='Unchanged', job_search_url='https://unchanged.example/api')
+        user = User.objects.create_user('ada', 'ada@example.com', 'x')
+        index_profile(Profile.objects.create(user=user, name='Ada', key_skills=['Django'], email_notifications=False))
+
+        self.bodies = {
+            'https://board.example/api': board_page([3, 2], next_url='https://board.example/api?page=2'),
+            'https://board.example/api?page=2': board_page([1]),
+        }
+
+        def fetch(url, deadline, headers=None):
+            time.sleep(0.01)
+            if url.startswith('https://broken.'):
+                return 500, b'', {}
+            if url.startswith('https://unchanged.'):
+                return 304, b'', {}
+            return 200, self.bodies[url], {}
+
+        patcher = mock.patch('jobs.tasks.fetch', side_effect=fetch)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_run_and_source_stats(self):
+        self.assertEqual(run_fetch_jobs(), 3)
+
+        run = FetchRun.objects.get()
+        self.assertIsNotNone(run.finished_at)
+        self.assertEqual(
+            (run.sources, run.postings, run.matched, run.inserted, run.duplicates, run.errors),
+            (3, 3, 3, 3, 0, 1),
+        )
+        stats = {stat.source: stat for stat in run.source_stats.all()}
+        board = stats['Board']
+        self.assertEqual((board.pages, board.bytes, board.entries), (2, sum(map(len, self.bodies.values())), 3))
+        self.assertEqual((board.matched, board.inserted, board.duplicates, board.error), (3, 3, 0, ''))
+        self.assertGreaterEqual(board.latency_ms, 20)
+
+        broken = stats['Broken']
+        self.assertEqual((broken.error, broken.latency_ms, broken.entries), ('HTTP 500', None, 0))
+
+        unchanged = stats['Unchanged']
+        self.assertEqual((unchanged.not_modified, unchanged.pages, unchanged.entries, unchanged.error),
+                         (True, 1, 0, ''))
+
+    def test_postings_seen_again_count_as_duplicates(self):
+        run_fetch_jobs()
+        run_fetch_jobs(force=True)
+        run = FetchRun.objects.order_by('-pk').first()
+        self.assertEqual((run.matched, run.inserted, run.duplicates), (3, 0, 3))
+        self.assertEqual(run.source_stats.get(source='Board').duplicates, 3)
+
+class FetchStateTests(TestCase):
+    """The validators and mark are only stored once the run's postings are safely ingested"""
+
+    def setUp(self):
+        JobSource.objects.update(enabled=False)  # the built-in boards seeded by the migrations
+        self.source = board_source()
+        response = (200, board_page([2, 1]), {'ETag': '"v1"'})
+        patcher = mock.patch('jobs.tasks.fetch', return_value=response)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_failed_ingest_keeps_the_old_state(self):
+        with mock.patch('jobs.tasks.ingest_for_users', side_effect=RuntimeError('boom')):
+            with self.assertRaises(RuntimeError):
+                run_fetch_jobs()
+        self.assertFalse(FetchState.objects.filter(source='Board').exists())
+
+    def test_state_saved_after_ingest(self):
+        run_fetch_jobs()
+        state = FetchState.objects.get(source='Board')
+        self.assertEqual((state.etag, state.high_water_mark), ('"v1"', '2'))
+
+    def test_scoped_runs_leave_the_state_alone(self):
+        run_fetch_jobs(user_ids=[])
+        self.assertFalse(FetchState.objects.filter(source='Board').exists())
+
+    def test_celery_downloads_defer_the_state_to_the_summary(self):
+        download = download_source(self.source.pk)
+        self.assertFalse(FetchState.objects.filter(source='Board').exists())
+
+        summarize_fetch([], states={download['source']: download['state']})
+        self.assertEqual(FetchState.objects.get(source='Board').high_water_mark, '2')
+
+
+@mock.patch('jobs.outbox.EMAIL_OUTBOX_RATE', 0)
+class OutboxTests(TestCase):
+
+    def setUp(self):
+        self.emails = OutboxEmail.objects.bulk_create([
+            OutboxEmail(to_email=f'user{i}@example.com', subject=f'Digest {i}', body='-') for i in range(3)
+        ])
+
+    def test_claimed_batch_is_not_claimed_again(self):
+        self.assertEqual(len(_claim(10)), 3)
+        self.assertEqual(_claim(10), [])
+
+    def test_concurrent_claims_take_each_email_once(self):
+        # Both drains read the same due rows; only the first UPDATE may win each one
+        stale = list(OutboxEmail.objects.order_by('pk'))
+        first = _claim(10)
+        with mock.patch('jobs.outbox._due', return_value=stale):
+            second = _claim(10)
+        self.assertEqual(len(first), 3)
+        self.assertEqual(second, [])
+
+    def test_expired_lease_is_claimed_again(self):
+        _claim(10)
+        OutboxEmail.objects.update(next_attempt_at=timezone.now() - timedelta(seconds=1))
+        self.assertEqual(len(_claim(10)), 3)
+
+    def test_sends_batch(self):
+        self.assertEqual(drain_outbox(), (3, 0))
+        self.assertEqual(len(mail.outbox), 3)
+        self.assertEqual(OutboxEmail.objects.filter(status='sent', attempts=1).count(), 3)
+        self.assertEqual(drain_outbox(), (0, 0))
+
+    def test_failures_back_off_then_give_up(self):
+        connection = mock.Mock()
+        connection.send_messages.side_effect = OSError('mailbox unavailable')
+        with mock.patch('jobs.outbox.get_connection', return_value=connection):
+            before = timezone.now()
+            self.assertEqual(drain_outbox(), (0, 3))
+            email = OutboxEmail.objects.get(pk=self.emails[0].pk)
+            self.assertEqual((email.status, email.attempts), ('pending', 1))
+            self.assertGreaterEqual(email.next_attempt_at, before + timedelta(minutes=2))
+            # Not due again until the backoff has passed
+            self.assertEqual(drain_outbox(), (0, 0))
+
+            for _ in range(EMAIL_OUTBOX_MAX_ATTEMPTS - 1):
+                OutboxEmail.objects.update(next_attempt_at=timezone.now())
+                drain_outbox()
+        email.refresh_from_db()
+        self.assertEqual((email.status, email.attempts), ('failed', EMAIL_OUTBOX_MAX_ATTEMPTS))
+        self.assertIn('mailbox unavailable', email.last_error)
+
+
+def posting_dict(source, url, location='Germany', title='Python Developer', company='Acme GmbH', description=''):
+    """A fetched posting as the adapters produce it (see jobs/adapters.py)"""
+    return {
+        'title': title, 'company': company, 'source': source, 'url': url, 'description': description,
+        'location': location, 'tags': None, 'match_skills': True,
+    }
+
+
+class DedupTests(TestCase):
+
+    def setUp(self):
+        user = User.objects.create_user('ada', 'ada@example.com', 'x')
+        index_profile(Profile.objects.create(
+            user=user, name='Ada', target_countries=['Germany', 'Austria'], key_skills=['Python'],
+        ))
+
+    def ingest(self, *postings):
+        return store_postings(collapse_duplicates(describe_postings(list(postings))))
+
+    def test_collapses_the_same_role_on_another_board(self):
+        kept = self.ingest(
+            posting_dict('RemoteOK', 'https://remoteok.example/1'),
+            posting_dict('Arbeitnow', 'https://arbeitnow.example/1', company='Acme'),
+        )
+        self.assertEqual([posting['url'] for posting in kept], ['https://remoteok.example/1'])
+        self.assertEqual(Posting.objects.get().alternate_sources,
+                         [{'source': 'Arbeitnow', 'url': 'https://arbeitnow.example/1'}])
+
+    def test_keeps_repeated_titles_from_the_same_board(self):
+        kept = self.ingest(
+            posting_dict('RemoteOK', 'https://remoteok.example/1'),
+            posting_dict('RemoteOK', 'https://remoteok.example/2'),
+        )
+        self.assertEqual(len(kept), 2)
+
+    def test_resolves_locations_before_comparing(self):
+        # Feeds without a location: the country comes from the text, and different countries are different jobs
+        kept = self.ingest(
+            posting_dict('Feed A', 'https://a.example/1', location=None, description='Office in Berlin, Germany'),
+            posting_dict('Feed B', 'https://b.example/1', location=None, description='Office in Vienna, Austria'),
+        )
+        self.assertEqual([posting['location'] for posting in kept], ['Germany', 'Austria'])
+
+    def test_attaches_later_duplicates_to_the_stored_posting(self):
+        self.ingest(posting_dict('RemoteOK', 'https://remoteok.example/1'))
+        kept = self.ingest(posting_dict('Arbeitnow', 'https://arbeitnow.example/1'))
+        self.assertEqual(kept, [])
+        self.assertEqual(Posting.objects.get().alternate_sources,
+                         [{'source': 'Arbeitnow', 'url': 'https://arbeitnow.example/1'}])
+
+    def test_pruned_postings_take_their_fingerprints(self):
+        self.ingest(posting_dict('RemoteOK', 'https://remoteok.example/1'))
+        Posting.objects.update(first_seen=timezone.now() - timedelta(days=365))
+        self.assertEqual(apply_retention()['postings'], 1)
+        self.assertFalse(PostingFingerprint.objects.exists())
+
+        kept = self.ingest(posting_dict('Arbeitnow', 'https://arbeitnow.example/1'))
+        self.assertEqual(len(kept), 1)
+        self.assertEqual(Posting.objects.get().url, 'https://arbeitnow.example/1')
+
+
+class PostingDetailsTests(TestCase):
+    """Location and tags are stored once per Posting, so they must not depend on whose profile spelled a term how"""
+
+    def setUp(self):
+        for username, skills, countries in [
+            ('ada', ['python', 'Django'], ['Austria']),
+            ('grace', ['Python'], ['Germany', 'Austria']),
+        ]:
+            user = User.objects.create_user(username, f'{username}@example.com', 'x')
+            index_profile(Profile.objects.create(user=user, name=username, key_skills=skills, target_countries=countries))
+
+    def test_two_profiles_one_posting(self):
+        posting = posting_dict('Feed', 'https://feed.example/1', location=None,
+                               description='Python and Django team in Munich, Germany, remote from Austria')
+        describe_postings([posting])
+        self.assertEqual(posting['location'], 'Germany')
+        self.assertEqual(posting['tags'], ['django', 'python'])
+
+    def test_board_tags_are_normalized(self):
+        posting = posting_dict('Board', 'https://board.example/1')
+        posting['tags'] = ['Python', 'python', ' AWS ']
+        describe_postings([posting])
+        self.assertEqual(posting['tags'], ['python', 'aws'])
+
+    def test_no_known_country(self):
+        posting = posting_dict('Feed', 'https://feed.example/1', location=None, description='Anywhere')
+        describe_postings([posting])
+        self.assertEqual(posting['location'], 'International')
+
+    def test_term_matchers_read_the_normalized_index(self):
+        self.assertEqual(term_matchers()['skill'].find('PYTHON, django'), {'python', 'django'})
+
+    def test_first_prefers_the_earliest_then_longest_term(self):
+        matcher = KeywordMatcher(['Austria', 'Germany', 'New Zealand', 'Zealand'])
+        self.assertEqual(matcher.first('Remote from Germany or Austria'), 'germany')
+        self.assertEqual(matcher.first('Auckland, New Zealand'), 'new zealand')
+        self.assertIsNone(matcher.first('Nowhere'))
+
+
+
+class KeywordMatcherTests(TestCase):
+
+    def test_contained_terms_follow_word_boundaries(self):
+        matcher = KeywordMatcher(['Automation Testing', 'Testing', 'Java', 'JavaScript', 'C++', 'C', '.NET'])
+        self.assertEqual(matcher.find('Automation testing in JavaScript'), {'automation testing', 'testing', 'javascript'})
+        self.assertEqual(matcher.find('C++ and ASP.NET'), {'c++', 'c'})
+
+    def test_thousands_of_terms(self):
+        # Distinct user-typed terms grow with the user base; building the matcher must stay cheap
+        rng = random.Random(0)
+        words = [f'word{i}' for i in range(200)]
+        terms = {' '.join(rng.sample(words, rng.randint(1, 3))) for _ in range(5000)}
+        self.assertGreater(len(terms), 3000)
+        started = time.monotonic()
+        matcher = KeywordMatcher(terms)
+        self.assertLess(time.monotonic() - started, 5)
+        self.assertIn('word3', matcher.find('Needs word3 and word6'))
+
+
+class ProfileIndexTests(TestCase):
+
+    def setUp(self):
+        JobSource.objects.update(enabled=False)
+        board_source()
+        self.users = []
+        for username in ('ada', 'grace'):
+            user = User.objects.create_user(username, f'{username}@example.com', 'x')
+            index_profile(Profile.objects.create(user=user, name=username, key_skills=['Django'],
+                                                 email_notifications=False))
+            self.users.append(user)
+
+    def test_a_run_builds_the_matchers_once(self):
+        with mock.patch('jobs.tasks.fetch', return_value=(200, board_page([2, 1]), {})), \
+                mock.patch('jobs.tasks.ProfileIndex.load', wraps=ProfileIndex.load) as load, \
+                mock.patch('jobs.tasks.term_matchers') as term_matchers:
+            self.assertEqual(run_fetch_jobs(), 4)
+        load.assert_called_once_with()
+        term_matchers.assert_not_called()
+
+    def test_matching_can_be_limited_to_a_chunk_of_users(self):
+        posting = posting_dict('Board', 'https://board.example/1', description='Django')
+        matches = ProfileIndex.load().match_postings([posting], [self.users[1].pk])
+        self.assertEqual(list(matches), [self.users[1].pk])
+
+    def test_chunks_of_one_run_share_its_index(self):
+        run_index.cache_clear()
+        self.addCleanup(run_index.cache_clear)
+        self.assertIs(run_index(1), run_index(1))
+        self.assertIsNot(run_index(1), run_index(2))
+
+class RetentionTests(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user('ada', 'ada@example.com', 'x')
+        long_ago = timezone.now() - timedelta(days=365)
+        self.postings = Posting.objects.bulk_create([
+            Posting(url=f'https://board.example/jobs/{i}', title=f'Job {i}', company='Acme', location='Germany',
+                    source='Board', description='-', first_seen=long_ago)
+            for i in range(4)
+        ])
+        self.ignored, self.stale, self.recent, self.saved = Job.objects.bulk_create([
+            Job(user=self.user, posting=self.postings[0], status='ignored'),
+            Job(user=self.user, posting=self.postings[1], status='new'),
+            Job(user=self.user, posting=self.postings[2], status='new'),
+            Job(user=self.user, posting=self.postings[3], status='saved'),
+        ])
+        # auto_now / auto_now_add fields: age the rows with update()
+        Job.objects.filter(pk__in=[self.ignored.pk, self.saved.pk]).update(updated_at=long_ago)
+        Job.objects.filter(pk__in=[self.stale.pk, self.saved.pk]).update(date_posted=long_ago.date())
+
+    def test_dry_run_changes_nothing(self):
+        self.assertEqual(apply_retention(dry_run=True), {'ignored': 1, 'stale': 1, 'postings': 0})
+        self.assertEqual(Job.objects.count(), 4)
+
+    def test_archive_mode_keeps_a_snapshot(self):
+        self.assertEqual(apply_retention(mode='archive'), {'ignored': 1, 'stale': 1, 'postings': 2})
+        self.assertEqual(set(Job.objects.values_list('pk', flat=True)), {self.recent.pk, self.saved.pk})
+        archived = ArchivedJob.objects.get(reason='ignored')
+        self.assertEqual((archived.title, archived.url, archived.status), ('Job 0', self.postings[0].url, 'ignored'))
+        self.assertEqual(Posting.objects.count(), 2)
+
+    def test_delete_mode_leaves_a_tombstone_ingestion_respects(self):
+        self.assertEqual(apply_retention(mode='delete'), {'ignored': 1, 'stale': 1, 'postings': 2})
+        tombstone = ArchivedJob.objects.get(reason='stale')
+        self.assertEqual((tombstone.title, tombstone.url), ('', self.postings[1].url))
+
+        # A forced fetch sees the posting again: it must not come back as new
+        posting = Posting.objects.create(url=self.postings[1].url, title='Job 1', company='Acme',
+                                         location='Germany', source='Board', description='-')
+        matched = {self.user.pk: [{'id': posting.pk, 'url': posting.url, 'source': 'Board',
+                                   'location': 'Germany', 'title': 'Job 1', 'tags': []}]}
+        self.assertEqual(ingest_jobs(matched), {})
+
+    def test_orphan_linked_during_the_run_is_kept(self):
+        orphan = Posting.objects.create(url='https://board.example/orphan', title='Orphan', company='Acme',
+                                        location='Germany', source='Board', description='-',
+                                        first_seen=timezone.now() - timedelta(days=365))
+
+        def link_job(batch):
+            # A fetch links a user to the posting after it was listed as an orphan
+            Job.objects.create(user=self.user, posting=orphan)
+
+        self.assertEqual(_drain(orphan_postings(), 100, link_job), 0)
+        self.assertTrue(Posting.objects.filter(pk=orphan.pk).exists())
+        self.assertTrue(Job.objects.filter(posting=orphan).exists())
+
+
+class RelevanceScoreTests(TestCase):
+
+    def scorer(self, **fields):
+        return RelevanceScorer(Profile(**fields))
+
+    def test_skills_match_whatever_the_case(self):
+        tags = ['python', 'django']
+        lower = self.scorer(key_skills=['python', 'django']).score('Germany', 'Developer', tags)
+        mixed = self.scorer(key_skills=['Python', 'Django']).score('Germany', 'Developer', ['Python', 'DJANGO'])
+        self.assertEqual((lower, mixed), (2, 2))
+
+    def test_roles_match_whole_words(self):
+        scorer = self.scorer(preferred_roles=['Java Developer', 'Developer'])
+        self.assertEqual(scorer.score('', 'Senior JAVA developer', []), 2)
+        self.assertEqual(scorer.score('', 'JavaScript Developers wanted', []), 0)
+
+    def test_country(self):
+        scorer = self.scorer(target_countries=['Germany'])
+        self.assertEqual(scorer.score('germany', '', []), 1)
+        self.assertEqual(scorer.score('International', '', []), 0)
+        self.assertEqual(scorer.score(None, None, None), 0)
+
+    def test_rescore_and_backfill(self):
+        user = User.objects.create_user('ada', 'ada@example.com', 'x')
+        profile = Profile.objects.create(user=user, name='Ada', key_skills=['Python'], preferred_roles=['Backend'],
+                                         target_countries=['Germany'])
+        posting = Posting.objects.create(url='https://board.example/1', title='Backend Engineer', company='Acme',
+                                         location='Germany', source='Board', description='-', tags=['python'])
+        job = Job.objects.create(user=user, posting=posting, relevance_score=0)
+        long_ago = timezone.now() - timedelta(days=30)
+        Job.objects.update(updated_at=long_ago)
+
+        self.assertEqual(rescore_jobs(profile), 1)
+        job.refresh_from_db()
+        self.assertEqual(job.relevance_score, 3)
+        # Rescored rows show up in incremental exports
+        self.assertGreater(job.updated_at, long_ago)
+        self.assertEqual(rescore_jobs(profile), 0)  # unchanged rows aren't written again
+
+        # The migrations' backfill applies the same rules, from its own frozen copy
+        profile.preferred_roles = ['BACKEND', 'End']
+        profile.save()
+        Job.objects.update(relevance_score=0)
+        score_existing_jobs = import_module('jobs.migrations.0016_job_relevance_score').score_existing_jobs
+        score_existing_jobs(apps, None)
+        job.refresh_from_db()
+        self.assertEqual(job.relevance_score, 3)
+
+
+class BulkTriageTests(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user('ada', 'ada@example.com', 'x')
+        other = User.objects.create_user('bob', 'bob@example.com', 'x')
+        postings = Posting.objects.bulk_create([
+            Posting(url=f'https://board.example/jobs/{i}', title=f'Job {i}', company='Acme',
+                    location='Germany' if i % 2 else 'Canada', source='Board', description='-')
+            for i in range(4)
+        ])
+        self.jobs = Job.objects.bulk_create([Job(user=self.user, posting=posting) for posting in postings])
+        self.others = Job.objects.bulk_create([Job(user=other, posting=posting) for posting in postings])
+        self.client.force_login(self.user)
+
+    def bulk(self, data):
+        return self.client.post(reverse('jobs_bulk'), json.dumps(data), content_type='application/json')
+
+    def test_ids(self):
+        response = self.bulk({'action': 'saved', 'ids': [self.jobs[0].pk, self.jobs[1].pk, self.others[2].pk]})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['affected'], 2)
+        self.assertEqual(response.json()['counts'], {'total': 4, 'new': 2, 'saved': 2, 'applied': 0, 'ignored': 0})
+        # Someone else's job in the list is left alone
+        self.assertFalse(Job.objects.filter(user__username='bob').exclude(status='new').exists())
+
+    def test_filter(self):
+        response = self.bulk({'action': 'ignored', 'filter': {'country': 'germany'}})
+        self.assertEqual(response.json()['affected'], 2)
+        ignored = Job.objects.filter(user=self.user, status='ignored')
+        self.assertEqual(set(ignored.values_list('posting__location', flat=True)), {'Germany'})
+        self.assertFalse(Job.objects.filter(user__username='bob').exclude(status='new').exists())
+
+    def test_unchanged_jobs_keep_their_updated_at(self):
+        long_ago = timezone.now() - timedelta(days=30)
+        Job.objects.filter(pk=self.jobs[0].pk).update(status='ignored', updated_at=long_ago)
+        response = self.bulk({'action': 'ignored', 'ids': [self.jobs[0].pk, self.jobs[1].pk]})
+        self.assertEqual(response.json()['affected'], 1)
+        self.assertEqual(Job.objects.get(pk=self.jobs[0].pk).updated_at, long_ago)
+        self.assertGreater(Job.objects.get(pk=self.jobs[1].pk).updated_at, long_ago)
+
+    def test_delete(self):
+        response = self.bulk({'action': 'delete', 'filter': {'status': 'new'}})
+        self.assertEqual(response.json()['affected'], 4)
+        self.assertEqual(response.json()['counts']['total'], 0)
+        self.assertEqual(Job.objects.count(), 4)  # bob's
+
+    def test_bad_requests(self):
+        for data in ({'action': 'archive', 'ids': [self.jobs[0].pk]},
+                     {'action': 'saved'},
+                     {'action': 'saved', 'ids': ['1']},
+                     {'action': 'saved', 'ids': list(range(1, BULK_MAX_IDS + 2))},
+                     ['saved']):
+            self.assertEqual(self.bulk(data).status_code, 400, data)
+        response = self.client.post(reverse('jobs_bulk'), 'not json', content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(self.client.get(reverse('jobs_bulk')).status_code, 405)
+        self.assertFalse(Job.objects.exclude(status='new').exists())
+
+
+def completion(content, tokens=100):
+    """A stand-in for an OpenAI chat completion"""
+    return mock.Mock(choices=[mock.Mock(message=mock.Mock(content=content))], usage=mock.Mock(total_tokens=tokens))
+
+
+@mock.patch('jobs.documents.client')
+class GeneratedDocumentTests(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user('ada', 'ada@example.com', 'x')
+        self.profile = Profile.objects.create(user=self.user, name='Ada', current_role='Developer',
+                                              key_skills=['Python'], preferred_roles=['Backend Developer'])
+        posting = Posting.objects.create(url='https://board.example/jobs/1', title='Python Developer',
+                                         company='Acme', location='Germany', source='Board', description='-')
+        self.job = Job.objects.create(user=self.user, posting=posting)
+        self.client.force_login(self.user)
+
+    def generate_cv(self, regenerate=False):
+        url = reverse('generate_cv', args=[self.job.pk])
+        response = self.client.post(url + '?regenerate=1' if regenerate else url)
+        self.assertTrue(response.json()['success'], response.json())
+        return response.json()
+
+    def test_second_request_is_served_from_the_cache(self, client):
+        client.chat.completions.create.return_value = completion(' # Ada \n')
+        self.assertEqual((self.generate_cv()['cv_content'], self.generate_cv()['cached']), ('# Ada', True))
+        client.chat.completions.create.assert_called_once()
+        document = GeneratedDocument.objects.get()
+        self.assertEqual((document.kind, document.content, document.tokens), ('cv', '# Ada', 100))
+
+    def test_regenerate_asks_again_and_replaces_the_document(self, client):
+        client.chat.completions.create.side_effect = [completion('first'), completion('second')]
+        self.generate_cv()
+        response = self.generate_cv(regenerate=True)
+        self.assertEqual((response['cv_content'], response['cached']), ('second', False))
+        self.assertEqual(list(GeneratedDocument.objects.values_list('content', flat=True)), ['second'])
+
+    def test_profile_change_evicts_the_old_document(self, client):
+        client.chat.completions.create.side_effect = [completion('python'), completion('rust')]
+        self.generate_cv()
+        old_hash = GeneratedDocument.objects.get().profile_hash
+
+        self.profile.key_skills = ['Rust']
+        self.profile.save()
+        response = self.generate_cv()
+        self.assertEqual((response['cv_content'], response['cached']), ('rust', False))
+        document = GeneratedDocument.objects.get()
+        self.assertNotEqual(document.profile_hash, old_hash)
+        self.assertEqual(document.content, 'rust')
+
+    def test_kinds_are_cached_separately(self, client):
+        client.chat.completions.create.side_effect = [completion('cv'), completion('letter')]
+        generate_document(self.user, self.job, 'cv')
+        self.assertEqual(generate_document(self.user, self.job, 'cover_letter'), ('letter', False))
+        self.assertEqual(generate_document(self.user, self.job, 'cv'), ('cv', True))
+
+    def test_documents_are_deleted_with_their_job(self, client):
+        client.chat.completions.create.return_value = completion('cv')
+        generate_document(self.user, self.job, 'cv')
+        self.job.delete()
+        self.assertFalse(GeneratedDocument.objects.exists())
+
+
+@mock.patch('jobs.counters._cached', return_value=True)
+class JobCountsTests(TestCase):
+    """With a shared cache the counters are cached, so every path changing a user's jobs must invalidate them"""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user('ada', 'ada@example.com', 'x')
+        self.postings = Posting.objects.bulk_create([
+            Posting(url=f'https://board.example/jobs/{i}', title=f'Job {i}', company='Acme', location='Germany',
+                    source='Board', description='-')
+            for i in range(3)
+        ])
+        self.jobs = Job.objects.bulk_create([Job(user=self.user, posting=posting) for posting in self.postings[:2]])
+        self.client.force_login(self.user)
+
+    def assertCounts(self, **expected):
+        counts = job_counts(self.user.pk)
+        self.assertEqual({key: counts[key] for key in expected}, expected)
+
+    def test_counts_are_cached(self, cached):
+        self.assertCounts(total=2, new=2)
+        Job.objects.filter(pk=self.jobs[0].pk).update(status='saved')  # behind the counters' back
+        self.assertCounts(total=2, new=2)
+
+    def test_status_edit(self, cached):
+        self.assertCounts(new=2, saved=0)
+        self.client.post(reverse('job_update', args=[self.jobs[0].pk]), {'status': 'saved'})
+        self.assertCounts(new=1, saved=1)
+
+    def test_mark_applied(self, cached):
+        self.assertCounts(applied=0)
+        self.client.get(reverse('job_mark_applied', args=[self.jobs[0].pk]))
+        self.assertCounts(new=1, applied=1)
+
+    def test_delete(self, cached):
+        self.assertCounts(total=2)
+        self.client.post(reverse('job_delete', args=[self.jobs[0].pk]))
+        self.assertCounts(total=1)
+
+    def test_bulk(self, cached):
+        self.assertCounts(ignored=0)
+        self.client.post(reverse('jobs_bulk'), json.dumps({'action': 'ignored', 'ids': [self.jobs[1].pk]}),
+                         content_type='application/json')
+        self.assertCounts(new=1, ignored=1)
+
+    def test_ingest(self, cached):
+        self.assertCounts(total=2)
+        posting = self.postings[2]
+        ingest_jobs({self.user.pk: [{'id': posting.pk, 'url': posting.url, 'source': 'Board',
+                                     'location': 'Germany', 'title': 'Job 2', 'tags': []}]})
+        self.assertCounts(total=3, new=3)
+
+    def test_retention(self, cached):
+        Job.objects.filter(pk=self.jobs[0].pk).update(status='ignored', updated_at=timezone.now() - timedelta(days=365))
+        cache.clear()
+        self.assertCounts(total=2, ignored=1)
+        apply_retention()
+        self.assertCounts(total=1, ignored=0)
+
+    def test_process_local_cache_is_not_used(self, cached):
+        cached.return_value = False
+        self.assertCounts(total=2)
+        Job.objects.filter(pk=self.jobs[0].pk).delete()
+        self.assertCounts(total=1)
+
+
+class KeysetPaginationTests(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user('ada', 'ada@example.com', 'x')
+        postings = Posting.objects.bulk_create([
+            Posting(url=f'https://board.example/jobs/{i}', title=f'Job {i}', company='Acme', location='Germany',
+                    source='Board', description='-')
+            for i in range(8)
+        ])
+        self.jobs = Job.objects.bulk_create([Job(user=self.user, posting=posting) for posting in postings])
+        # Three days, several jobs on each: pages must split ties on date_posted by id
+        today = date.today()
+        for i, job in enumerate(self.jobs):
+            Job.objects.filter(pk=job.pk).update(date_posted=today - timedelta(days=i % 3))
+        self.queryset = Job.objects.filter(user=self.user)
+
+    def pages(self, size):
+        ids, cursor = [], None
+        while True:
+            rows, cursor = keyset_page(self.queryset, ('date_posted', 'id'), cursor, size)
+            ids.append([job.pk for job in rows])
+            if cursor is None:
+                return ids
+
+    def test_pages_cover_every_row_once_in_order(self):
+        expected = list(self.queryset.order_by('-date_posted', '-id').values_list('pk', flat=True))
+        for size in (1, 3, 8, 20):
+            pages = self.pages(size)
+            self.assertEqual([pk for page in pages for pk in page], expected, size)
+            self.assertTrue(all(len(page) <= size for page in pages))
+
+    def test_ties_are_broken_by_id(self):
+        self.queryset.update(date_posted=date.today())
+        rows, cursor = keyset_page(self.queryset, ('date_posted', 'id'), None, 3)
+        self.assertEqual([job.pk for job in rows], sorted((job.pk for job in self.jobs), reverse=True)[:3])
+        rows, _ = keyset_page(self.queryset, ('date_posted', 'id'), cursor, 3)
+        self.assertEqual([job.pk for job in rows], sorted((job.pk for job in self.jobs), reverse=True)[3:6])
+
+    def test_tampered_cursors_start_over(self):
+        first, _ = keyset_page(self.queryset, ('date_posted', 'id'), None, 3)
+        for cursor in ('not base64!', encode_cursor(['2026-01-01']), encode_cursor(['yesterday', 5]),
+                       encode_cursor([date.today(), 'x']), 'AAAA'):
+            rows, _ = keyset_page(self.queryset, ('date_posted', 'id'), cursor, 3)
+            self.assertEqual(rows, first, cursor)
+
+    def test_next_page_link(self):
+        self.client.force_login(self.user)
+        with mock.patch('jobs.views.JOBS_PAGE_SIZE', 5):
+            response = self.client.get(reverse('jobs'))
+            self.assertEqual(len(response.context['jobs']), 5)
+            more = self.client.get(reverse('jobs_more') + '?' + response.context['next_query'])
+        self.assertEqual(len(more.context['jobs']), 3)
+        self.assertEqual(more['X-Next-Page'], '')
+
+
+class SearchTests(TestCase):
+    """Full-text search through the FTS5 index on SQLite (tsvector on PostgreSQL)"""
+
+    def setUp(self):
+        self.user = User.objects.create_user('ada', 'ada@example.com', 'x')
+        other = User.objects.create_user('bob', 'bob@example.com', 'x')
+        rows = [
+            ('Python Developer', 'Django and Python services', ['python']),
+            ('Backend Engineer', 'Some Python scripting', []),
+            ('Data Analyst', 'Excel <b>reports</b>', []),
+            ('Senior Python Engineer', 'Python, Python everywhere', ['python']),
+        ]
+        self.postings = Posting.objects.bulk_create([
+            Posting(url=f'https://board.example/jobs/{i}', title=title, company='Acme', location='Germany',
+                    source='Board', description=description, tags=tags)
+            for i, (title, description, tags) in enumerate(rows)
+        ])
+        self.jobs = Job.objects.bulk_create([Job(user=self.user, posting=posting) for posting in self.postings])
+        Job.objects.create(user=other, posting=self.postings[0])
+        self.queryset = Job.objects.filter(user=self.user)
+
+    def test_matches_every_word_and_prefixes_the_last(self):
+        self.assertEqual(set(search_jobs(self.queryset, 'pyth').values_list('pk', flat=True)),
+                         {self.jobs[0].pk, self.jobs[1].pk, self.jobs[3].pk})
+        self.assertEqual(list(search_jobs(self.queryset, 'python backend').values_list('pk', flat=True)),
+                         [self.jobs[1].pk])
+        self.assertFalse(search_jobs(self.queryset, '"(*)').exists())
+
+    def test_title_hits_rank_first(self):
+        ids, cursor = rank_page(self.queryset, 'python')
+        self.assertIsNone(cursor)
+        self.assertEqual(set(ids[:2]), {self.jobs[0].pk, self.jobs[3].pk})
+        self.assertEqual(ids[2], self.jobs[1].pk)
+
+    def test_rank_cursor_pages_without_gaps_or_repeats(self):
+        expected, _ = rank_page(self.queryset, 'python', size=10)
+        pages, cursor = [], None
+        while True:
+            ids, cursor = rank_page(self.queryset, 'python', cursor, size=1)
+            pages.extend(ids)
+            if cursor is None:
+                break
+        self.assertEqual(pages, expected)
+
+    def test_only_the_users_jobs_are_ranked(self):
+        ids, _ = rank_page(Job.objects.filter(user__username='bob'), 'python')
+        self.assertEqual(len(ids), 1)
+        self.assertNotIn(ids[0], [job.pk for job in self.jobs])
+
+    def test_snippets_mark_the_terms_and_escape_the_rest(self):
+        html = snippets('reports', [self.postings[2].pk])[self.postings[2].pk]
+        self.assertIn('<mark>reports</mark>', html)
+        self.assertIn('&lt;b&gt;', html)
+        self.assertNotIn('<b>', html)
+
+    def test_highlight(self):
+        self.assertEqual(highlight('a <i> \x02b\x03'), 'a &lt;i&gt; <mark>b</mark>')
+        self.assertEqual(highlight(None), '')
 
-# Create your tests here.
+    def test_ranked_jobs_page(self):
+        self.client.force_login(self.user)
+        response = self.client.get(reverse('jobs'), {'q': 'python'})
+        self.assertEqual(response.context['filters']['sort'], 'rank')
+        self.assertEqual([job.pk for job in response.context['jobs']][2], self.jobs[1].pk)
+        self.assertIn('<mark>', response.context['jobs'][0].snippet)
@@ -5,6 +5,11 @@ from . import views
 urlpatterns = [
     # Main Jobs Page
     path('jobs/', views.jobs_list, name='jobs'),
+    # Next page of job cards (infinite scroll)
+    path('jobs/more/', views.jobs_more, name='jobs_more'),
+
+    # Set a status on / delete many jobs at once (AJAX)
+    path('jobs/bulk/', views.jobs_bulk, name='jobs_bulk'),
 
     # Update job status (New → Saved → Applied → Ignored)
     path('job/<int:pk>/update/', views.job_update_status, name='job_update'),
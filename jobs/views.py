@@ -3,14 +3,26 @@ from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
 from django.http import JsonResponse
+from django.utils import timezone
+from django.views.decorators.http import require_POST
 from django.views.decorators.csrf import csrf_exempt
 from career_tracker import settings
+from .counters import invalidate, job_counts
+from .documents import generate_document
 from .models import Job
 from .forms import JobStatusForm
-from openai import OpenAI
+from .pagination import keyset_page
+from .search import rank_page, search_jobs, snippets
+import json
 
-# Initialize OpenAI client
-client = OpenAI(api_key=settings.OPENAI_API_KEY)
+
+JOBS_PAGE_SIZE = getattr(settings, 'JOBS_PAGE_SIZE', 30)
+
+# Keyset columns per ?sort= (all descending, primary key last)
+SORT_KEYS = {
+    'date': ('date_posted', 'id'),
+    'relevance': ('relevance_score', 'date_posted', 'id'),
+}
 
 
 # ==========================
@@ -19,53 +31,28 @@ client = OpenAI(api_key=settings.OPENAI_API_KEY)
 @login_required
 @csrf_exempt
 def generate_cv(request, job_id):
+    """
+    The stored CV for this job when the profile hasn't changed since, otherwise a
+    new one from OpenAI (see jobs/documents.py). ?regenerate=1 always asks for a new one
+    """
     if request.method != 'POST':
         return JsonResponse({'success': False, 'error': 'POST required'})
 
     try:
-        job = request.user.jobs.get(pk=job_id)
+        job = request.user.jobs.select_related('posting').get(pk=job_id)
     except Job.DoesNotExist:
         return JsonResponse({'success': False, 'error': 'Job not found'})
 
-    profile = request.user.profile
-
-    prompt = f"""
-    Generate a professional, ATS-friendly CV in clean Markdown format.
-
-    Candidate Profile:
-    - Name: {profile.name or request.user.get_full_name() or request.user.username}
-    - Current Role: {profile.current_role}
-    - Key Skills: {', '.join(profile.key_skills)}
-    - Target Roles: {', '.join(profile.preferred_roles)}
-
-    Target Job:
-    - Title: {job.title}
-    - Company: {job.company}
-    - Location: {job.location}
-    - Skills Required: {', '.join(job.tags)}
-    - Job Description: {job.description[:3000]}
-
-    Requirements:
-    - Tailor perfectly to this job
-    - Strong opening summary
-    - Highlight matching skills first
-    - Use clean Markdown (##, -, **bold**, etc.)
-    - Output ONLY the CV — no extra text
-    """
-
     try:
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[{"role": "user", "content": prompt}],
-            max_tokens=1400,
-            temperature=0.7
+        cv_content, cached = generate_document(
+            request.user, job, 'cv', regenerate=request.GET.get('regenerate') == '1'
         )
-        cv_content = response.choices[0].message.content.strip()
 
         return JsonResponse({
             'success': True,
             'cv_content': cv_content,
-            'job_title': job.title
+            'job_title': job.posting.title,
+            'cached': cached
         })
     except Exception as e:
         return JsonResponse({'success': False, 'error': f"OpenAI error: {str(e)}"})
@@ -77,104 +64,159 @@ def generate_cv(request, job_id):
 @login_required
 @csrf_exempt
 def generate_cover_letter_ajax(request, job_id):
+    """
+    Same as generate_cv, for the cover letter
+    """
     if request.method != 'POST':
         return JsonResponse({'success': False, 'error': 'POST required'})
 
     try:
-        job = request.user.jobs.get(pk=job_id)
+        job = request.user.jobs.select_related('posting').get(pk=job_id)
     except Job.DoesNotExist:
         return JsonResponse({'success': False, 'error': 'Job not found'})
 
-    profile = request.user.profile
-
-    prompt = f"""
-    Write a compelling, professional cover letter in plain text (no Markdown) for:
-
-    Name: {profile.name or request.user.username}
-    Current Role: {profile.current_role}
-    Key Skills: {', '.join(profile.key_skills)}
-
-    Applying for:
-    Job Title: {job.title}
-    Company: {job.company}
-    Location: {job.location}
-
-    Job Description (summary): {job.description[:2500]}
-
-    Instructions:
-    - Sound confident and enthusiastic
-    - Highlight 2–3 strongest matching skills
-    - Mention why they're excited about this company/role
-    - End with a strong call to action
-    - Keep under 400 words
-    - Natural, human tone
-    """
-
     try:
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": "You are an expert career coach writing winning cover letters."},
-                {"role": "user", "content": prompt}
-            ],
-            max_tokens=700,
-            temperature=0.8
+        cover_letter, cached = generate_document(
+            request.user, job, 'cover_letter', regenerate=request.GET.get('regenerate') == '1'
         )
-        cover_letter = response.choices[0].message.content.strip()
 
         return JsonResponse({
             'success': True,
             'cover_letter': cover_letter,
-            'job_title': job.title
+            'job_title': job.posting.title,
+            'cached': cached
         })
     except Exception as e:
         return JsonResponse({'success': False, 'error': str(e)})
 
+
+def _filter_jobs(user, params):
+    """
+    A user's jobs narrowed by the jobs-page filters in params (query string or
+    a dict of the same keys). The ?q= search is not applied yet — see search_jobs.
+    Returns (queryset, the filters)
+    """
+    jobs = Job.objects.filter(user=user).select_related('posting').defer('posting__description')
+
+    # Filters
+    filters = {
+        'q': str(params.get('q') or '').strip(),
+        'status': params.get('status') or 'all',
+        'country': params.get('country') or '',
+        'source': params.get('source') or '',
+        'sort': params.get('sort'),
+    }
+    # Searches list the best text matches first (sort=rank) unless another order is asked for
+    if filters['sort'] not in SORT_KEYS and not (filters['sort'] == 'rank' and filters['q']):
+        filters['sort'] = 'rank' if filters['q'] else 'date'
+    try:
+        filters['min_relevance'] = max(int(params.get('min_relevance') or 0), 0)
+    except (TypeError, ValueError):
+        filters['min_relevance'] = 0
+
+    if filters['status'] != 'all':
+        jobs = jobs.filter(status=filters['status'])
+    if filters['country']:
+        jobs = jobs.filter(posting__location__icontains=filters['country'])
+    if filters['source']:
+        jobs = jobs.filter(posting__source__icontains=filters['source'])
+    if filters['min_relevance']:
+        jobs = jobs.filter(relevance_score__gte=filters['min_relevance'])
+    return jobs, filters
+
+
+def _job_page(request):
+    """
+    The current user's jobs filtered by the query string, one page at a time.
+    Returns (the page of jobs, query string of the next page or None, the filters,
+    the whole filtered queryset)
+    """
+    jobs, filters = _filter_jobs(request.user, request.GET)
+
+    cursor = request.GET.get('cursor')
+    if filters['sort'] == 'rank':
+        ids, cursor = rank_page(jobs, filters['q'], cursor, JOBS_PAGE_SIZE)
+        jobs = search_jobs(jobs, filters['q'])
+        loaded = Job.objects.select_related('posting').defer('posting__description').in_bulk(ids)
+        page = [loaded[pk] for pk in ids if pk in loaded]
+    else:
+        if filters['q']:
+            jobs = search_jobs(jobs, filters['q'])
+        page, cursor = keyset_page(jobs, SORT_KEYS[filters['sort']], cursor, JOBS_PAGE_SIZE)
+
+    if filters['q']:
+        highlights = snippets(filters['q'], {job.posting_id for job in page})
+        for job in page:
+            job.snippet = highlights.get(job.posting_id, '')
+
+    next_query = None
+    if cursor:
+        query = request.GET.copy()
+        query['cursor'] = cursor
+        next_query = query.urlencode()
+    return page, next_query, filters, jobs
+
+
 @login_required
 def jobs_list(request):
     """
-    Show all jobs for the current user with optional filters
+    Show the current user's jobs with optional filters, JOBS_PAGE_SIZE at a time
+    (later pages are appended by jobs_more as the user scrolls).
+    ?q= searches title, company, description and tags (best matches first, see jobs/search.py),
+    ?sort=relevance lists the best profile matches first, ?min_relevance=N hides jobs scoring below N
     """
-    jobs = Job.objects.filter(user=request.user).order_by('-date_posted')
+    jobs, next_query, filters, filtered = _job_page(request)
+    status = filters['status']
+
+    counts = job_counts(request.user.pk)
+    if filters['q'] or filters['country'] or filters['source'] or filters['min_relevance']:
+        total_jobs = filtered.count()
+    else:
+        total_jobs = counts[status] if status in counts else counts['total']
 
-    # Filters
-    status = request.GET.get('status')
-    country = request.GET.get('country')
-    source = request.GET.get('source')
-
-    if status and status != 'all':
-        jobs = jobs.filter(status=status)
-    if country:
-        jobs = jobs.filter(location__icontains=country)
-    if source:
-        jobs = jobs.filter(source__icontains=source)
-
-    all_jobs = Job.objects.filter(user=request.user)
     context = {
         'jobs': jobs,
-        'total_jobs': jobs.count(),
-        'new_jobs_count': all_jobs.filter(status='new').count(),
-        'saved_jobs_count': all_jobs.filter(status='saved').count(),
-        'applied_jobs_count': all_jobs.filter(status='applied').count(),
-        'ignored_jobs_count': all_jobs.filter(status='ignored').count(),
-        'status_filter': status or 'all',
-        'country_filter': country or '',
-        'source_filter': source or '',
+        'next_query': next_query,
+        'total_jobs': total_jobs,
+        'new_jobs_count': counts['new'],
+        'saved_jobs_count': counts['saved'],
+        'applied_jobs_count': counts['applied'],
+        'ignored_jobs_count': counts['ignored'],
+        'query': filters['q'],
+        'status_filter': status,
+        'country_filter': filters['country'],
+        'source_filter': filters['source'],
+        'sort': filters['sort'],
+        'min_relevance': filters['min_relevance'],
+        'filters': filters,
     }
     return render(request, 'jobs.html', context)
 
 
+@login_required
+def jobs_more(request):
+    """
+    Infinite-scroll fragment: the job cards after ?cursor= (same filters as
+    jobs_list). The query string of the following page is in X-Next-Page.
+    """
+    jobs, next_query, _, _ = _job_page(request)
+    response = render(request, 'job_cards.html', {'jobs': jobs})
+    response['X-Next-Page'] = next_query or ''
+    return response
+
+
 @login_required
 def job_update_status(request, pk):
     """
     Update job status (New → Saved → Applied → Ignored)
     """
-    job = get_object_or_404(Job, pk=pk, user=request.user)
+    job = get_object_or_404(Job.objects.select_related('posting'), pk=pk, user=request.user)
 
     if request.method == 'POST':
         form = JobStatusForm(request.POST, instance=job)
         if form.is_valid():
             form.save()
+            invalidate(request.user.pk)
             messages.success(request, f"Job status updated to '{job.get_status_display()}'")
             return redirect('jobs')
     else:
@@ -188,10 +230,11 @@ def job_mark_applied(request, pk):
     """
     Quick action: Mark as Applied with one click
     """
-    job = get_object_or_404(Job, pk=pk, user=request.user)
+    job = get_object_or_404(Job.objects.select_related('posting'), pk=pk, user=request.user)
     job.status = 'applied'
     job.save()
-    messages.success(request, f"Marked '{job.title}' as Applied!")
+    invalidate(request.user.pk)
+    messages.success(request, f"Marked '{job.posting.title}' as Applied!")
     return redirect('jobs')
 
 
@@ -200,10 +243,72 @@ def job_delete(request, pk):
     """
     Remove a job (rarely used, but helpful)
     """
-    job = get_object_or_404(Job, pk=pk, user=request.user)
+    job = get_object_or_404(Job.objects.select_related('posting'), pk=pk, user=request.user)
     if request.method == 'POST':
-        job_title = job.title
+        job_title = job.posting.title
         job.delete()
+        invalidate(request.user.pk)
         messages.success(request, f"Removed '{job_title}' from your list.")
         return redirect('jobs')
-    return render(request, 'job_confirm_delete.html', {'job': job})
\ No newline at end of file
+    return render(request, 'job_confirm_delete.html', {'job': job})
+
+
+# ==========================
+# Bulk triage (AJAX)
+# ==========================
+BULK_ACTIONS = {status for status, _ in Job.STATUS_CHOICES} | {'delete'}
+BULK_MAX_IDS = 1000
+
+
+@login_required
+@require_POST
+def jobs_bulk(request):
+    """
+    Set one status on (or delete) many jobs with a single UPDATE / DELETE.
+    JSON body: {"action": "new" | "saved" | "applied" | "ignored" | "delete"} plus either
+    "ids": [job id, ...] or "filter": {the jobs-page query params} for every matching job.
+    Returns the number of jobs changed and the user's refreshed counters
+    """
+    try:
+        data = json.loads(request.body or b'{}')
+    except ValueError:
+        return JsonResponse({'success': False, 'error': 'Invalid JSON'}, status=400)
+    if not isinstance(data, dict):
+        return JsonResponse({'success': False, 'error': 'Expected a JSON object'}, status=400)
+
+    action = data.get('action')
+    if action not in BULK_ACTIONS:
+        return JsonResponse({'success': False, 'error': f"Unknown action '{action}'"}, status=400)
+
+    if 'ids' in data:
+        ids = data['ids']
+        if not isinstance(ids, list) or not all(type(pk) is int for pk in ids):
+            return JsonResponse({'success': False, 'error': '"ids" must be a list of job ids'}, status=400)
+        if len(ids) > BULK_MAX_IDS:
+            return JsonResponse(
+                {'success': False, 'error': f'At most {BULK_MAX_IDS} ids per request, use "filter" instead'}, status=400
+            )
+        jobs = Job.objects.filter(user=request.user, pk__in=ids)
+    elif isinstance(data.get('filter'), dict):
+        jobs, filters = _filter_jobs(request.user, data['filter'])
+        if filters['q']:
+            jobs = search_jobs(jobs, filters['q'])
+    else:
+        return JsonResponse({'success': False, 'error': 'Pass "ids" or "filter"'}, status=400)
+
+    jobs = jobs.order_by()
+    if action == 'delete':
+        _, deleted = jobs.delete()
+        affected = deleted.get(Job._meta.label, 0)
+    else:
+        # Jobs already in that status keep their updated_at (retention counts from it)
+        affected = jobs.exclude(status=action).update(status=action, updated_at=timezone.now())
+    if affected:
+        invalidate(request.user.pk)
+
+    return JsonResponse({
+        'success': True,
+        'action': action,
+        'affected': affected,
+        'counts': job_counts(request.user.pk),
+    })
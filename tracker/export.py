@@ -0,0 +1,107 @@
+# tracker/export.py
+"""
+Machine-readable export of one user's jobs and tracker data.
+
+Rows are read with .values().iterator(chunk_size=EXPORT_CHUNK_SIZE) and
+written out one line at a time (NDJSON or CSV), so memory stays flat
+however large the export. Rows come in (updated_at, id) order: a client
+syncing incrementally passes the largest updated_at it has seen as
+updated_since and upserts by id (rows changed at that exact instant are
+sent again; deletions are not reported).
+"""
+import csv
+import json
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import F
+
+from jobs.models import Job
+from .models import Course, Goal, Project, Task
+
+EXPORT_CHUNK_SIZE = getattr(settings, 'EXPORT_CHUNK_SIZE', 2000)
+
+FORMATS = ('ndjson', 'csv')
+
+# kind → (queryset of one user's rows, plain columns, {column: related field})
+EXPORTS = {
+    'jobs': (
+        lambda user: Job.objects.filter(user=user),
+        ['id', 'status', 'relevance_score', 'date_posted', 'updated_at'],
+        {
+            'title': 'posting__title',
+            'company': 'posting__company',
+            'location': 'posting__location',
+            'source': 'posting__source',
+            'url': 'posting__url',
+            'tags': 'posting__tags',
+        },
+    ),
+    'goals': (
+        lambda user: Goal.objects.filter(user=user),
+        ['id', 'title', 'category', 'start_date', 'target_completion_date', 'status', 'created_at', 'updated_at'],
+        {},
+    ),
+    'tasks': (
+        lambda user: Task.objects.filter(goal__user=user),
+        ['id', 'goal_id', 'description', 'due_date', 'status', 'notes', 'created_at', 'updated_at'],
+        {},
+    ),
+    'courses': (
+        lambda user: Course.objects.filter(user=user),
+        ['id', 'name', 'platform', 'start_date', 'completion_date', 'status', 'certificate_url', 'notes',
+         'created_at', 'updated_at'],
+        {},
+    ),
+    'projects': (
+        lambda user: Project.objects.filter(user=user),
+        ['id', 'title', 'type', 'description', 'tech_stack', 'github_url', 'live_url', 'status',
+         'created_at', 'updated_at'],
+        {},
+    ),
+}
+
+
+def export_rows(kind, user, updated_since=None):
+    """Columns and an iterator over the row dicts of one export"""
+    queryset, columns, related = EXPORTS[kind]
+    rows = queryset(user)
+    if updated_since is not None:
+        rows = rows.filter(updated_at__gte=updated_since)
+    rows = rows.order_by('updated_at', 'id').values(*columns, **{name: F(field) for name, field in related.items()})
+    return columns + list(related), rows.iterator(chunk_size=EXPORT_CHUNK_SIZE)
+
+
+_encoder = DjangoJSONEncoder()
+
+
+def serialize(value):
+    """
+    A column value as both formats write it: dates and datetimes in ISO 8601,
+    decimals as strings, lists/dicts and plain JSON values unchanged
+    """
+    if value is None or isinstance(value, (str, int, float, list, dict)):
+        return value
+    return _encoder.default(value)
+
+
+def ndjson_lines(rows):
+    for row in rows:
+        yield json.dumps({column: serialize(value) for column, value in row.items()}) + '\n'
+
+
+class _Echo:
+    """csv.writer target that hands each line back instead of buffering it"""
+
+    def write(self, value):
+        return value
+
+
+def csv_lines(columns, rows):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(columns)
+    for row in rows:
+        yield writer.writerow([
+            json.dumps(value) if isinstance(value, (list, dict)) else value
+            for value in (serialize(row[column]) for column in columns)
+        ])
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.18 on 2026-10-17 23:40
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracker', '0002_alter_course_options_alter_goal_options_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='course',
+            index=models.Index(fields=['user', 'created_at'], name='tracker_cou_user_id_48a749_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='goal',
+            index=models.Index(fields=['user', 'created_at'], name='tracker_goa_user_id_02650d_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='goal',
+            index=models.Index(fields=['user', 'target_completion_date'], name='tracker_goa_user_id_ba36a6_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['user', 'created_at'], name='tracker_pro_user_id_09a898_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['goal', 'due_date'], name='tracker_tas_goal_id_3222e4_idx'),
+        ),
+    ]
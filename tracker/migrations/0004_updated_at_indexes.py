@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-18 00:04
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracker', '0003_query_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='course',
+            index=models.Index(fields=['user', 'updated_at', 'id'], name='tracker_cou_user_id_c1a23c_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='goal',
+            index=models.Index(fields=['user', 'updated_at', 'id'], name='tracker_goa_user_id_98b3f3_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['user', 'updated_at', 'id'], name='tracker_pro_user_id_c66112_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['goal', 'updated_at'], name='tracker_tas_goal_id_c96501_idx'),
+        ),
+    ]
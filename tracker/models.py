@@ -30,6 +30,11 @@ class Goal(models.Model):
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['user', 'created_at']),
+            models.Index(fields=['user', 'target_completion_date']),  # dashboard
+            models.Index(fields=['user', 'updated_at', 'id']),  # export?updated_since=
+        ]
 
     def __str__(self):
         return self.title
@@ -60,6 +65,10 @@ class Task(models.Model):
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['goal', 'due_date']),  # task lists and the dashboard's due-soon count
+            models.Index(fields=['goal', 'updated_at']),  # export?updated_since=
+        ]
 
     def __str__(self):
         return self.description[:50]
@@ -81,6 +90,10 @@ class Course(models.Model):
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['user', 'created_at']),
+            models.Index(fields=['user', 'updated_at', 'id']),  # export?updated_since=
+        ]
 
     def __str__(self):
         return f"{self.name} - {self.platform}"
@@ -117,6 +130,10 @@ class Project(models.Model):
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['user', 'created_at']),
+            models.Index(fields=['user', 'updated_at', 'id']),  # export?updated_since=
+        ]
 
     def __str__(self):
         return self.title
@@ -1,3 +1,108 @@
+import csv
+import io
+import json
+from datetime import date, timedelta
+
+from django.contrib.auth.models import User
 from django.test import TestCase
+from django.urls import reverse
+from django.utils.dateparse import parse_datetime
+
+from accounts.models import Profile
+from jobs.tests import QueryPlanTestCase
+from .models import Course, Goal, Project, Task
+
+
+class TrackerQueryPlanTests(QueryPlanTestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('planner', 'planner@example.com', 'x')
+        other = User.objects.create_user('other', 'other@example.com', 'x')
+        today = date.today()
+        for user in (cls.user, other):
+            Profile.objects.create(user=user, name=user.username)
+            goals = Goal.objects.bulk_create([
+                Goal(user=user, title=f'Goal {i}', target_completion_date=today + timedelta(days=i))
+                for i in range(30)
+            ])
+            Task.objects.bulk_create([
+                Task(goal=goal, description=f'Task {i}', due_date=today + timedelta(days=i % 20))
+                for goal in goals
+                for i in range(10)
+            ])
+            Course.objects.bulk_create([
+                Course(user=user, name=f'Course {i}', platform='Udemy', status='in_progress') for i in range(30)
+            ])
+            Project.objects.bulk_create([
+                Project(user=user, title=f'Project {i}', description='-', tech_stack='Python') for i in range(30)
+            ])
+        cls.goal = Goal.objects.filter(user=cls.user).first()
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def test_dashboard(self):
+        self.assertNoTableScans(reverse('dashboard'))
+
+    def test_goals(self):
+        self.assertNoTableScans(reverse('goals'))
+
+    def test_tasks(self):
+        self.assertNoTableScans(reverse('tasks', args=[self.goal.pk]))
+
+    def test_courses(self):
+        self.assertNoTableScans(reverse('courses'))
+
+    def test_projects(self):
+        self.assertNoTableScans(reverse('projects'))
+
+    def test_exports(self):
+        since = {'updated_since': (date.today() - timedelta(days=1)).isoformat()}
+        for kind in ('jobs', 'goals', 'courses', 'projects'):
+            self.assertNoTableScans(reverse('export', args=[kind]), since)
+        # Ordered by updated_at across all of the user's goals, which no (goal, …) index returns in order
+        self.assertNoTableScans(reverse('export', args=['tasks']), since, sorts=True)
+
+
+class ExportTests(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user('exporter', 'exporter@example.com', 'x')
+        self.client.force_login(self.user)
+        self.goal = Goal.objects.create(user=self.user, title='Learn Rust', target_completion_date=date(2027, 1, 31))
+
+    def export(self, kind, **params):
+        response = self.client.get(reverse('export', args=[kind]), params)
+        self.assertEqual(response.status_code, 200)
+        return b''.join(response.streaming_content).decode()
+
+    def test_formats_agree(self):
+        row = json.loads(self.export('goals'))
+        header, values = list(csv.reader(io.StringIO(self.export('goals', format='csv'))))
+        self.assertEqual(dict(zip(header, values)), {column: '' if value is None else str(value) for column, value in row.items()})
+        self.assertEqual(row['target_completion_date'], '2027-01-31')
+        # ISO 8601 to the millisecond in both
+        self.assertAlmostEqual(parse_datetime(row['updated_at']), Goal.objects.get().updated_at,
+                               delta=timedelta(milliseconds=1))
+
+    def test_updated_since(self):
+        later = Goal.objects.create(user=self.user, title='Ship it', target_completion_date=date(2027, 6, 30))
+        Goal.objects.filter(pk=self.goal.pk).update(updated_at=later.updated_at - timedelta(days=2))
+        since = (later.updated_at - timedelta(days=1)).isoformat()
+        lines = self.export('goals', updated_since=since).splitlines()
+        self.assertEqual([json.loads(line)['id'] for line in lines], [later.pk])
+
+    def test_updated_since_formats(self):
+        self.assertEqual(self.export('goals', updated_since='2026-01-01 10:00').count('\n'), 1)
+        self.assertEqual(self.export('goals', updated_since='2026-01-01T10:00:00+01:00').count('\n'), 1)
+        # An unencoded "+01:00" offset arrives as " 01:00"
+        url = reverse('export', args=['goals'])
+        for raw in ('2026-01-01T10:00:00 01:00', '2026-01-01 10:00 01:00', '2026-01-01'):
+            self.assertEqual(self.client.get(f'{url}?updated_since={raw}').status_code, 200, raw)
+        self.assertEqual(self.export('goals', updated_since='2999-01-01 10:00'), '')
 
-# Create your tests here.
+    def test_rejects_bad_parameters(self):
+        self.assertEqual(self.client.get(reverse('export', args=['goals']), {'format': 'xml'}).status_code, 400)
+        self.assertEqual(self.client.get(reverse('export', args=['goals']), {'updated_since': 'soon'}).status_code, 400)
+        self.assertEqual(self.client.get(reverse('export', args=['secrets'])).status_code, 404)
@@ -6,6 +6,9 @@ urlpatterns = [
     # Dashboard
     path('dashboard/', views.dashboard, name='dashboard'),
 
+    # Streaming export: /export/jobs/?format=csv&updated_since=2026-01-01
+    path('export/<str:kind>/', views.export_data, name='export'),
+
     # Goals
     path('goals/', views.goals_list, name='goals'),
     path('goal/<int:pk>/edit/', views.goal_edit, name='goal_edit'),
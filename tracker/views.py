@@ -2,10 +2,14 @@
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
+from django.http import Http404, JsonResponse, StreamingHttpResponse
 from django.utils import timezone
-from datetime import timedelta
+from django.utils.dateparse import parse_date, parse_datetime
+from datetime import datetime, time, timedelta
+from .export import EXPORTS, FORMATS, csv_lines, export_rows, ndjson_lines
 from .models import Goal, Task, Course, Project
 from .forms import GoalForm, TaskForm, CourseForm, ProjectForm
+from jobs.counters import job_counts
 from jobs.models import Job
 
 
@@ -25,8 +29,8 @@ def dashboard(request):
         status__in=['in_planning', 'in_progress']
     ).count()
 
-    new_jobs = Job.objects.filter(user=request.user, status='new').order_by('-date_posted')
-    new_jobs_count = new_jobs.count()
+    new_jobs = Job.objects.filter(user=request.user, status='new').select_related('posting').order_by('-date_posted')
+    new_jobs_count = job_counts(request.user.pk)['new']
     latest_jobs = new_jobs[:6]
 
     context = {
@@ -269,4 +273,44 @@ def project_delete(request, pk):
     return render(request, 'projects.html', {
         'projects': Project.objects.filter(user=request.user),
         'delete_project': project
-    })
\ No newline at end of file
+    })
+
+
+# ========================
+# EXPORT (NDJSON / CSV)
+# ========================
+@login_required
+def export_data(request, kind):
+    """
+    Stream the user's jobs / goals / tasks / courses / projects.
+    ?format=ndjson (default) or csv, ?updated_since=<ISO date or datetime> for incremental sync
+    """
+    if kind not in EXPORTS:
+        raise Http404("Unknown export")
+    fmt = request.GET.get('format', 'ndjson')
+    if fmt not in FORMATS:
+        return JsonResponse({'error': f"format must be one of {', '.join(FORMATS)}"}, status=400)
+
+    updated_since = None
+    raw = request.GET.get('updated_since')
+    if raw:
+        try:
+            # "+" of an unencoded UTC offset arrives as " " — only the last space can be one
+            # ("2026-01-01 10:00" is valid as it is)
+            updated_since = parse_datetime(raw) or parse_datetime('+'.join(raw.rsplit(' ', 1)))
+            if updated_since is None and parse_date(raw):
+                updated_since = datetime.combine(parse_date(raw), time.min)
+        except ValueError:
+            updated_since = None
+        if updated_since is None:
+            return JsonResponse({'error': 'updated_since must be an ISO 8601 date or datetime'}, status=400)
+        if timezone.is_naive(updated_since):
+            updated_since = timezone.make_aware(updated_since)
+
+    columns, rows = export_rows(kind, request.user, updated_since)
+    if fmt == 'csv':
+        response = StreamingHttpResponse(csv_lines(columns, rows), content_type='text/csv')
+        response['Content-Disposition'] = f'attachment; filename="{kind}.csv"'
+    else:
+        response = StreamingHttpResponse(ndjson_lines(rows), content_type='application/x-ndjson')
+    return response